@@ -0,0 +1,367 @@
+"""
+Response cache for LLM calls, keyed on a hash of (model settings, normalised
+prompt).
+
+Byte-identical (up to whitespace) prompts to the same model with the same
+settings get the stored response back instead of a new Gemini call. Two
+ways in, both transparent to the calling code:
+
+    install_langchain_cache()         LangChain's process-wide LLM cache, so
+                                      every chat model and chain uses it
+    cached_generative_model(model)    wraps a google.generativeai
+                                      GenerativeModel's generate_content
+
+The backend is picked with LLM_CACHE: "memory" (an LRU per process) or
+"sqlite" (a file at LLM_CACHE_PATH, default llm_cache.db, shared by every
+process on the host, e.g. all job workers). Unset or "off" disables caching.
+LLM_CACHE_SIZE (default 1024 entries) bounds either backend, evicting the
+least recently used entry, and entries expire after LLM_CACHE_TTL seconds
+(default 86400). Each cache counts hits, misses, evictions and expirations;
+see stats(). Check or empty the sqlite cache with:
+
+    python -m llm_cache [--clear]
+
+Hackathon/AI, Final_Hackathon/server and Day 7 each make Gemini calls and are
+deployed on their own, so each ships this file; the copies must stay
+identical (Hackathon/AI/tests/test_llm_cache_copies.py), so edit all three.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+# Message fields that differ between otherwise identical conversations
+# (LangGraph gives every message a fresh uuid)
+_VOLATILE_MESSAGE_FIELDS = ("id", "response_metadata", "usage_metadata")
+
+
+def normalize_prompt(text: str) -> str:
+    # Templates are indented and users paste trailing spaces and newlines
+    return " ".join(text.split())
+
+
+def cache_key(settings: str, prompt: str) -> str:
+    return hashlib.sha256(f"{settings}\0{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Bounded key -> response text store with a TTL."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[str]:
+        pass
+
+    def set(self, key: str, value: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def __len__(self) -> int:
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class MemoryLLMCache(LLMCache):
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        super().__init__(max_entries, ttl_seconds)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, value)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+LLM_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    used_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS llm_cache_used_at ON llm_cache (used_at);
+"""
+
+
+class SQLiteLLMCache(LLMCache):
+    def __init__(self, path: str = "llm_cache.db", max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        super().__init__(max_entries, ttl_seconds)
+        self.path = path
+        # Wall-clock times, since several processes share the file
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(LLM_CACHE_SCHEMA)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self.conn:
+            row = self.conn.execute("SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, expires_at = row
+            if expires_at <= now:
+                self.conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE llm_cache SET used_at = ?, hits = hits + 1 WHERE key = ?", (now, key))
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, used_at) VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl_seconds, now),
+            )
+            # Least recently used first; expired entries go as they are found
+            over = self.conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] - self.max_entries
+            if over > 0:
+                self.conn.execute("DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY used_at LIMIT ?)", (over,))
+                self.evictions += over
+
+    def clear(self) -> None:
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM llm_cache")
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def total_hits(self) -> int:
+        """Hits served from this file by every process since each entry was written."""
+        return self.conn.execute("SELECT COALESCE(SUM(hits), 0) FROM llm_cache").fetchone()[0]
+
+
+def create_llm_cache(backend: Optional[str] = None) -> Optional[LLMCache]:
+    backend = (backend or os.getenv("LLM_CACHE", "off")).lower()
+    if backend in ("", "0", "off", "false", "no"):
+        return None
+    max_entries = int(os.getenv("LLM_CACHE_SIZE", str(DEFAULT_MAX_ENTRIES)))
+    ttl_seconds = float(os.getenv("LLM_CACHE_TTL", str(DEFAULT_TTL_SECONDS)))
+    if backend == "memory":
+        cache = MemoryLLMCache(max_entries, ttl_seconds)
+    elif backend == "sqlite":
+        cache = SQLiteLLMCache(os.getenv("LLM_CACHE_PATH", "llm_cache.db"), max_entries, ttl_seconds)
+    else:
+        raise RuntimeError(f"❌ Unknown LLM_CACHE '{backend}'. Choose one of: memory, sqlite, off")
+    print(f"✅ Caching LLM responses in {backend} ({max_entries} entries, {ttl_seconds:g}s TTL)")
+    return cache
+
+
+_default_cache: Optional[LLMCache] = None
+_default_cache_created = False
+_default_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """The process-wide cache configured by LLM_CACHE, or None when caching is off."""
+    global _default_cache, _default_cache_created
+    if not _default_cache_created:
+        with _default_cache_lock:
+            if not _default_cache_created:
+                _default_cache = create_llm_cache()
+                _default_cache_created = True
+    return _default_cache
+
+
+# --- LangChain ---
+
+def _langchain_prompt(prompt: str) -> str:
+    # Chat models pass their messages serialised with langchain_core.load.dumps
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return prompt
+    if not isinstance(messages, list):
+        return prompt
+    stable = []
+    for message in messages:
+        if isinstance(message, dict) and isinstance(message.get("kwargs"), dict):
+            kwargs = {k: v for k, v in message["kwargs"].items() if k not in _VOLATILE_MESSAGE_FIELDS}
+            if isinstance(kwargs.get("content"), str):
+                kwargs["content"] = normalize_prompt(kwargs["content"])
+            message = {**message, "kwargs": kwargs}
+        stable.append(message)
+    return json.dumps(stable, sort_keys=True)
+
+
+class LangChainLLMCache:
+    """langchain_core BaseCache over an LLMCache.
+
+    Duck-typed rather than subclassed, so this module imports without
+    LangChain; LangChain only calls the methods below. llm_string carries the
+    model name, temperature and every other invocation parameter.
+    """
+
+    def __init__(self, cache: LLMCache):
+        self.cache = cache
+
+    def lookup(self, prompt: str, llm_string: str):
+        from langchain_core.load import loads
+
+        value = self.cache.get(cache_key(llm_string, _langchain_prompt(prompt)))
+        if value is None:
+            return None
+        return [loads(generation) for generation in json.loads(value)]
+
+    def update(self, prompt: str, llm_string: str, return_val) -> None:
+        from langchain_core.load import dumps
+
+        self.cache.set(cache_key(llm_string, _langchain_prompt(prompt)), json.dumps([dumps(generation) for generation in return_val]))
+
+    def clear(self, **kwargs) -> None:
+        self.cache.clear()
+
+    async def alookup(self, prompt: str, llm_string: str):
+        return self.lookup(prompt, llm_string)
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val) -> None:
+        self.update(prompt, llm_string, return_val)
+
+    async def aclear(self, **kwargs) -> None:
+        self.clear()
+
+
+def install_langchain_cache(cache: Optional[LLMCache] = None) -> Optional[LLMCache]:
+    """Route every LangChain model call in this process through the cache.
+
+    Safe to call from several modules; does nothing when caching is off.
+    """
+    if cache is None:
+        cache = get_llm_cache()
+    if cache is None:
+        return None
+    from langchain_core.globals import get_llm_cache as get_langchain_cache, set_llm_cache
+
+    current = get_langchain_cache()
+    if not (isinstance(current, LangChainLLMCache) and current.cache is cache):
+        set_llm_cache(LangChainLLMCache(cache))
+    return cache
+
+
+# --- google.generativeai ---
+
+class CachedResponse:
+    """What a cache hit returns in place of a GenerateContentResponse; callers read .text."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.cached = True
+
+
+class CachedGenerativeModel:
+    """A GenerativeModel whose plain-text generate_content calls go through the cache.
+
+    Everything else (streaming, tools, multimodal contents, other methods)
+    is passed straight to the wrapped model.
+    """
+
+    def __init__(self, model, cache: LLMCache):
+        self._model = model
+        self._cache = cache
+
+    def __getattr__(self, name: str):
+        return getattr(self._model, name)
+
+    def _key(self, contents, kwargs: dict) -> Optional[str]:
+        if set(kwargs) - {"generation_config"}:
+            return None
+        if isinstance(contents, str):
+            prompt = contents
+        elif isinstance(contents, (list, tuple)) and all(isinstance(part, str) for part in contents):
+            prompt = "\n".join(contents)
+        else:
+            return None
+        # The model's generation config (temperature etc.) with per-call overrides on top
+        config = {**(getattr(self._model, "_generation_config", None) or {}), **dict(kwargs.get("generation_config") or {})}
+        settings = json.dumps({"model": self._model.model_name, "config": config}, sort_keys=True, default=str)
+        return cache_key(settings, prompt)
+
+    def generate_content(self, contents, *args, **kwargs):
+        key = None if args else self._key(contents, kwargs)
+        if key is None:
+            return self._model.generate_content(contents, *args, **kwargs)
+        text = self._cache.get(key)
+        if text is not None:
+            return CachedResponse(text)
+        response = self._model.generate_content(contents, **kwargs)
+        try:
+            text = response.text
+        except ValueError:
+            # Blocked or empty: nothing worth caching, and the caller sees the same error
+            return response
+        self._cache.set(key, text)
+        return response
+
+
+def cached_generative_model(model, cache: Optional[LLMCache] = None):
+    """Wrap a GenerativeModel in the cache, or return it as is when caching is off."""
+    if cache is None:
+        cache = get_llm_cache()
+    return CachedGenerativeModel(model, cache) if cache is not None else model
+
+
+if __name__ == "__main__":
+    cache = SQLiteLLMCache(os.getenv("LLM_CACHE_PATH", "llm_cache.db"))
+    if "--clear" in sys.argv[1:]:
+        cache.clear()
+        print(f"✅ Cleared {cache.path}")
+    else:
+        print(f"{cache.path}: {len(cache)} entries, {cache.total_hits()} hits served")
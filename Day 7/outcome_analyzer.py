@@ -4,6 +4,8 @@ from dotenv import load_dotenv
 import os
 import traceback
 
+from llm_cache import cached_generative_model
+
 # Load environment variables
 load_dotenv()
 
@@ -15,8 +17,9 @@ class OutcomeAnalyzer:
             # Configure Google Generative AI
             genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
             
-            # Initialize the language model
-            self.model = genai.GenerativeModel('gemini-2.0-flash')
+            # Initialize the language model; identical content reuses the
+            # stored analyses (LLM_CACHE)
+            self.model = cached_generative_model(genai.GenerativeModel('gemini-2.0-flash'))
             print("✅ LLM initialized successfully")
             
             # Add Tavily search tool if API key is available
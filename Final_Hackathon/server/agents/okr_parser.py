@@ -7,6 +7,8 @@ from pathlib import Path
 from dotenv import load_dotenv
 import google.generativeai as genai
 
+from llm_cache import cached_generative_model
+
 # Global RAG context
 RAG_CONTEXT = []
 CONTEXT_ERROR = None
@@ -36,8 +38,8 @@ if not GEMINI_API_KEY:
     raise EnvironmentError("GEMINI_API_KEY is missing from .env file. Please add it to run the backend.")
 genai.configure(api_key=GEMINI_API_KEY)
 
-# Initialize Gemini Model
-gemini_model = genai.GenerativeModel("gemini-1.5-flash")
+# Initialize Gemini Model; resubmitted OKRs reuse the stored response (LLM_CACHE)
+gemini_model = cached_generative_model(genai.GenerativeModel("gemini-1.5-flash"))
 
 def format_context(context_list):
     return "\n\n".join(context_list) if context_list else ""
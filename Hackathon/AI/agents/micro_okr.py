@@ -7,6 +7,9 @@ from langchain_core.output_parsers import JsonOutputParser
 from langchain_google_genai import ChatGoogleGenerativeAI
 from dotenv import load_dotenv
 
+from llm_cache import install_langchain_cache
+from semantic_cache import get_semantic_cache, reschedule, strip_deadline
+
 load_dotenv()
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'okr_agentic_app')))
 
@@ -18,6 +21,8 @@ llm = ChatGoogleGenerativeAI(
     google_api_key=google_api_key
 )
 parser = JsonOutputParser()
+# Identical OKRs and deadlines reuse the stored plan (LLM_CACHE)
+install_langchain_cache()
 
 # --- Prompt Template ---
 prompt = PromptTemplate(
@@ -101,13 +106,27 @@ def create_micro_tasks(parsed_okr, deadline=None):
     chain = prompt | llm | parser
     print("📝 Prompt chain constructed")
 
-    try:
-        # Invoke LLM chain
-        result = chain.invoke({
+    def plan():
+        return chain.invoke({
             "objective": parsed_okr["objective"],
             "key_results": kr_str,
             "okr_deadline": deadline_str
         })
+
+    try:
+        # Invoke LLM chain, unless a similar OKR was planned before: then its
+        # tasks are reused with the due dates stretched onto this deadline
+        cache = get_semantic_cache()
+        if cache is None:
+            result = plan()
+        else:
+            result, hit = cache.get_or_compute(
+                "create_micro_tasks", strip_deadline(f"{parsed_okr['objective']}\n{kr_str}"), plan,
+                context={"deadline": deadline_str},
+                adapt=lambda hit: reschedule(hit.result, hit.created_at.date(), hit.context.get("deadline"), deadline_str),
+            )
+            if hit:
+                print(f"✅ Reused the micro-tasks of a similar OKR (similarity {hit.similarity:.2f})")
         print("✅ LLM chain returned tasks")
 
         # Validate & persist
@@ -5,6 +5,9 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.prompts import ChatPromptTemplate
 from langchain.chains import LLMChain
 
+from llm_cache import install_langchain_cache
+from semantic_cache import find_deadline, get_semantic_cache, strip_deadline
+
 # Load environment variables
 load_dotenv()
 google_api_key = os.getenv("GOOGLE_API_KEY")
@@ -15,6 +18,8 @@ llm = ChatGoogleGenerativeAI(
     temperature=0.2,
     google_api_key=google_api_key
 )
+# Resubmitted OKRs reuse the stored response (LLM_CACHE)
+install_langchain_cache()
 
 # Prompt template
 prompt = ChatPromptTemplate.from_template("""
@@ -34,20 +39,34 @@ Only respond with a valid JSON object.
 # LangChain chain
 okr_chain = prompt | llm
 
+def _parse_okr_llm(okr_text: str) -> dict:
+    response = okr_chain.invoke({"okr_text": okr_text})
+    # The chain ends at the chat model, so this is a message, not a string
+    text = getattr(response, "content", response).strip().strip("```json").strip("```").strip()
+
+    # Safely evaluate JSON output
+    data = eval(text)  # Consider using `json.loads` after cleaning
+
+    # Validate deadline
+    if data.get("deadline"):
+        if not re.match(r"\b\d{4}-\d{2}-\d{2}\b", data["deadline"]) and not re.match(r"\bQ[1-4]\b", data["deadline"].upper()):
+            data["deadline"] = "Unspecified"
+
+    return data
+
 # Function to parse OKR
 def parse_okr(okr_text: str) -> dict:
     try:
-        response = okr_chain.invoke({"okr_text": okr_text})
-        text = response.strip().strip("```json").strip("```").strip()
-        
-        # Safely evaluate JSON output
-        data = eval(text)  # Consider using `json.loads` after cleaning
-
-        # Validate deadline
-        if data.get("deadline"):
-            if not re.match(r"\b\d{4}-\d{2}-\d{2}\b", data["deadline"]) and not re.match(r"\bQ[1-4]\b", data["deadline"].upper()):
-                data["deadline"] = "Unspecified"
-
+        cache = get_semantic_cache()
+        if cache is None:
+            return _parse_okr_llm(okr_text)
+        # A reworded OKR reuses an earlier parse, with this text's deadline
+        data, hit = cache.get_or_compute(
+            "parse_okr", strip_deadline(okr_text), lambda: _parse_okr_llm(okr_text),
+            adapt=lambda hit: {**hit.result, "deadline": find_deadline(okr_text) or "Unspecified"},
+        )
+        if hit:
+            print(f"✅ Reused the parse of a similar OKR (similarity {hit.similarity:.2f})")
         return data
 
     except Exception as e:
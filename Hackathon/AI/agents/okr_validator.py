@@ -1,12 +1,12 @@
+import asyncio
 import os
 from dotenv import load_dotenv
 import requests
-from pymongo import MongoClient
 from langchain.agents import Tool, initialize_agent
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.schema import SystemMessage
 from langchain.tools import tool
-from mongo_clients import db, okr_collection
+from mongo_clients import get_db, get_async_db, OKR_COLLECTION_NAME
 from datetime import datetime
 import json
 # from typing import Optional # Removed Optional as hint is removed
@@ -23,6 +23,7 @@ from langgraph.checkpoint.memory import MemorySaver
 from langgraph.prebuilt import create_react_agent
 from storage import IStorage, MemStorage
 from shared.schemas import TaskStatus
+from llm_cache import install_langchain_cache
 
 # -------------------------------
 # Load env variables
@@ -62,6 +63,9 @@ except EnvironmentError as e:
 
 # Replace the previous llm initialization
 llm = init_model()
+# The sub-agents and the orchestrator reuse stored responses for identical
+# submissions (LLM_CACHE)
+install_langchain_cache()
 
 # -------------------------------
 # Tool 4: Save validation report to MongoDB
@@ -81,7 +85,7 @@ def save_validation_report_func(report_details: dict) -> dict:
     except KeyError as e:
         return {"error": f"Missing key in report_details for save_validation_report: {e}"}
 
-    reports_collection = db["validation_reports"]
+    reports_collection = get_db()["validation_reports"]
     report_data = {
         "submission_id": submission_id,
         "okr_id": okr_id,
@@ -102,40 +106,32 @@ def save_validation_report_func(report_details: dict) -> dict:
 # -------------------------------
 # Tool 5: Update OKR status in MongoDB
 # -------------------------------
+def _micro_tasks_collection():
+    # The collection holding OKRs with embedded micro_tasks, on the shared pooled client
+    return get_db()[os.getenv("MONGO_COLLECTION_NAME") or OKR_COLLECTION_NAME]
+
 @tool
 def update_okr_status(okr_id: str) -> dict:
     """Updates all micro_tasks' micro_status to 'completed'."""
     try:
-        mongo_uri = os.getenv("MONGO_URI")
-        db_name = os.getenv("MONGO_DB_NAME")
-        collection_name = os.getenv("MONGO_COLLECTION_NAME")
-
-        print(f"[INFO] Connecting to MongoDB at {mongo_uri}")
-        client = MongoClient(mongo_uri)
-        db = client[db_name]
-        collection = db[collection_name]  # should be 'micro_tasks'
-
         try:
             obj_id = ObjectId(okr_id)
         except Exception as e:
             print(f"[ERROR] Invalid ObjectId format: {okr_id}")
             return {"error": "Invalid ObjectId format"}
 
-        print(f"[INFO] Fetching document with _id: {okr_id}")
-        okr_doc = collection.find_one({"_id": obj_id})
-        if not okr_doc:
-            return {"error": "Document not found"}
-
-        micro_tasks = okr_doc.get("micro_tasks", [])
-        for task in micro_tasks:
-            task["micro_status"] = "completed"
-
-        print(f"[INFO] Updating document with modified micro_tasks...")
-
+        # One server-side update of every embedded task; the array never leaves Mongo.
+        # $[] fails on a document without a micro_tasks array, so only match those that have one
+        collection = _micro_tasks_collection()
         result = collection.update_one(
-            {"_id": obj_id},
-            {"$set": {"micro_tasks": micro_tasks}}
+            {"_id": obj_id, "micro_tasks": {"$type": "array"}},
+            {"$set": {"micro_tasks.$[].micro_status": "completed"}}
         )
+        if not result.matched_count:
+            if not collection.count_documents({"_id": obj_id}, limit=1):
+                return {"error": "Document not found"}
+            # No micro tasks: nothing to mark, as before
+            print(f"[INFO] No micro_tasks on {okr_id}, nothing to update")
 
         print(f"[INFO] Matched: {result.matched_count}, Modified: {result.modified_count}")
         return {"status": "All micro_tasks marked as completed"}
@@ -144,6 +140,41 @@ def update_okr_status(okr_id: str) -> dict:
         print(f"[EXCEPTION] {e}")
         return {"error": str(e)}
 
+@tool
+def update_micro_task_status_by_index(okr_id: str, index: int, status: str = "completed") -> dict:
+    """Sets micro_status on the micro task at position `index` (0-based) of an OKR's micro_tasks."""
+    try:
+        if index < 0:
+            return {"error": "Index must be 0 or greater"}
+        result = _micro_tasks_collection().update_one(
+            {"_id": ObjectId(okr_id), f"micro_tasks.{index}": {"$exists": True}},
+            {"$set": {f"micro_tasks.{index}.micro_status": status}}
+        )
+        if not result.matched_count:
+            return {"error": f"No micro task at index {index}"}
+        return {"status": f"micro_tasks[{index}] marked as {status}"}
+
+    except Exception as e:
+        print(f"[EXCEPTION] {e}")
+        return {"error": str(e)}
+
+@tool
+def update_micro_task_status_by_id(okr_id: str, micro_task_id: str, status: str = "completed") -> dict:
+    """Sets micro_status on the micro task with the given `id` in an OKR's micro_tasks."""
+    try:
+        # The positional $ targets the element matched by the query
+        result = _micro_tasks_collection().update_one(
+            {"_id": ObjectId(okr_id), "micro_tasks.id": micro_task_id},
+            {"$set": {"micro_tasks.$.micro_status": status}}
+        )
+        if not result.matched_count:
+            return {"error": f"No micro task with id {micro_task_id}"}
+        return {"status": f"Micro task {micro_task_id} marked as {status}"}
+
+    except Exception as e:
+        print(f"[EXCEPTION] {e}")
+        return {"error": str(e)}
+
 # -------------------------------
 # New Tool 6: Extract text from PDF (base64 encoded)
 # -------------------------------
@@ -225,9 +256,93 @@ def create_agent4():
     )
     return create_react_agent(model, tools, prompt=prompt, checkpointer=memory)
 
+# Seconds each sub-agent gets before its check counts as failed
+SUB_AGENT_TIMEOUT_SECONDS = float(os.getenv("VALIDATOR_AGENT_TIMEOUT", "60"))
+
+async def run_sub_agent(name: str, create_agent, prompt: str, config: dict, timeout: float = None) -> str:
+    """Runs one sub-agent on `prompt` and returns its final message. A run that
+    exceeds the timeout or raises returns a ❌ verdict, so the submission is not
+    passed unchecked."""
+    timeout = timeout or SUB_AGENT_TIMEOUT_SECONDS
+    print(f"DEBUG: validate_submission: Running {name}...")
+    print(f"DEBUG: validate_submission: {name} prompt: {prompt}")
+    try:
+        result = await asyncio.wait_for(
+            create_agent().ainvoke({"messages": [{"role": "user", "content": prompt}]}, config=config),
+            timeout=timeout,
+        )
+        print(f"DEBUG: validate_submission: {name} raw result: {result}")
+        content = result['messages'][-1].content
+    except asyncio.TimeoutError:
+        print(f"⚠️ {name} did not answer within {timeout:g}s")
+        return f"❌ {name} did not finish within {timeout:g}s, so this check could not be completed."
+    except Exception as e:
+        print(f"⚠️ {name} failed: {e}")
+        return f"❌ {name} failed ({e}), so this check could not be completed."
+    print(f"DEBUG: validate_submission: {name} processed result: {content}")
+    return content
+
+async def run_validation_agents(task_hint: str, processed_content: str, config: dict) -> dict:
+    """Agents 1-3 judge the submission independently, so they run at the same
+    time; Agent 4 (suggestions) starts once their verdicts are in, and only if
+    one of them flagged a problem. If this stage is cancelled or one check
+    fails outside run_sub_agent, the others are cancelled rather than left
+    running."""
+    checks = [asyncio.ensure_future(check) for check in (
+        run_sub_agent(
+            "Agent 1", create_agent1,
+            f"Given OKR task hint: {task_hint}, and submission content: {processed_content}, check for 5 pillars.", config,
+        ),
+        run_sub_agent(
+            "Agent 2", create_agent2,
+            f"Compare OKR intent ({task_hint}) with submission content ({processed_content}) for semantic drift.", config,
+        ),
+        run_sub_agent(
+            "Agent 3", create_agent3,
+            f"Analyze this submission content for measurability, outcome-driven, and specificity: {processed_content}", config,
+        ),
+    )]
+    try:
+        five_pillars_result, semantic_drift_result, measurability_result = await asyncio.gather(*checks)
+    except BaseException:
+        for check in checks:
+            check.cancel()
+        raise
+
+    suggestions_run = "❌" in five_pillars_result + semantic_drift_result + measurability_result
+    if suggestions_run:
+        suggestions_result = await run_sub_agent(
+            "Agent 4 (Suggestions)", create_agent4,
+            f"Provide suggestions for improving submission: {processed_content} based on OKR hint: {task_hint}.", config,
+        )
+    else:
+        suggestions_result = "No specific suggestions needed. Submission appears to be in good shape."
+        print(f"DEBUG: validate_submission: No suggestions generated as no issues found.")
+
+    return {
+        "five_pillars": five_pillars_result,
+        "semantic_drift": semantic_drift_result,
+        "measurability": measurability_result,
+        "suggestions": suggestions_result,
+        "suggestions_run": suggestions_run,
+    }
+
 # -------------------------------
 # Setup LangChain Agent (Main Orchestrator Agent)
 # -------------------------------
+def json_input(structured_tool):
+    """The zero-shot orchestrator only passes one string to a tool, so
+    multi-argument tools take their arguments as a JSON object."""
+    def run(tool_input: str) -> dict:
+        try:
+            arguments = json.loads(tool_input)
+        except (TypeError, ValueError) as e:
+            return {"error": f"Input must be a JSON object: {e}"}
+        if not isinstance(arguments, dict):
+            return {"error": "Input must be a JSON object"}
+        return structured_tool.invoke(arguments)
+    return run
+
 tools = [
     Tool(
         name="save_validation_report_func",
@@ -239,6 +354,16 @@ tools = [
         func=update_okr_status,
         description="Updates the status of an OKR to 'completed' in MongoDB."
     ),
+    Tool(
+        name="update_micro_task_status_by_index",
+        func=json_input(update_micro_task_status_by_index),
+        description="Sets the status of one micro task of an OKR by its position in micro_tasks. Input should be a JSON object with 'okr_id', 'index' (0-based) and optionally 'status' (default 'completed')."
+    ),
+    Tool(
+        name="update_micro_task_status_by_id",
+        func=json_input(update_micro_task_status_by_id),
+        description="Sets the status of one micro task of an OKR by its id. Input should be a JSON object with 'okr_id', 'micro_task_id' and optionally 'status' (default 'completed')."
+    ),
     Tool(
         name="extract_text_from_pdf",
         func=extract_text_from_pdf,
@@ -262,7 +387,7 @@ Here's the validation process:
 5.  **Generate Suggestions (Agent 4 - `create_agent4`):** If any of the above checks reveal issues, generate 2-3 concrete, structured suggestions for improvement based on the identified problems. This agent should also search for better examples using Tavily.
 6.  **Consolidate Results:** Combine the results from all checks and suggestions into a comprehensive validation response.
 7.  **Save Report:** Use the `save_validation_report_func` tool to save the consolidated validation report to MongoDB.
-8.  **Update OKR Status (if applicable):** If the overall validation is successful and indicates that the OKR should be completed, use the `update_okr_status` tool.
+8.  **Update OKR Status (if applicable):** If the overall validation is successful and indicates that the OKR should be completed, use the `update_okr_status` tool. If the submission only covers one micro task, mark just that one with `update_micro_task_status_by_id` (or `update_micro_task_status_by_index` when its id is unknown).
 
 Your final output should be a JSON object containing `success` (boolean), `message` (string with all validation details and suggestions), and `okr_update` (string indicating if OKR status was updated).
 
@@ -316,7 +441,7 @@ async def validate_submission(task_id: str, okr_id: str, submission_content: str
         # Step 1: Fetch OKR details from DB to get task_hint and evidence_hint
         print("DEBUG: validate_submission: Fetching OKR details from DB...")
         try:
-            okr_details = db["okrs"].find_one({"_id": ObjectId(okr_id)})
+            okr_details = await get_async_db()["okrs"].find_one({"_id": ObjectId(okr_id)})
             print(f"DEBUG: validate_submission: OKR details fetched: {okr_details}")
         except Exception as e:
             overall_validation_result = f"Error fetching OKR details from DB: {e}"
@@ -341,50 +466,18 @@ async def validate_submission(task_id: str, okr_id: str, submission_content: str
             }
             print(f"DEBUG: validate_submission: Agent config: {config_agent}")
 
-            # Agent 1: OKR vs Submission Checker
-            print("DEBUG: validate_submission: Running Agent 1...")
-            prompt_agent1 = f"Given OKR task hint: {task_hint}, and submission content: {processed_content}, check for 5 pillars."
-            print(f"DEBUG: validate_submission: Agent 1 prompt: {prompt_agent1}")
-            result_agent1 = create_agent1().invoke({"messages": [{"role": "user", "content": prompt_agent1}]}, config=config_agent) # Pass config
-            five_pillars_result = result_agent1['messages'][-1].content
-            overall_validation_result += f"5 Pillars Check: {five_pillars_result}\n"
-            print(f"DEBUG: validate_submission: Agent 1 raw result: {result_agent1}")
-            print(f"DEBUG: validate_submission: Agent 1 processed result: {five_pillars_result}")
-
-            # Agent 2: Semantic Drift Detector
-            print("DEBUG: validate_submission: Running Agent 2...")
-            prompt_agent2 = f"Compare OKR intent ({task_hint}) with submission content ({processed_content}) for semantic drift."
-            print(f"DEBUG: validate_submission: Agent 2 prompt: {prompt_agent2}")
-            result_agent2 = create_agent2().invoke({"messages": [{"role": "user", "content": prompt_agent2}]}, config=config_agent) # Pass config
-            semantic_drift_result = result_agent2['messages'][-1].content
-            overall_validation_result += f"Semantic Drift Check: {semantic_drift_result}\n"
-            print(f"DEBUG: validate_submission: Agent 2 raw result: {result_agent2}")
-            print(f"DEBUG: validate_submission: Agent 2 processed result: {semantic_drift_result}")
-            
-            # Agent 3: Measurability Checker
-            print("DEBUG: validate_submission: Running Agent 3...")
-            prompt_agent3 = f"Analyze this submission content for measurability, outcome-driven, and specificity: {processed_content}"
-            print(f"DEBUG: validate_submission: Agent 3 prompt: {prompt_agent3}")
-            result_agent3 = create_agent3().invoke({"messages": [{"role": "user", "content": prompt_agent3}]}, config=config_agent) # Pass config
-            measurability_result = result_agent3['messages'][-1].content
-            overall_validation_result += f"Measurability Check: {measurability_result}\n"
-            print(f"DEBUG: Agent 3 raw result: {result_agent3}")
-            print(f"DEBUG: Measurability Check (Agent 3) processed result: {measurability_result}")
-
-            # Agent 4: Suggestion Generator (if any previous validation failed)
-            suggestions_result = ""
-            if "❌" in overall_validation_result:
-                print("DEBUG: validate_submission: Running Agent 4 (Suggestions)...")
-                prompt_agent4 = f"Provide suggestions for improving submission: {processed_content} based on OKR hint: {task_hint}."
-                print(f"DEBUG: validate_submission: Agent 4 prompt: {prompt_agent4}")
-                result_agent4 = create_agent4().invoke({"messages": [{"role": "user", "content": prompt_agent4}]}, config=config_agent) # Pass config
-                suggestions_result = result_agent4['messages'][-1].content
+            checks = await run_validation_agents(task_hint, processed_content, config_agent)
+            five_pillars_result = checks["five_pillars"]
+            semantic_drift_result = checks["semantic_drift"]
+            measurability_result = checks["measurability"]
+            suggestions_result = checks["suggestions"]
+            overall_validation_result += (
+                f"5 Pillars Check: {five_pillars_result}\n"
+                f"Semantic Drift Check: {semantic_drift_result}\n"
+                f"Measurability Check: {measurability_result}\n"
+            )
+            if checks["suggestions_run"]:
                 overall_validation_result += f"Suggestions: {suggestions_result}\n"
-                print(f"DEBUG: validate_submission: Agent 4 raw result: {result_agent4}")
-                print(f"DEBUG: validate_submission: Agent 4 processed result: {suggestions_result}")
-            else:
-                suggestions_result = "No specific suggestions needed. Submission appears to be in good shape."
-                print(f"DEBUG: validate_submission: No suggestions generated as no issues found.")
 
             # Basic task hint vs evidence hint comparison (still relevant)
             print("DEBUG: validate_submission: Running Task-Evidence Hint comparison...")
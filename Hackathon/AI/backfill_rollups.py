@@ -0,0 +1,21 @@
+"""
+Rebuild the per-day, per-week and per-month task rollups (created/completed
+counts that /api/dashboard/stats reads) from the tasks. Run once after
+deploying the rollups, and any time they are suspected to have drifted:
+
+    python -m backfill_rollups
+"""
+import asyncio
+
+from storage_registry import create_storage
+
+
+async def main():
+    storage = create_storage()
+    await storage.rebuild_task_rollups()
+    await storage.close()
+    print("✅ Task rollups rebuilt")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
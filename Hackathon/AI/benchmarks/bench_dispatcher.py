@@ -0,0 +1,90 @@
+"""
+Reminder dispatcher throughput: seed N reminders that are already due
+across the three delivery channels, then time ReminderDispatcher draining
+them (refill, atomic claim, batched send, mark sent) into a transport that
+only counts what it receives. --future adds reminders scheduled a day out,
+which the drain should not slow down: its cost follows the due reminders,
+not the size of the store.
+
+    python -m benchmarks.bench_dispatcher --backends memory,sqlite --reminders 100000
+    python -m benchmarks.bench_dispatcher --backends memory --reminders 10000 --future 1000000
+    python -m benchmarks.bench_dispatcher --backends mongo --batch-size 500
+
+Backends are opened the same way as in benchmarks.run_storage.
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import List
+
+from benchmarks.run_storage import BACKENDS
+from benchmarks.synthetic import DELIVERY_METHODS
+from reminder_dispatcher import ReminderDispatcher, ReminderTransport
+from shared.schemas import Reminder, ReminderCreate
+from storage import IStorage
+
+DEFAULT_REMINDERS = 100_000
+
+
+class CountingTransport(ReminderTransport):
+    def __init__(self):
+        self.delivered = Counter()
+        self.batches = 0
+
+    async def send(self, reminders: List[Reminder]) -> None:
+        self.delivered.update(reminder.id for reminder in reminders)
+        self.batches += 1
+
+
+async def seed(storage: IStorage, count: int, due: datetime) -> None:
+    for i in range(count):
+        await storage.create_reminder(ReminderCreate(
+            taskId=f"task-{i % 1000}", message="Bench reminder",
+            deliveryMethod=DELIVERY_METHODS[i % len(DELIVERY_METHODS)], scheduledFor=due + timedelta(microseconds=i),
+        ))
+
+
+async def bench_backend(name: str, reminders: int, future: int, batch_size: int) -> None:
+    open_storage, close_storage = BACKENDS[name]
+    storage = open_storage()
+    try:
+        start = time.perf_counter()
+        await seed(storage, reminders, datetime.now() - timedelta(minutes=5))
+        await seed(storage, future, datetime.now() + timedelta(days=1))
+        seed_seconds = time.perf_counter() - start
+
+        transport = CountingTransport()
+        dispatcher = ReminderDispatcher(storage, {}, default_transport=transport, batch_size=batch_size)
+        start = time.perf_counter()
+        while await dispatcher.run_once():
+            pass
+        seconds = time.perf_counter() - start
+
+        stats = dispatcher.stats()
+        duplicates = sum(count - 1 for count in transport.delivered.values() if count > 1)
+        left = len(await storage.get_due_reminders(datetime.now()))
+        print(
+            f"{name:<8} {reminders:>9,} {future:>9,} {seed_seconds:>9.1f} {seconds:>9.2f} {stats['sent'] / seconds:>12,.0f} "
+            f"{transport.batches:>8,} {stats['lost_claims']:>6,} {duplicates:>6,} {left:>6,}"
+        )
+    finally:
+        close_storage(storage)
+
+
+async def main(backends: List[str], reminders: int, future: int, batch_size: int) -> None:
+    print(f"batch size {batch_size}; seed and drain times in seconds\n")
+    print(f"{'backend':<8} {'reminders':>9} {'future':>9} {'seed (s)':>9} {'drain (s)':>9} {'sent/s':>12} {'batches':>8} {'lost':>6} {'dupes':>6} {'left':>6}")
+    for name in backends:
+        await bench_backend(name, reminders, future, batch_size)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default="memory,sqlite", help=f"comma separated, from {', '.join(BACKENDS)}")
+    parser.add_argument("--reminders", type=int, default=DEFAULT_REMINDERS)
+    parser.add_argument("--future", type=int, default=0, help="extra reminders that are not due yet")
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.backends.split(","), args.reminders, args.future, args.batch_size))
@@ -0,0 +1,88 @@
+"""
+Compare MongoStorage.get_okrs (single $lookup aggregation) against the old
+per-OKR find() loop at 100, 1k and 10k OKRs.
+
+Needs a local mongod. Run from Hackathon/AI:
+
+    python -m benchmarks.bench_get_okrs
+"""
+import asyncio
+import os
+import time
+from datetime import datetime
+
+from pymongo import MongoClient
+
+from shared.schemas import Okr, Task, OkrWithTasks
+from storage import MongoStorage
+
+MONGO_URI = os.getenv("BENCH_MONGO_URI", "mongodb://localhost:27017")
+BENCH_DB_NAME = "okr_bench"
+OKR_COUNTS = [100, 1_000, 10_000]
+TASKS_PER_OKR = 4
+REPEATS = 5
+
+
+def seed(storage: MongoStorage, okr_count: int) -> None:
+    storage.okr_collection_mongo.delete_many({})
+    storage.task_collection_mongo.delete_many({})
+    now = datetime.now()
+    okrs = [
+        {"title": f"OKR {i}", "description": f"Publish {TASKS_PER_OKR} articles", "target_date": "2025-12-31",
+         "status": "active", "progress": 0, "created_at": now, "updated_at": now}
+        for i in range(okr_count)
+    ]
+    okr_ids = storage.okr_collection_mongo.insert_many(okrs).inserted_ids
+    tasks = [
+        {"okrId": str(okr_id), "title": f"Task {j}", "description": None, "deadline": "2025-12-31",
+         "status": "completed" if j % 2 else "pending", "micro_status": "pending",
+         "completedAt": None, "proofUrl": None, "createdAt": now, "updatedAt": now}
+        for okr_id in okr_ids
+        for j in range(TASKS_PER_OKR)
+    ]
+    storage.task_collection_mongo.insert_many(tasks)
+    storage.task_collection_mongo.create_index("okrId")
+
+
+def get_okrs_per_okr_find(storage: MongoStorage):
+    # The previous implementation: one find() per OKR
+    okrs_with_tasks = []
+    for okr_doc in storage.okr_collection_mongo.find():
+        okr_doc["_id"] = str(okr_doc["_id"])
+        okr = Okr.model_validate(okr_doc)
+        tasks = []
+        for task_doc in storage.task_collection_mongo.find({"okrId": okr.id}):
+            task_doc["_id"] = str(task_doc["_id"])
+            tasks.append(Task.model_validate(task_doc))
+        completed_tasks = len([task for task in tasks if task.status == "completed"])
+        okrs_with_tasks.append(
+            OkrWithTasks(**okr.model_dump(), tasks=tasks, completed_tasks=completed_tasks, total_tasks=len(tasks))
+        )
+    return okrs_with_tasks
+
+
+def best_of(fn) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    client = MongoClient(MONGO_URI)
+    storage = MongoStorage(client[BENCH_DB_NAME])
+    print(f"{'okrs':>8} {'per-okr find (ms)':>20} {'aggregate (ms)':>16} {'speedup':>8}")
+    try:
+        for okr_count in OKR_COUNTS:
+            seed(storage, okr_count)
+            legacy_ms = best_of(lambda: get_okrs_per_okr_find(storage))
+            aggregate_ms = best_of(lambda: asyncio.run(storage.get_okrs()))
+            print(f"{okr_count:>8} {legacy_ms:>20.1f} {aggregate_ms:>16.1f} {legacy_ms / aggregate_ms:>7.1f}x")
+    finally:
+        client.drop_database(BENCH_DB_NAME)
+
+
+if __name__ == "__main__":
+    main()
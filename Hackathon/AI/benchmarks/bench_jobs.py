@@ -0,0 +1,173 @@
+"""
+Job queue throughput with a stubbed LLM: enqueue N process_okr-shaped jobs,
+then drain them with worker processes whose handler sleeps through two
+"LLM calls" (parse, then plan) in a thread and raises at --fail-rate, so
+retries go through the queue too. Reports enqueue rate, drain time, jobs/s
+against the ideal (slots / handler time), retries, permanent failures and
+jobs that ran to completion more than once.
+
+    python -m benchmarks.bench_jobs --backends sqlite --jobs 2000 --workers 4 --concurrency 8
+    python -m benchmarks.bench_jobs --backends mongo --llm-ms 500 --fail-rate 0.1
+
+The mongo queue lives in a scratch collection on BENCH_MONGO_URI (default
+mongodb://localhost:27017) that is dropped afterwards.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from benchmarks.run_storage import BENCH_DB_NAME, MONGO_URI
+from job_queue import IJobQueue, MongoJobQueue, SQLiteJobQueue
+from job_worker import JobWorker
+from shared.schemas import Job, JobStatus
+
+DEFAULT_JOBS = 2_000
+
+
+def open_queue(backend: str, location: str) -> IJobQueue:
+    if backend == "sqlite":
+        return SQLiteJobQueue(location)
+    from pymongo import AsyncMongoClient
+    return MongoJobQueue(AsyncMongoClient(location, serverSelectionTimeoutMS=3000)[BENCH_DB_NAME])
+
+
+async def create_queue(backend: str) -> tuple:
+    """A fresh queue in the main process, and where worker processes find it."""
+    if backend == "sqlite":
+        fd, path = tempfile.mkstemp(prefix="jobs_bench_", suffix=".db")
+        os.close(fd)
+        return open_queue(backend, path), path
+    from indexes import INDEXES
+    from mongo_clients import JOB_COLLECTION_NAME
+
+    queue = open_queue(backend, MONGO_URI)
+    await queue.collection.drop()
+    await queue.collection.create_indexes(INDEXES[JOB_COLLECTION_NAME])
+    return queue, MONGO_URI
+
+
+async def drop_queue(backend: str, queue: IJobQueue, location: str) -> None:
+    if backend == "sqlite":
+        queue.conn.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(location + suffix):
+                os.remove(location + suffix)
+    else:
+        await queue.collection.drop()
+        await queue.db.client.close()
+
+
+async def run_worker(queue: IJobQueue, concurrency: int, llm_ms: float, fail_rate: float, stop_event) -> tuple:
+    completed = Counter()
+
+    def two_llm_calls() -> None:
+        time.sleep(llm_ms / 1000)  # parse_okr
+        time.sleep(llm_ms / 1000)  # create_micro_tasks
+
+    async def stub_process_okr(job: Job) -> dict:
+        await asyncio.to_thread(two_llm_calls)
+        if random.random() < fail_rate:
+            raise RuntimeError("stub LLM error")
+        completed[job.id] += 1
+        return {"parsed": {"objective": job.payload["title"]}, "micro_tasks": []}
+
+    worker = JobWorker(
+        queue, {"process_okr": stub_process_okr},
+        concurrency=concurrency, lease_seconds=30, retry_seconds=0, poll_seconds=0.02,
+    )
+    stop = asyncio.Event()
+
+    async def watch() -> None:
+        while not stop_event.is_set():
+            await asyncio.sleep(0.02)
+        stop.set()
+
+    await asyncio.gather(worker.run(stop), watch())
+    return worker.stats(), completed
+
+
+def worker_process(backend: str, location: str, concurrency: int, llm_ms: float, fail_rate: float, ready, stop_event, results) -> None:
+    queue = open_queue(backend, location)
+    # Process start-up (imports, connections) stays out of the drain time
+    ready.wait()
+    # Enough threads for every slot's stubbed LLM calls
+    loop = asyncio.new_event_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+    try:
+        results.put(loop.run_until_complete(run_worker(queue, concurrency, llm_ms, fail_rate, stop_event)))
+    finally:
+        if backend == "mongo":
+            loop.run_until_complete(queue.db.client.close())
+        else:
+            queue.conn.close()
+        loop.close()
+
+
+async def bench_backend(backend: str, jobs: int, workers: int, concurrency: int, llm_ms: float, fail_rate: float) -> None:
+    queue, location = await create_queue(backend)
+    try:
+        start = time.perf_counter()
+        for i in range(jobs):
+            await queue.enqueue("process_okr", {"title": f"Bench OKR {i}", "description": "Publish 3 AI articles", "targetDate": "2025-09-30"})
+        enqueue_seconds = time.perf_counter() - start
+
+        context = multiprocessing.get_context("spawn")
+        ready, stop_event, results = context.Barrier(workers + 1), context.Event(), context.Queue()
+        processes = [
+            context.Process(target=worker_process, args=(backend, location, concurrency, llm_ms, fail_rate, ready, stop_event, results))
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        await asyncio.to_thread(ready.wait)
+        start = time.perf_counter()
+        while True:
+            counts = await queue.count_jobs()
+            if not counts.get(JobStatus.QUEUED.value) and not counts.get(JobStatus.RUNNING.value):
+                break
+            await asyncio.sleep(0.05)
+        seconds = time.perf_counter() - start
+        stop_event.set()
+
+        stats, completed = Counter(), Counter()
+        for _ in processes:
+            worker_stats, worker_completed = results.get()
+            stats.update(worker_stats)
+            completed.update(worker_completed)
+        for process in processes:
+            process.join()
+
+        ideal = workers * concurrency / (2 * llm_ms / 1000)
+        duplicates = sum(count - 1 for count in completed.values() if count > 1)
+        print(
+            f"{backend:<7} {jobs:>7,} {jobs / enqueue_seconds:>10,.0f} {seconds:>9.2f} {counts.get(JobStatus.SUCCEEDED.value, 0) / seconds:>8,.1f} "
+            f"{ideal:>8,.1f} {stats['retried']:>8,} {counts.get(JobStatus.FAILED.value, 0):>7,} {duplicates:>6,} {stats['lost_leases']:>6,}"
+        )
+    finally:
+        await drop_queue(backend, queue, location)
+
+
+async def main(backends: List[str], jobs: int, workers: int, concurrency: int, llm_ms: float, fail_rate: float) -> None:
+    print(f"{workers} worker process(es) x {concurrency} slots; stub handler = 2 x {llm_ms:g} ms LLM calls, fail rate {fail_rate:.0%}\n")
+    print(f"{'backend':<7} {'jobs':>7} {'enqueue/s':>10} {'drain (s)':>9} {'jobs/s':>8} {'ideal':>8} {'retries':>8} {'failed':>7} {'dupes':>6} {'lost':>6}")
+    for backend in backends:
+        await bench_backend(backend, jobs, workers, concurrency, llm_ms, fail_rate)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default="sqlite", help="comma separated, from sqlite, mongo")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS)
+    parser.add_argument("--workers", type=int, default=4, help="worker processes")
+    parser.add_argument("--concurrency", type=int, default=8, help="claim loops per worker process")
+    parser.add_argument("--llm-ms", type=float, default=100, help="latency of each stubbed LLM call")
+    parser.add_argument("--fail-rate", type=float, default=0.05, help="share of handler runs that raise")
+    args = parser.parse_args()
+    asyncio.run(main(args.backends.split(","), args.jobs, args.workers, args.concurrency, args.llm_ms, args.fail_rate))
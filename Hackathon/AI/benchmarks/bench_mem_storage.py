@@ -0,0 +1,59 @@
+"""
+Per-call cost of MemStorage point reads as the store grows.
+
+With the okr -> tasks and task -> reminders indexes these should stay flat
+from 10k to 1M tasks. Run from Hackathon/AI:
+
+    python -m benchmarks.bench_mem_storage [max_tasks]
+"""
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from shared.schemas import OkrCreate, TaskCreate, ReminderCreate
+from storage import MemStorage
+
+TASK_COUNTS = [10_000, 100_000, 1_000_000]
+TASKS_PER_OKR = 10
+SAMPLES = 1_000
+
+
+async def grow(storage: MemStorage, okr_ids: list, task_ids: list, task_count: int) -> None:
+    deadline = (datetime.now() + timedelta(days=30)).isoformat()
+    while len(task_ids) < task_count:
+        okr = await storage.create_okr(OkrCreate(title="OKR", description="Publish articles", target_date=deadline))
+        okr_ids.append(okr.id)
+        tasks = await storage.create_tasks_bulk([
+            TaskCreate(okrId=okr.id, title=f"Task {i}", deadline=deadline) for i in range(TASKS_PER_OKR)
+        ])
+        task_ids.extend(task.id for task in tasks)
+        await storage.create_reminder(ReminderCreate(
+            taskId=tasks[0].id, message="Due soon", deliveryMethod="email", scheduledFor=deadline,
+        ))
+
+
+async def per_call_us(method, ids: list) -> float:
+    sample = random.sample(ids, min(SAMPLES, len(ids)))
+    start = time.perf_counter()
+    for id in sample:
+        await method(id)
+    return (time.perf_counter() - start) / len(sample) * 1_000_000
+
+
+async def main(max_tasks: int):
+    random.seed(42)
+    storage = MemStorage()
+    okr_ids, task_ids = [], []
+    print(f"{'tasks':>10} {'get_okr (us)':>14} {'get_tasks_by_okr (us)':>22} {'get_task (us)':>14}")
+    for task_count in [count for count in TASK_COUNTS if count <= max_tasks]:
+        await grow(storage, okr_ids, task_ids, task_count)
+        get_okr_us = await per_call_us(storage.get_okr, okr_ids)
+        by_okr_us = await per_call_us(storage.get_tasks_by_okr, okr_ids)
+        get_task_us = await per_call_us(storage.get_task, task_ids)
+        print(f"{len(task_ids):>10} {get_okr_us:>14.1f} {by_okr_us:>22.1f} {get_task_us:>14.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else TASK_COUNTS[-1]))
@@ -0,0 +1,114 @@
+"""
+Encode time and bytes on the wire for the two nested-OKR list endpoints, with
+FastAPI's default JSON path vs FastJSONResponse (RESPONSE_FAST_JSON=1), and
+what gzip (RESPONSE_GZIP_MIN_BYTES) does to the size.
+
+    /api/get-okrs  raw process_okr documents: parsed blob + embedded micro_tasks
+    /api/okrs      OkrWithTasks models through the route's response_model
+
+No database needed. Run from Hackathon/AI:
+
+    python -m benchmarks.bench_responses [okrs]
+"""
+import gzip
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from routes.responses import FastJSONResponse
+from shared.schemas import OkrWithTasks, Task
+
+DEFAULT_OKRS = 5_000
+TASKS_PER_OKR = 8
+REPEATS = 5
+
+
+def process_okr_doc(i: int) -> dict:
+    # What /api/process_okr stores, after serialize_document() renames _id
+    return {
+        "id": str(ObjectId()),
+        "title": f"Publish AI articles #{i}",
+        "description": "I want to publish 3 AI articles this quarter.",
+        "targetDate": "2025-09-30",
+        "parsed": {
+            "objective": "Publish 3 AI articles",
+            "deliverables": ["Article on transformers", "Article on RAG", "Article on agents"],
+            "key_results": ["Article on transformers", "Article on RAG", "Article on agents"],
+            "timeframe": "Q3",
+            "metrics": {"articles": 3, "min_words": 1200},
+        },
+        "micro_tasks": [
+            {"task": f"Draft section {n} of the article", "due": "2025-08-01", "evidence_hint": "Link to the draft",
+             "level": "medium", "micro_status": "pending"}
+            for n in range(TASKS_PER_OKR)
+        ],
+        "status": "active",
+    }
+
+
+def okr_with_tasks(now: datetime) -> OkrWithTasks:
+    okr_id = str(ObjectId())
+    return OkrWithTasks(
+        _id=okr_id, title="Publish AI articles", description="Publish 3 AI articles this quarter",
+        target_date="2025-09-30", status="active", progress=25, completedTasks=2, totalTasks=TASKS_PER_OKR,
+        created_at=now, updated_at=now,
+        tasks=[
+            Task(_id=str(ObjectId()), okrId=okr_id, title=f"Task {n}", description="Draft the outline",
+                 deadline=now + timedelta(days=n), status="pending", createdAt=now, updatedAt=now)
+            for n in range(TASKS_PER_OKR)
+        ],
+    )
+
+
+def default_body(content) -> bytes:
+    # FastAPI without a response_model: jsonable_encoder, then Starlette's json.dumps
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def response_model_body(adapter: TypeAdapter, models: list) -> bytes:
+    # FastAPI with a response_model: validate, dump to JSON-able python, json.dumps
+    value = adapter.dump_python(adapter.validate_python(models), mode="json", by_alias=True)
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def best_ms(fn) -> tuple:
+    timings, result = [], None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, result
+
+
+def report(endpoint: str, default, fast) -> None:
+    default_ms, default_bytes = best_ms(default)
+    fast_ms, fast_bytes = best_ms(fast)
+    print(f"\n{endpoint}")
+    print(f"  {'encoder':<24} {'encode (ms)':>12} {'bytes':>12}")
+    print(f"  {'default':<24} {default_ms:>12.1f} {len(default_bytes):>12,}")
+    print(f"  {'FastJSONResponse':<24} {fast_ms:>12.1f} {len(fast_bytes):>12,}")
+    for level in (1, 6, 9):
+        gzip_ms, compressed = best_ms(lambda: gzip.compress(fast_bytes, compresslevel=level))
+        print(f"  {f'+ gzip level {level}':<24} {fast_ms + gzip_ms:>12.1f} {len(compressed):>12,}")
+
+
+def main(okr_count: int) -> None:
+    now = datetime.now()
+    print(f"{okr_count:,} OKRs x {TASKS_PER_OKR} micro tasks, best of {REPEATS}")
+
+    docs = {"result": [process_okr_doc(i) for i in range(okr_count)]}
+    report("/api/get-okrs", lambda: default_body(docs), lambda: FastJSONResponse(docs).body)
+
+    models = [okr_with_tasks(now) for _ in range(okr_count)]
+    adapter = TypeAdapter(List[OkrWithTasks])
+    report("/api/okrs", lambda: response_model_body(adapter, models), lambda: FastJSONResponse(models).body)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_OKRS)
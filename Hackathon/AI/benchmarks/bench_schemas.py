@@ -0,0 +1,111 @@
+"""
+Cost of shared/schemas.py validation and serialization on storage-shaped
+documents, and of the trusted-read path (STORAGE_TRUSTED_READS=1) that
+serves raw documents without building models.
+
+Documents look like what MongoStorage reads back: string _ids, BSON dates
+already decoded to datetimes. Run from Hackathon/AI:
+
+    python -m benchmarks.bench_schemas [okrs] [tasks_per_okr]
+"""
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from bson import ObjectId
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from shared.schemas import OkrWithTasks, Reminder, Task, TaskWithReminders
+
+DEFAULT_OKRS = 1_000
+DEFAULT_TASKS_PER_OKR = 10
+REPEATS = 5
+
+
+def task_doc(okr_id: str, i: int, now: datetime) -> dict:
+    return {
+        "_id": str(ObjectId()), "okrId": okr_id, "title": f"Task {i}", "description": "Draft the outline",
+        "deadline": now + timedelta(days=i), "status": "pending", "micro_status": "pending",
+        "completedAt": None, "proofUrl": None, "createdAt": now, "updatedAt": now,
+    }
+
+
+def okr_doc(tasks_per_okr: int, now: datetime) -> dict:
+    okr_id = str(ObjectId())
+    return {
+        "_id": okr_id, "title": "Publish AI articles", "description": "Publish 3 AI articles this quarter",
+        "target_date": "2025-09-30", "status": "active", "progress": 0, "completedTasks": 0,
+        "totalTasks": tasks_per_okr, "created_at": now, "updated_at": now,
+        "tasks": [task_doc(okr_id, i, now) for i in range(tasks_per_okr)],
+    }
+
+
+def reminder_doc(now: datetime) -> dict:
+    return {
+        "_id": str(ObjectId()), "taskId": str(ObjectId()), "message": "Due soon", "deliveryMethod": "email",
+        "status": "pending", "scheduledFor": now, "sentAt": None, "createdAt": now,
+    }
+
+
+def best_ms(fn) -> float:
+    # Best of REPEATS, to keep GC and scheduler noise out of the comparison
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def construct_okr(doc: dict) -> OkrWithTasks:
+    # model_construct doesn't build nested models, so build the tasks first
+    return OkrWithTasks.model_construct(**{**doc, "tasks": [Task.model_construct(**task) for task in doc["tasks"]]})
+
+
+def main(okr_count: int, tasks_per_okr: int) -> None:
+    now = datetime.now()
+    okr_docs = [okr_doc(tasks_per_okr, now) for _ in range(okr_count)]
+    task_docs = [task for okr in okr_docs for task in okr["tasks"]]
+    reminder_docs = [reminder_doc(now) for _ in range(len(task_docs))]
+    okr_list = TypeAdapter(List[OkrWithTasks])
+    print(f"{okr_count:,} OKRs x {tasks_per_okr} tasks, best of {REPEATS}\n")
+
+    print(f"{'build models':<30} {'validate (ms)':>14} {'construct (ms)':>15}")
+    for name, model, docs, construct in [
+        (f"Task x{len(task_docs):,}", Task, task_docs, lambda doc: Task.model_construct(**doc)),
+        (f"Reminder x{len(reminder_docs):,}", Reminder, reminder_docs, lambda doc: Reminder.model_construct(**doc)),
+        (f"OkrWithTasks x{okr_count:,}", OkrWithTasks, okr_docs, construct_okr),
+    ]:
+        validate_ms = best_ms(lambda: [model.model_validate(doc) for doc in docs])
+        construct_ms = best_ms(lambda: [construct(doc) for doc in docs])
+        print(f"{name:<30} {validate_ms:>14.1f} {construct_ms:>15.1f}")
+
+    # What a list endpoint pays per page: validated models go through the
+    # response_model (validate again, dump to JSON-able python, json.dumps),
+    # raw documents go straight to the encoder
+    okrs = [OkrWithTasks.model_validate(doc) for doc in okr_docs]
+    print(f"\n{'GET /okrs response':<30} {'time (ms)':>14}")
+    print(f"{'validate + response_model':<30} {best_ms(lambda: json.dumps(okr_list.dump_python(okr_list.validate_python([OkrWithTasks.model_validate(doc) for doc in okr_docs]), mode='json', by_alias=True))):>14.1f}")
+    print(f"{'validate + model_dump_json':<30} {best_ms(lambda: okr_list.dump_json([OkrWithTasks.model_validate(doc) for doc in okr_docs], by_alias=True)):>14.1f}")
+    print(f"{'trusted: raw to_json':<30} {best_ms(lambda: to_json(okr_docs, fallback=str)):>14.1f}")
+
+    # get_task used to validate a Task, dump it and validate it again with its reminders
+    pairs = list(zip(task_docs, reminder_docs))
+    print(f"\n{f'get_task x{len(pairs):,}':<30} {'time (ms)':>14}")
+    print(f"{'validate, dump, re-validate':<30} {best_ms(lambda: [TaskWithReminders(**Task.model_validate(task).model_dump(), reminders=[Reminder.model_validate(reminder)]) for task, reminder in pairs]):>14.1f}")
+    print(f"{'single validate':<30} {best_ms(lambda: [TaskWithReminders.model_validate({**task, 'reminders': [reminder]}) for task, reminder in pairs]):>14.1f}")
+
+    print(f"\n{'serialize OkrWithTasks':<30} {'time (ms)':>14}")
+    print(f"{'model_dump(by_alias=True)':<30} {best_ms(lambda: [okr.model_dump(by_alias=True) for okr in okrs]):>14.1f}")
+    print(f"{'model_dump(mode=json)':<30} {best_ms(lambda: [okr.model_dump(mode='json', by_alias=True) for okr in okrs]):>14.1f}")
+    print(f"{'model_dump_json()':<30} {best_ms(lambda: [okr.model_dump_json(by_alias=True) for okr in okrs]):>14.1f}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_OKRS,
+        int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_TASKS_PER_OKR,
+    )
@@ -0,0 +1,151 @@
+"""
+Semantic OKR cache: hit rate, wrong reuses and LLM latency saved on a stream
+of reworded OKRs.
+
+Each request picks one of a handful of OKR intents, phrased one of several
+ways, with a random deadline, and goes through the same two steps as
+job_handlers.process_okr: parse (stubbed LLM, --parse-ms) and plan micro
+tasks (stubbed LLM, --plan-ms), each behind SemanticCache exactly as the
+agents use it. Embeddings come from the real MiniLM model (MODEL_NAME). A
+reuse is "wrong" if the stored result came from a different intent, e.g.
+"3 articles" answered with the plan for "5 articles".
+
+    python -m benchmarks.bench_semantic_cache --requests 200 --thresholds 0.8,0.85,0.9
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Dict, List
+
+from semantic_cache import SemanticCache, find_deadline, reschedule, sentence_transformer_embedder, strip_deadline
+
+# intent -> ways students wrote it
+INTENTS: Dict[str, List[str]] = {
+    "3 AI articles": [
+        "I want to publish 3 AI articles this quarter.",
+        "Publish three AI articles",
+        "write 3 articles about artificial intelligence and publish them",
+        "Publish 3 blog articles on AI",
+        "I will publish three articles on AI topics",
+    ],
+    "5 AI articles": [
+        "I want to publish 5 AI articles this quarter.",
+        "Publish five AI articles",
+        "write 5 articles about artificial intelligence and publish them",
+    ],
+    "resume": [
+        "Build a strong resume for internship applications",
+        "Create my resume for internships",
+        "Prepare a resume to apply for internships",
+        "Write a resume for internship applications",
+    ],
+    "portfolio site": [
+        "Build a personal portfolio website",
+        "Create my portfolio website and deploy it",
+        "Make a personal website to show my projects",
+        "Launch a portfolio site",
+    ],
+    "2 github projects": [
+        "Complete 2 machine learning projects on GitHub",
+        "Finish two ML projects and push them to GitHub",
+        "Build 2 machine learning projects and publish them on GitHub",
+    ],
+    "linkedin": [
+        "Grow my LinkedIn network to 500 connections",
+        "Reach 500 connections on LinkedIn",
+        "Get 500 LinkedIn connections",
+    ],
+    "dsa": [
+        "Solve 100 data structures and algorithms problems",
+        "Practice 100 DSA problems on LeetCode",
+        "Complete 100 LeetCode problems",
+    ],
+    "aws cert": [
+        "Get the AWS Cloud Practitioner certification",
+        "Pass the AWS Cloud Practitioner exam",
+        "Earn AWS Cloud Practitioner certificate",
+    ],
+}
+
+
+def stub_parse(intent: str, parse_ms: float) -> dict:
+    time.sleep(parse_ms / 1000)
+    # A good parser maps every phrasing of an intent to much the same objective
+    return {"objective": f"Achieve: {intent}", "deliverables": [f"{intent} done"], "deadline": "Unspecified"}
+
+
+def stub_plan(parsed: dict, deadline: str, plan_ms: float) -> List[dict]:
+    time.sleep(plan_ms / 1000)
+    today, end = date.today(), date.fromisoformat(deadline)
+    return [
+        {"task": f"Step {n} of {parsed['objective']}", "due": (today + (end - today) * n // 5).isoformat(),
+         "evidence_hint": "text", "level": "medium", "micro_status": "pending"}
+        for n in range(1, 6)
+    ]
+
+
+def run(embed, threshold: float, requests: List[tuple], parse_ms: float, plan_ms: float) -> None:
+    fd, path = tempfile.mkstemp(prefix="semantic_bench_", suffix=".db")
+    os.close(fd)
+    cache = SemanticCache(path, embed, threshold=threshold)
+    wrong = 0
+    start = time.perf_counter()
+    try:
+        for intent, phrasing, deadline in requests:
+            okr_text = f"{phrasing} by {deadline}"
+            parsed, hit = cache.get_or_compute(
+                "parse_okr", strip_deadline(okr_text), lambda: stub_parse(intent, parse_ms), context={"intent": intent},
+                adapt=lambda hit: {**hit.result, "deadline": find_deadline(okr_text) or "Unspecified"},
+            )
+            wrong += bool(hit and hit.context["intent"] != intent)
+            # The same text create_micro_tasks embeds
+            plan_text = f"{parsed['objective']}\n" + "\n".join(parsed["deliverables"])
+            _, hit = cache.get_or_compute(
+                "create_micro_tasks", plan_text, lambda: stub_plan(parsed, deadline, plan_ms), context={"deadline": deadline, "intent": intent},
+                adapt=lambda hit: reschedule(hit.result, hit.created_at.date(), hit.context.get("deadline"), deadline),
+            )
+            wrong += bool(hit and hit.context["intent"] != intent)
+        seconds = time.perf_counter() - start
+        stats = cache.stats()
+        uncached = len(requests) * (parse_ms + plan_ms) / 1000
+        print(
+            f"{threshold:>9.2f} {stats['lookups']:>7,} {stats['hit_rate']:>8.0%} {wrong:>6,} {stats['rejected']:>9,} "
+            f"{stats['llm_seconds_saved']:>10.1f} {stats['lookup_seconds'] / stats['lookups'] * 1000:>10.1f} "
+            f"{uncached / len(requests) * 1000:>12.0f} {seconds / len(requests) * 1000:>11.0f}"
+        )
+    finally:
+        cache.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+def main(request_count: int, thresholds: List[float], parse_ms: float, plan_ms: float, seed: int) -> None:
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(request_count):
+        intent = rng.choice(list(INTENTS))
+        requests.append((intent, rng.choice(INTENTS[intent]), (date.today() + timedelta(days=rng.randint(14, 120))).isoformat()))
+
+    start = time.perf_counter()
+    embed = sentence_transformer_embedder()
+    print(f"Model loaded in {time.perf_counter() - start:.1f}s; {request_count} requests over {sum(map(len, INTENTS.values()))} phrasings "
+          f"of {len(INTENTS)} intents; stubbed LLM {parse_ms:g} ms parse + {plan_ms:g} ms plan\n")
+    print(f"{'threshold':>9} {'lookups':>7} {'hit rate':>8} {'wrong':>6} {'refused':>9} {'saved (s)':>10} {'lookup ms':>10} "
+          f"{'uncached ms':>12} {'mean ms':>11}")
+    for threshold in thresholds:
+        run(embed, threshold, requests, parse_ms, plan_ms)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--thresholds", default="0.8,0.85,0.9")
+    parser.add_argument("--parse-ms", type=float, default=800, help="latency of the stubbed parse_okr call")
+    parser.add_argument("--plan-ms", type=float, default=1500, help="latency of the stubbed create_micro_tasks call")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    main(args.requests, [float(value) for value in args.thresholds.split(",")], args.parse_ms, args.plan_ms, args.seed)
@@ -0,0 +1,104 @@
+"""
+validate_submission's sub-agent stage with stubbed models: the old one-after-
+another `.invoke` of Agents 1-3 (then Agent 4) against
+okr_validator.run_validation_agents, which runs Agents 1-3 concurrently and
+Agent 4 after them.
+
+Each stub agent answers after a latency drawn around --llm-ms (+/- --jitter),
+roughly what one Gemini flash ReAct turn takes, and flags a problem ("❌")
+with probability --fail-rate so Agent 4 runs on some submissions. Reports
+mean, p50 and p95 latency per submission for both.
+
+    python -m benchmarks.bench_validator_fanout --submissions 20 --llm-ms 2500
+
+Importing agents.okr_validator needs the app's dependencies and .env
+(GOOGLE_API_KEY); no model is called.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from types import SimpleNamespace
+from typing import Callable, List
+
+from agents import okr_validator
+
+
+class StubAgent:
+    """Stands in for a create_react_agent graph: same invoke/ainvoke shape."""
+
+    def __init__(self, name: str, latency: Callable[[], float], fail_rate: float, rng: random.Random):
+        self.name = name
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.rng = rng
+
+    def _answer(self) -> dict:
+        verdict = "❌ issues found" if self.rng.random() < self.fail_rate else "✅ looks good"
+        return {"messages": [SimpleNamespace(content=f"{self.name}: {verdict}")]}
+
+    def invoke(self, inputs: dict, config: dict = None) -> dict:
+        time.sleep(self.latency())
+        return self._answer()
+
+    async def ainvoke(self, inputs: dict, config: dict = None) -> dict:
+        await asyncio.sleep(self.latency())
+        return self._answer()
+
+
+def sequential_checks(task_hint: str, content: str, config: dict) -> str:
+    """The sub-agent stage as it was: each agent waits for the one before."""
+    result = ""
+    for create_agent in (okr_validator.create_agent1, okr_validator.create_agent2, okr_validator.create_agent3):
+        result += create_agent().invoke({"messages": [{"role": "user", "content": content}]}, config=config)["messages"][-1].content
+    if "❌" in result:
+        result += okr_validator.create_agent4().invoke({"messages": [{"role": "user", "content": content}]}, config=config)["messages"][-1].content
+    return result
+
+
+def summary(label: str, seconds: List[float]) -> str:
+    ordered = sorted(seconds)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"{label:<11} {statistics.mean(seconds):>8.2f} {statistics.median(seconds):>8.2f} {p95:>8.2f}"
+
+
+async def main(submissions: int, llm_ms: float, jitter: float, fail_rate: float, timeout: float, seed: int) -> None:
+    rng = random.Random(seed)
+
+    def latency() -> float:
+        return max(0.0, rng.uniform(llm_ms - jitter, llm_ms + jitter)) / 1000
+
+    for number in range(1, 5):
+        setattr(okr_validator, f"create_agent{number}", lambda number=number: StubAgent(f"Agent {number}", latency, fail_rate, rng))
+    okr_validator.SUB_AGENT_TIMEOUT_SECONDS = timeout
+    config = {"configurable": {"thread_id": "bench", "checkpoint_ns": "okr_validation"}}
+    task_hint, content = "Build a strong resume for internship applications", "Resume text " * 50
+
+    sequential, concurrent = [], []
+    for _ in range(submissions):
+        start = time.perf_counter()
+        await asyncio.to_thread(sequential_checks, task_hint, content, config)
+        sequential.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await okr_validator.run_validation_agents(task_hint, content, config)
+        concurrent.append(time.perf_counter() - start)
+
+    print(f"\n{submissions} submissions; stub agents answer in {llm_ms:g} +/- {jitter:g} ms, flag a problem {fail_rate:.0%} of the time\n")
+    print(f"{'':<11} {'mean (s)':>8} {'p50 (s)':>8} {'p95 (s)':>8}")
+    print(summary("sequential", sequential))
+    print(summary("concurrent", concurrent))
+    print(f"\n✅ Mean latency down {1 - statistics.mean(concurrent) / statistics.mean(sequential):.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--submissions", type=int, default=20)
+    parser.add_argument("--llm-ms", type=float, default=2500, help="mean latency of one stubbed agent run")
+    parser.add_argument("--jitter", type=float, default=1000, help="latency spread either side of --llm-ms")
+    parser.add_argument("--fail-rate", type=float, default=0.2, help="chance each of Agents 1-3 flags a problem")
+    parser.add_argument("--timeout", type=float, default=60, help="per-agent timeout (VALIDATOR_AGENT_TIMEOUT)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    asyncio.run(main(args.submissions, args.llm_ms, args.jitter, args.fail_rate, args.timeout, args.seed))
@@ -0,0 +1,41 @@
+"""
+Print a per-method p50/p99 comparison of backends from a run_storage report.
+
+    python -m benchmarks.compare_backends bench.json --baseline mongo
+
+Each row shows the backend's latency and its p50 as a multiple of the
+baseline's at the same dataset size (below 1.0 is faster).
+"""
+import argparse
+import json
+from collections import defaultdict
+
+
+def compare(report: dict, baseline: str) -> str:
+    by_key = defaultdict(dict)
+    for result in report["results"]:
+        by_key[(result["tasks"], result["method"])][result["backend"]] = result
+
+    backends = sorted({result["backend"] for result in report["results"]})
+    lines = [f"{'tasks':>10}  {'method':<24}" + "".join(f"{backend:>28}" for backend in backends)]
+    for (tasks, method), results in sorted(by_key.items()):
+        base = results.get(baseline)
+        cells = []
+        for backend in backends:
+            result = results.get(backend)
+            if not result:
+                cells.append(f"{'-':>28}")
+                continue
+            ratio = f" x{result['p50_ms'] / base['p50_ms']:.2f}" if base and base["p50_ms"] else ""
+            cells.append(f"{result['p50_ms']:>9.3f}/{result['p99_ms']:<9.3f}ms{ratio:>7}")
+        lines.append(f"{tasks:>10,}  {method:<24}" + "".join(cells))
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("report")
+    parser.add_argument("--baseline", default="mongo")
+    args = parser.parse_args()
+    with open(args.report) as f:
+        print(compare(json.load(f), args.baseline))
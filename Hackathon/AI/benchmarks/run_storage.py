@@ -0,0 +1,193 @@
+"""
+Run every IStorage method against seeded synthetic data and report p50/p99
+latency and throughput as JSON.
+
+    python -m benchmarks.run_storage --backends memory,mongo --sizes 10000,100000,1000000 --output bench.json
+    python -m benchmarks.run_storage --backends sqlite,mongo --output bench.json
+    python -m benchmarks.compare_backends bench.json --baseline mongo
+
+The mongo backend uses a scratch database on BENCH_MONGO_URI (default
+mongodb://localhost:27017) that is dropped afterwards. List methods are
+measured with a page of PAGE_SIZE, since full scans at 1M tasks say more
+about the client than about the storage. The sqlite backend writes to a
+temporary file that is removed afterwards.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List
+
+from shared.schemas import OkrCreate, ReminderCreate, TaskCreate, TaskStatus, TaskUpdate
+from storage import IStorage, MemStorage, MongoStorage
+from sqlite_storage import SQLiteStorage
+from benchmarks.synthetic import SeededIds, seed_storage
+
+MONGO_URI = os.getenv("BENCH_MONGO_URI", "mongodb://localhost:27017")
+BENCH_DB_NAME = "okr_bench"
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+DEFAULT_SAMPLES = 500
+# get_upcoming_reminders returns every pending reminder, so sample it less
+HEAVY_SAMPLES = 20
+PAGE_SIZE = 20
+
+
+def open_memory() -> IStorage:
+    return MemStorage()
+
+
+def open_mongo() -> IStorage:
+    from pymongo import MongoClient
+    from indexes import ensure_indexes
+
+    client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=3000)
+    client.drop_database(BENCH_DB_NAME)
+    ensure_indexes(client[BENCH_DB_NAME])
+    return MongoStorage(client[BENCH_DB_NAME])
+
+
+def close_mongo(storage: MongoStorage) -> None:
+    storage.db.client.drop_database(BENCH_DB_NAME)
+    storage.db.client.close()
+
+
+def open_sqlite() -> IStorage:
+    fd, path = tempfile.mkstemp(prefix="okr_bench_", suffix=".db")
+    os.close(fd)
+    return SQLiteStorage(path)
+
+
+def close_sqlite(storage: SQLiteStorage) -> None:
+    storage.conn.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(storage.path + suffix):
+            os.remove(storage.path + suffix)
+
+
+BACKENDS: Dict[str, tuple] = {
+    "memory": (open_memory, lambda storage: None),
+    "mongo": (open_mongo, close_mongo),
+    "sqlite": (open_sqlite, close_sqlite),
+}
+
+
+def workload(storage: IStorage, ids: SeededIds, rng: random.Random) -> Dict[str, Callable[[], Awaitable]]:
+    """One zero-argument call per IStorage method, drawing ids from the seeded data."""
+    deadline = (datetime.now() + timedelta(days=30)).isoformat()
+    okr_id = lambda: rng.choice(ids.okr_ids)
+    task_id = lambda: rng.choice(ids.task_ids)
+    reminder_id = lambda: rng.choice(ids.reminder_ids)
+    return {
+        "create_okr": lambda: storage.create_okr(OkrCreate(title="Bench OKR", description="Benchmark OKR", target_date=deadline)),
+        "get_okrs": lambda: storage.get_okrs(after=okr_id(), limit=PAGE_SIZE),
+        "get_okr": lambda: storage.get_okr(okr_id()),
+        "update_okr_progress": lambda: storage.update_okr_progress(okr_id(), rng.randint(0, 100)),
+        "update_okr_status": lambda: storage.update_okr_status(okr_id(), rng.choice(["active", "completed"])),
+        "create_task": lambda: storage.create_task(TaskCreate(okrId=okr_id(), title="Bench task", deadline=deadline)),
+        "create_tasks_bulk": lambda: storage.create_tasks_bulk(
+            [TaskCreate(okrId=okr_id(), title="Bench task", deadline=deadline) for _ in range(10)]
+        ),
+        "get_tasks": lambda: storage.get_tasks(after=task_id(), limit=PAGE_SIZE),
+        "get_tasks_by_okr": lambda: storage.get_tasks_by_okr(okr_id()),
+        "get_task": lambda: storage.get_task(task_id()),
+        "update_task": lambda: storage.update_task(task_id(), TaskUpdate(title="Renamed bench task")),
+        "update_task_status": lambda: storage.update_task_status(task_id(), rng.choice(list(TaskStatus))),
+        "complete_task": lambda: storage.complete_task(task_id(), "https://example.com/proof"),
+        "create_reminder": lambda: storage.create_reminder(ReminderCreate(
+            taskId=task_id(), message="Bench reminder", deliveryMethod="email", scheduledFor=deadline,
+        )),
+        "get_reminders": lambda: storage.get_reminders(after=reminder_id(), limit=PAGE_SIZE),
+        "get_upcoming_reminders": lambda: storage.get_upcoming_reminders(),
+        "update_reminder_status": lambda: storage.update_reminder_status(reminder_id(), rng.choice(["pending", "sent"])),
+    }
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def measure(call: Callable[[], Awaitable], samples: int) -> dict:
+    latencies = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        "calls": samples,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 4),
+        "ops_per_sec": round(samples / sum(latencies), 1),
+    }
+
+
+async def run_backend(backend: str, size: int, samples: int, seed: int) -> List[dict]:
+    open_storage, close_storage = BACKENDS[backend]
+    storage = open_storage()
+    try:
+        start = time.perf_counter()
+        ids = await seed_storage(storage, size, seed)
+        print(f"[{backend} {size:,} tasks] seeded in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+        rng = random.Random(seed)
+        results = []
+        for method, call in workload(storage, ids, rng).items():
+            stats = await measure(call, HEAVY_SAMPLES if method == "get_upcoming_reminders" else samples)
+            results.append({"backend": backend, "tasks": size, "method": method, **stats})
+            print(f"[{backend} {size:,} tasks] {method}: p50 {stats['p50_ms']}ms p99 {stats['p99_ms']}ms", file=sys.stderr)
+        return results
+    finally:
+        close_storage(storage)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+async def main(args: argparse.Namespace) -> dict:
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "seed": args.seed,
+            "samples": args.samples,
+            "page_size": PAGE_SIZE,
+        },
+        "results": [],
+    }
+    for backend in args.backends:
+        for size in args.sizes:
+            report["results"].extend(await run_backend(backend, size, args.samples, args.seed))
+    return report
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", type=lambda value: value.split(","), default=list(BACKENDS))
+    parser.add_argument("--sizes", type=lambda value: [int(size) for size in value.split(",")], default=DEFAULT_SIZES)
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = asyncio.run(main(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
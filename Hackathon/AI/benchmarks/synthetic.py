@@ -0,0 +1,94 @@
+"""
+Seeded synthetic OKRs, tasks and reminders in the shared/schemas.py shapes.
+
+The same (task_count, seed, start) always produces the same dataset, so runs
+of different versions or backends are comparable. `start` defaults to today
+so that reminders and deadlines fall in the future.
+"""
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Iterator, List, Optional, Tuple
+
+from shared.schemas import OkrCreate, TaskCreate, ReminderCreate
+
+OKR_TEMPLATES = [
+    ("Publish AI articles", "I want to publish {n} AI articles this quarter."),
+    ("Ship side projects", "Build and deploy {n} coding projects before the deadline."),
+    ("Polish my resume", "Rewrite my resume and get {n} reviews from mentors."),
+    ("Grow LinkedIn presence", "Post {n} LinkedIn updates about what I am learning."),
+    ("Learn system design", "Finish {n} system design case studies with notes."),
+]
+TASK_VERBS = ["Outline", "Research", "Draft", "Edit", "Review", "Publish", "Build", "Deploy", "Present"]
+DELIVERY_METHODS = ["email", "dashboard", "sms"]
+MEAN_TASKS_PER_OKR = 10
+REMINDER_PROBABILITY = 0.2
+
+
+@dataclass
+class OkrSpec:
+    okr: OkrCreate
+    tasks: List[dict] = field(default_factory=list)  # TaskCreate fields without okrId
+    reminders: List[Tuple[int, dict]] = field(default_factory=list)  # (task index, ReminderCreate fields without taskId)
+
+    def task_creates(self, okr_id: str) -> List[TaskCreate]:
+        return [TaskCreate(okrId=okr_id, **task) for task in self.tasks]
+
+    def reminder_creates(self, task_ids: List[str]) -> List[ReminderCreate]:
+        return [ReminderCreate(taskId=task_ids[index], **reminder) for index, reminder in self.reminders]
+
+
+@dataclass
+class SeededIds:
+    okr_ids: List[str] = field(default_factory=list)
+    task_ids: List[str] = field(default_factory=list)
+    reminder_ids: List[str] = field(default_factory=list)
+
+
+def generate(task_count: int, seed: int = 42, start: Optional[datetime] = None) -> Iterator[OkrSpec]:
+    """Yield OKRs with 3-17 tasks each until `task_count` tasks have been produced."""
+    rng = random.Random(seed)
+    start = start or datetime.combine(date.today(), time())
+    produced = 0
+    okr_number = 0
+    while produced < task_count:
+        okr_number += 1
+        title, description = rng.choice(OKR_TEMPLATES)
+        n = rng.randint(2, 10)
+        target_date = start + timedelta(days=rng.randint(14, 120))
+        spec = OkrSpec(okr=OkrCreate(
+            title=f"{title} #{okr_number}",
+            description=description.format(n=n),
+            target_date=target_date.date().isoformat(),
+        ))
+
+        task_total = min(rng.randint(3, 2 * MEAN_TASKS_PER_OKR - 3), task_count - produced)
+        for i in range(task_total):
+            deadline = start + timedelta(days=rng.randint(1, (target_date - start).days))
+            spec.tasks.append({
+                "title": f"{rng.choice(TASK_VERBS)} step {i + 1} of {title.lower()}",
+                "description": f"Deliverable {i + 1} towards: {description.format(n=n)}",
+                "deadline": deadline,
+            })
+            if rng.random() < REMINDER_PROBABILITY:
+                spec.reminders.append((i, {
+                    "message": f"Reminder: step {i + 1} of {title.lower()} is due soon",
+                    "deliveryMethod": rng.choice(DELIVERY_METHODS),
+                    "scheduledFor": max(start, deadline - timedelta(hours=rng.randint(1, 72))),
+                }))
+        produced += task_total
+        yield spec
+
+
+async def seed_storage(storage, task_count: int, seed: int = 42) -> SeededIds:
+    """Load a generated dataset through the IStorage API and return the new ids."""
+    ids = SeededIds()
+    for spec in generate(task_count, seed):
+        okr = await storage.create_okr(spec.okr)
+        ids.okr_ids.append(okr.id)
+        tasks = await storage.create_tasks_bulk(spec.task_creates(okr.id))
+        task_ids = [task.id for task in tasks]
+        ids.task_ids.extend(task_ids)
+        for reminder in spec.reminder_creates(task_ids):
+            ids.reminder_ids.append((await storage.create_reminder(reminder)).id)
+    return ids
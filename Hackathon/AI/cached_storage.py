@@ -0,0 +1,272 @@
+"""
+Read-through cache around any IStorage.
+
+get_okr, get_okrs, get_task and get_upcoming_reminders results are kept in a
+bounded LRU with a TTL; every mutating method drops the keys it can affect.
+Upcoming reminders also expire as soon as the earliest of them falls due,
+since that one then drops out of the result.
+Over a WriteBehindStorage, invalidate_status_updates also drops them again
+once a buffered batch has been written.
+Cached models are shared between callers, so treat them as read-only.
+"""
+import time
+from datetime import datetime
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Union
+
+from shared.schemas import (
+    Okr, OkrCreate, OkrWithTasks, Reminder, ReminderCreate, Task, TaskCreate, TaskStatus, TaskUpdate, TaskWithReminders,
+)
+from storage import IStorage
+
+_MISSING = object()
+
+
+class CachedStorage(IStorage):
+    def __init__(self, storage: IStorage, max_entries: int = 1024, ttl_seconds: float = 30.0):
+        self.storage = storage
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        # Learned from results, so mutations that only get an id can find the
+        # parent entries to drop
+        self._okr_id_by_task: Dict[str, str] = {}
+        self._task_id_by_reminder: Dict[str, str] = {}
+        # Bumped by every invalidation: a read that started before one may have
+        # fetched what it dropped, so its result isn't cached
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # Cache bookkeeping
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _get(self, key: Hashable):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return _MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return _MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def _put(self, key: Hashable, value, generation: int, ttl_seconds: Optional[float] = None) -> None:
+        if generation != self._generation:
+            return
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _invalidate(self, key: Hashable) -> None:
+        self._generation += 1
+        self._entries.pop(key, None)
+
+    def _invalidate_method(self, method: str) -> None:
+        self._generation += 1
+        for key in [key for key in self._entries if key[0] == method]:
+            del self._entries[key]
+
+    def _invalidate_okr(self, okr_id: Optional[str]) -> None:
+        if okr_id is None:
+            self._invalidate_method("get_okr")
+        else:
+            self._invalidate(("get_okr", okr_id))
+        self._invalidate_method("get_okrs")
+
+    def _invalidate_task(self, task_id: str, okr_id: Optional[str] = None) -> None:
+        self._invalidate(("get_task", task_id))
+        self._invalidate_okr(okr_id or self._okr_id_by_task.get(task_id))
+
+    def _remember_tasks(self, tasks: List[Task]) -> None:
+        for task in tasks:
+            self._okr_id_by_task[task.id] = task.okr_id
+
+    def _remember_reminders(self, reminders: List[Reminder]) -> None:
+        for reminder in reminders:
+            self._task_id_by_reminder[reminder.id] = reminder.task_id
+
+    def invalidate_status_updates(self, task_statuses: Dict[str, TaskStatus], okr_statuses: Dict[str, str]) -> None:
+        """Drop the entries a batch of status updates written beneath the cache affects."""
+        for task_id in task_statuses:
+            self._invalidate_task(task_id)
+        for okr_id in okr_statuses:
+            self._invalidate_okr(okr_id)
+
+    # OKR methods
+    async def create_okr(self, okr: OkrCreate) -> Okr:
+        created = await self.storage.create_okr(okr)
+        self._invalidate_method("get_okrs")
+        return created
+
+    async def get_okrs(self, after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None, raw: bool = False) -> List[Union[OkrWithTasks, dict]]:
+        key = ("get_okrs", after, limit, tuple(fields) if fields else None, raw)
+        okrs = self._get(key)
+        if okrs is _MISSING:
+            generation = self._generation
+            okrs = await self.storage.get_okrs(after, limit, fields, raw)
+            self._put(key, okrs, generation)
+        return okrs
+
+    async def get_okr(self, id: str) -> Optional[OkrWithTasks]:
+        key = ("get_okr", id)
+        okr = self._get(key)
+        if okr is _MISSING:
+            generation = self._generation
+            okr = await self.storage.get_okr(id)
+            if okr:
+                self._remember_tasks(okr.tasks)
+            self._put(key, okr, generation)
+        return okr
+
+    async def update_okr_progress(self, id: str, progress: int) -> None:
+        await self.storage.update_okr_progress(id, progress)
+        self._invalidate_okr(id)
+
+    async def update_okr_status(self, okr_id: str, status: str) -> None:
+        await self.storage.update_okr_status(okr_id, status)
+        self._invalidate_okr(okr_id)
+
+    # Task methods
+    async def create_task(self, task: TaskCreate) -> Task:
+        created = await self.storage.create_task(task)
+        self._remember_tasks([created])
+        self._invalidate_okr(created.okr_id)
+        return created
+
+    async def create_tasks_bulk(self, tasks: List[TaskCreate]) -> List[Task]:
+        created = await self.storage.create_tasks_bulk(tasks)
+        self._remember_tasks(created)
+        for okr_id in {task.okr_id for task in created}:
+            self._invalidate_okr(okr_id)
+        return created
+
+    async def get_tasks(self, after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None, raw: bool = False) -> List[Union[Task, dict]]:
+        return await self.storage.get_tasks(after, limit, fields, raw)
+
+    async def get_tasks_by_okr(self, okr_id: str) -> List[Task]:
+        return await self.storage.get_tasks_by_okr(okr_id)
+
+    async def get_task(self, id: str) -> Optional[TaskWithReminders]:
+        key = ("get_task", id)
+        task = self._get(key)
+        if task is _MISSING:
+            generation = self._generation
+            task = await self.storage.get_task(id)
+            if task:
+                self._remember_tasks([task])
+                self._remember_reminders(task.reminders)
+            self._put(key, task, generation)
+        return task
+
+    async def update_task(self, id: str, updates: TaskUpdate) -> Optional[Task]:
+        task = await self.storage.update_task(id, updates)
+        self._invalidate_task(id, task.okr_id if task else None)
+        return task
+
+    async def update_task_status(self, task_id: str, status: Union[str, TaskStatus]) -> None:
+        await self.storage.update_task_status(task_id, status)
+        self._invalidate_task(task_id)
+
+    async def complete_task(self, id: str, proof_url: Optional[str] = None) -> Optional[Task]:
+        task = await self.storage.complete_task(id, proof_url)
+        self._invalidate_task(id, task.okr_id if task else None)
+        return task
+
+    async def get_tasks_due_within(self, hours: float) -> List[Task]:
+        return await self.storage.get_tasks_due_within(hours)
+
+    # Reminder methods
+    async def create_reminder(self, reminder: ReminderCreate) -> Reminder:
+        created = await self.storage.create_reminder(reminder)
+        self._remember_reminders([created])
+        self._invalidate(("get_task", created.task_id))
+        self._invalidate(("get_upcoming_reminders",))
+        return created
+
+    async def get_reminders(self, after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None, raw: bool = False) -> List[Union[Reminder, dict]]:
+        return await self.storage.get_reminders(after, limit, fields, raw)
+
+    async def get_upcoming_reminders(self) -> List[Reminder]:
+        key = ("get_upcoming_reminders",)
+        reminders = self._get(key)
+        if reminders is _MISSING:
+            generation = self._generation
+            reminders = await self.storage.get_upcoming_reminders()
+            self._remember_reminders(reminders)
+            # "Upcoming" is relative to now: the result is stale once its first reminder is due
+            due_in = min(((reminder.scheduled_for - datetime.now()).total_seconds() for reminder in reminders), default=None)
+            self._put(key, reminders, generation, due_in)
+        return reminders
+
+    async def update_reminder_status(self, id: str, status: str) -> None:
+        await self.storage.update_reminder_status(id, status)
+        task_id = self._task_id_by_reminder.get(id)
+        if task_id is None:
+            self._invalidate_method("get_task")
+        else:
+            self._invalidate(("get_task", task_id))
+        self._invalidate(("get_upcoming_reminders",))
+
+    # Reminder dispatch
+    async def get_due_reminders(self, until: datetime, limit: Optional[int] = None) -> List[Reminder]:
+        return await self.storage.get_due_reminders(until, limit)
+
+    async def claim_reminder(self, id: str, now: Optional[datetime] = None) -> Optional[Reminder]:
+        reminder = await self.storage.claim_reminder(id, now)
+        if reminder:
+            self._invalidate(("get_task", reminder.task_id))
+            self._invalidate(("get_upcoming_reminders",))
+        return reminder
+
+    async def release_stale_reminder_claims(self, claimed_before: datetime) -> int:
+        released = await self.storage.release_stale_reminder_claims(claimed_before)
+        if released:
+            self._invalidate_method("get_task")
+            self._invalidate(("get_upcoming_reminders",))
+        return released
+
+    # Dashboard
+    async def get_dashboard_stats(self, now: Optional[datetime] = None) -> Dict[str, object]:
+        # Not cached: every mutation would have to drop it, and it's one backend call already
+        return await self.storage.get_dashboard_stats(now)
+
+    async def get_task_rollups(self, period: str, since: Optional[datetime] = None) -> List[dict]:
+        return await self.storage.get_task_rollups(period, since)
+
+    # Maintenance
+    async def reconcile_okr_counters(self) -> None:
+        await self.storage.reconcile_okr_counters()
+        self._generation += 1
+        self._entries.clear()
+
+    async def rebuild_task_rollups(self) -> None:
+        await self.storage.rebuild_task_rollups()
+
+    # Lifecycle
+    async def ping(self) -> None:
+        await self.storage.ping()
+
+    async def close(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        await self.storage.close()
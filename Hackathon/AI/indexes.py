@@ -0,0 +1,112 @@
+"""
+Index bootstrap for the OKR collections.
+
+ensure_indexes() is idempotent (create_indexes is a no-op for indexes that
+already exist) and runs at application startup. verify_indexes() explains
+every query MongoStorage issues and raises if any of them would fall back
+to a collection scan.
+
+Run both by hand with:
+
+    python -m indexes
+"""
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.database import Database
+
+from mongo_clients import JOB_COLLECTION_NAME, OKR_COLLECTION_NAME, REMINDER_COLLECTION_NAME, ROLLUP_COLLECTION_NAME
+
+OKRS_COLLECTION_NAME = "okrs"
+VALIDATION_REPORTS_COLLECTION_NAME = "validation_reports"
+
+# collection name -> indexes MongoStorage and the validator rely on
+INDEXES: Dict[str, List[IndexModel]] = {
+    OKRS_COLLECTION_NAME: [
+        IndexModel([("status", ASCENDING)], name="status_1"),
+    ],
+    OKR_COLLECTION_NAME: [
+        IndexModel([("okrId", ASCENDING), ("status", ASCENDING)], name="okrId_1_status_1"),
+        IndexModel([("status", ASCENDING), ("deadline", ASCENDING)], name="status_1_deadline_1"),
+        # process_okr job retries find the document an earlier attempt wrote
+        IndexModel([("jobId", ASCENDING)], name="jobId_1", sparse=True),
+    ],
+    REMINDER_COLLECTION_NAME: [
+        IndexModel([("taskId", ASCENDING)], name="taskId_1"),
+        IndexModel([("status", ASCENDING), ("scheduledFor", ASCENDING)], name="status_1_scheduledFor_1"),
+    ],
+    ROLLUP_COLLECTION_NAME: [
+        IndexModel([("period", ASCENDING), ("start", ASCENDING)], name="period_1_start_1"),
+    ],
+    JOB_COLLECTION_NAME: [
+        IndexModel([("status", ASCENDING), ("runAt", ASCENDING)], name="status_1_runAt_1"),
+        IndexModel([("status", ASCENDING), ("leaseUntil", ASCENDING)], name="status_1_leaseUntil_1"),
+    ],
+    VALIDATION_REPORTS_COLLECTION_NAME: [
+        IndexModel([("submission_id", ASCENDING)], name="submission_id_1"),
+        IndexModel([("okr_id", ASCENDING), ("timestamp", ASCENDING)], name="okr_id_1_timestamp_1"),
+    ],
+}
+
+
+def storage_queries() -> List[Tuple[str, dict]]:
+    """The filters MongoStorage (and the validator) send, as (collection, filter) pairs."""
+    return [
+        (OKR_COLLECTION_NAME, {"okrId": "000000000000000000000000"}),
+        (OKR_COLLECTION_NAME, {"okrId": "000000000000000000000000", "status": "completed"}),
+        (OKR_COLLECTION_NAME, {"status": {"$in": ["pending", "active"]}, "deadline": {"$gte": datetime.now(), "$lt": datetime.now()}}),
+        (REMINDER_COLLECTION_NAME, {"taskId": "000000000000000000000000"}),
+        (REMINDER_COLLECTION_NAME, {"status": "pending", "scheduledFor": {"$gt": datetime.now()}}),
+        (REMINDER_COLLECTION_NAME, {"status": "pending", "scheduledFor": {"$lte": datetime.now()}}),
+        (REMINDER_COLLECTION_NAME, {"status": "sending", "claimedAt": {"$lt": datetime.now()}}),
+        (ROLLUP_COLLECTION_NAME, {"period": "week", "start": {"$gte": datetime.now()}}),
+        (OKR_COLLECTION_NAME, {"jobId": "000000000000000000000000"}),
+        (JOB_COLLECTION_NAME, {"$or": [
+            {"status": "queued", "runAt": {"$lte": datetime.now()}},
+            {"status": "running", "leaseUntil": {"$lt": datetime.now()}},
+        ]}),
+        (VALIDATION_REPORTS_COLLECTION_NAME, {"submission_id": "000000000000000000000000"}),
+        (VALIDATION_REPORTS_COLLECTION_NAME, {"okr_id": "000000000000000000000000"}),
+    ]
+
+
+def ensure_indexes(database: Database) -> None:
+    for collection_name, index_models in INDEXES.items():
+        created = database[collection_name].create_indexes(index_models)
+        print(f"✅ Indexes on {collection_name}: {', '.join(created)}")
+
+
+def _plan_stages(plan) -> List[str]:
+    # Winning plans nest as inputStage / inputStages (and queryPlan on SBE
+    # servers), so walk the whole document and collect every stage name.
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_plan_stages(item))
+    return stages
+
+
+def verify_indexes(database: Database) -> None:
+    collection_scans = []
+    for collection_name, query in storage_queries():
+        explain = database[collection_name].find(query).explain()
+        winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+        if "COLLSCAN" in _plan_stages(winning_plan):
+            collection_scans.append(f"{collection_name} {query}")
+
+    if collection_scans:
+        raise RuntimeError("❌ Queries falling back to COLLSCAN:\n  " + "\n  ".join(collection_scans))
+    print(f"✅ All {len(storage_queries())} storage queries use an index")
+
+
+if __name__ == "__main__":
+    from mongo_clients import get_db
+
+    ensure_indexes(get_db())
+    verify_indexes(get_db())
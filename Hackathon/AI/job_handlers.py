@@ -0,0 +1,85 @@
+"""
+The work behind the LLM-heavy endpoints, run by job_worker.py.
+
+Each handler takes the claimed Job and returns a JSON-able dict, stored as
+the job's result. Delivery is at-least-once, so a handler can run again for
+the same job after a worker dies mid-way: process_okr keys its document on
+the job id, so a retry reuses the document an earlier attempt wrote.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from mongo_clients import get_db, OKR_COLLECTION_NAME
+from shared.schemas import Job
+from storage import IStorage
+
+JobHandler = Callable[[Job], Awaitable[dict]]
+
+
+def process_okr(job_id: str, payload: dict) -> dict:
+    # Imported here so the API process never loads the LLM clients
+    from agents.okr_parser import parse_okr
+    from agents.micro_okr import create_micro_tasks
+
+    deadline = payload["targetDate"]
+    okr_input = f"{payload['description']} by {deadline}"
+
+    try:
+        parsed = parse_okr(okr_input)
+        parsed["key_results"] = parsed.get("deliverables", [])
+    except Exception as e:
+        raise RuntimeError(f"Error parsing OKR: {e}") from e
+
+    try:
+        micro_tasks = create_micro_tasks(parsed, deadline=deadline)
+    except Exception as e:
+        raise RuntimeError(f"Error generating micro-tasks: {e}") from e
+    if not micro_tasks:
+        raise RuntimeError("No micro-tasks generated.")
+
+    # Give each embedded task a stable id so it can be updated on its own
+    micro_tasks = [{**micro_task, "id": str(ObjectId())} for micro_task in micro_tasks]
+
+    # Only the first attempt to get here writes the document; a retry gets
+    # that document back and reports what it holds
+    okr_doc = get_db()[OKR_COLLECTION_NAME].find_one_and_update(
+        {"jobId": job_id},
+        {"$setOnInsert": {
+            "jobId": job_id,
+            "title": payload["title"],
+            "description": payload["description"],
+            "targetDate": deadline,
+            "parsed": parsed,
+            "micro_tasks": micro_tasks,
+            "status": "active",
+        }},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return {"id": str(okr_doc["_id"]), "parsed": okr_doc["parsed"], "micro_tasks": okr_doc["micro_tasks"]}
+
+
+def job_handlers(storage: IStorage) -> Dict[str, JobHandler]:
+    """Handlers by job type; the ones needing storage share the worker's instance."""
+    from agents.okr_validator import validate_submission
+
+    async def run_process_okr(job: Job) -> dict:
+        # Two blocking Gemini calls and a pymongo write: keep them off the event loop
+        return await asyncio.to_thread(process_okr, job.id, job.payload)
+
+    async def run_validate_submission(job: Job) -> dict:
+        return await validate_submission(
+            job.payload["submission_id"],
+            job.payload["okr_id"],
+            job.payload["submission_content"],
+            job.payload["submission_type"],
+            storage,
+        )
+
+    return {
+        "process_okr": run_process_okr,
+        "validate_submission": run_validate_submission,
+    }
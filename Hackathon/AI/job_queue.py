@@ -0,0 +1,282 @@
+"""
+Durable job queue for the LLM-heavy endpoints.
+
+POST /api/process_okr and POST /api/okr/validate enqueue a job and answer
+202 straight away; worker processes (python -m job_worker) claim jobs, run
+them and store the result, which GET /api/jobs/{id} reports.
+
+A claim atomically moves one job that is queued and due (or running with an
+expired lease) to running, stamps the worker id and a lease, and bumps the
+attempt counter. Workers extend the lease while a handler runs, so a job is
+only claimed again once its worker has died or stalled: delivery is
+at-least-once, and handlers must tolerate being run twice. complete_job and
+fail_job only apply while the caller still holds the lease.
+
+The backend is picked with JOB_QUEUE_BACKEND: "mongo" (the jobs collection
+in MONGO_DB_NAME) or "sqlite" (a file at JOB_QUEUE_PATH, default jobs.db,
+shared by every process on the host). Unset, it follows STORAGE_BACKEND:
+mongo for the Mongo backends, sqlite for memory and sqlite, so a setup
+without MongoDB can still enqueue.
+
+Workers are separate processes with their own storage. With
+STORAGE_BACKEND=memory a worker cannot see the OKRs the API process holds
+in memory, so jobs that read storage (validate_submission) need a shared
+backend: sqlite on one host, or mongo.
+"""
+import json
+import os
+import sqlite3
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from bson import ObjectId
+from fastapi import Request
+from pymongo import ReturnDocument
+from pymongo.asynchronous.database import AsyncDatabase
+
+from mongo_clients import get_async_db, JOB_COLLECTION_NAME
+from shared.schemas import Job, JobStatus
+from sqlite_storage import iso_timestamp
+from storage_registry import DEFAULT_STORAGE_BACKEND
+
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+class IJobQueue:
+    async def enqueue(self, type: str, payload: dict, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> Job:
+        pass
+
+    async def get_job(self, id: str) -> Optional[Job]:
+        pass
+
+    async def claim_job(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        """Atomically take the earliest due job (queued, or running on an
+        expired lease) and return it, or None if there is nothing to do."""
+        pass
+
+    async def extend_lease(self, id: str, worker_id: str, lease_seconds: float) -> bool:
+        """Push the lease out; False once the job is no longer ours."""
+        pass
+
+    async def complete_job(self, id: str, worker_id: str, result: dict) -> bool:
+        pass
+
+    async def fail_job(self, id: str, worker_id: str, error: str, retry_at: Optional[datetime] = None) -> bool:
+        """Queue the job again at retry_at, or mark it failed for good if retry_at is None."""
+        pass
+
+    async def count_jobs(self) -> Dict[str, int]:
+        """Jobs per status, for monitoring and the benchmark."""
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class MongoJobQueue(IJobQueue):
+    """On pymongo's asyncio driver, so enqueue and polling don't block the API's or the worker's event loop."""
+
+    def __init__(self, database: Optional[AsyncDatabase] = None):
+        self.db = database if database is not None else get_async_db()
+        self.collection = self.db[JOB_COLLECTION_NAME]
+
+    def _job(self, job_doc: dict) -> Job:
+        return Job.model_validate({**job_doc, "_id": str(job_doc["_id"])})
+
+    async def enqueue(self, type: str, payload: dict, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> Job:
+        now = datetime.now()
+        job_doc = {
+            "type": type, "payload": payload, "status": JobStatus.QUEUED.value, "attempts": 0,
+            "maxAttempts": max_attempts, "runAt": now, "createdAt": now, "updatedAt": now,
+        }
+        result = await self.collection.insert_one(job_doc)
+        job_doc["_id"] = result.inserted_id
+        return self._job(job_doc)
+
+    async def get_job(self, id: str) -> Optional[Job]:
+        if not ObjectId.is_valid(id): return None
+        job_doc = await self.collection.find_one({"_id": ObjectId(id)})
+        return self._job(job_doc) if job_doc else None
+
+    async def claim_job(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        now = datetime.now()
+        # Of several workers racing for the same job, exactly one matches it
+        job_doc = await self.collection.find_one_and_update(
+            {"$or": [
+                {"status": JobStatus.QUEUED.value, "runAt": {"$lte": now}},
+                {"status": JobStatus.RUNNING.value, "leaseUntil": {"$lt": now}},
+            ]},
+            {
+                "$set": {"status": JobStatus.RUNNING.value, "workerId": worker_id, "leaseUntil": now + timedelta(seconds=lease_seconds), "updatedAt": now},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("runAt", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        return self._job(job_doc) if job_doc else None
+
+    async def _update_held(self, id: str, worker_id: str, update: dict) -> bool:
+        if not ObjectId.is_valid(id): return False
+        result = await self.collection.update_one({"_id": ObjectId(id), "status": JobStatus.RUNNING.value, "workerId": worker_id}, update)
+        return result.matched_count == 1
+
+    async def extend_lease(self, id: str, worker_id: str, lease_seconds: float) -> bool:
+        now = datetime.now()
+        return await self._update_held(id, worker_id, {"$set": {"leaseUntil": now + timedelta(seconds=lease_seconds), "updatedAt": now}})
+
+    async def complete_job(self, id: str, worker_id: str, result: dict) -> bool:
+        now = datetime.now()
+        return await self._update_held(id, worker_id, {"$set": {
+            "status": JobStatus.SUCCEEDED.value, "result": result, "error": None,
+            "leaseUntil": None, "finishedAt": now, "updatedAt": now,
+        }})
+
+    async def fail_job(self, id: str, worker_id: str, error: str, retry_at: Optional[datetime] = None) -> bool:
+        now = datetime.now()
+        if retry_at is None:
+            update = {"status": JobStatus.FAILED.value, "error": error, "leaseUntil": None, "finishedAt": now, "updatedAt": now}
+        else:
+            update = {"status": JobStatus.QUEUED.value, "error": error, "runAt": retry_at, "leaseUntil": None, "workerId": None, "updatedAt": now}
+        return await self._update_held(id, worker_id, {"$set": update})
+
+    async def count_jobs(self) -> Dict[str, int]:
+        cursor = await self.collection.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}])
+        return {row["_id"]: row["count"] for row in await cursor.to_list()}
+
+    async def close(self) -> None:
+        # The client belongs to mongo_clients and is closed at shutdown
+        pass
+
+
+JOB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    run_at TEXT NOT NULL,
+    lease_until TEXT,
+    worker_id TEXT,
+    result TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status_run_at ON jobs (status, run_at);
+CREATE INDEX IF NOT EXISTS jobs_status_lease_until ON jobs (status, lease_until);
+"""
+
+
+class SQLiteJobQueue(IJobQueue):
+    def __init__(self, path: str = "jobs.db"):
+        self.path = path
+        # Autocommit, so claim_job can hold the write lock across its
+        # SELECT and UPDATE with an explicit BEGIN IMMEDIATE; the timeout
+        # makes other processes wait for that lock instead of failing
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(JOB_SCHEMA)
+
+    def _job(self, row: sqlite3.Row) -> Job:
+        return Job.model_validate({
+            "id": row["id"], "type": row["type"], "payload": json.loads(row["payload"]), "status": row["status"],
+            "attempts": row["attempts"], "max_attempts": row["max_attempts"], "run_at": row["run_at"],
+            "lease_until": row["lease_until"], "worker_id": row["worker_id"],
+            "result": json.loads(row["result"]) if row["result"] is not None else None, "error": row["error"],
+            "created_at": row["created_at"], "updated_at": row["updated_at"], "finished_at": row["finished_at"],
+        })
+
+    async def enqueue(self, type: str, payload: dict, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> Job:
+        job_id, now = str(uuid.uuid4()), iso_timestamp(datetime.now())
+        self.conn.execute(
+            "INSERT INTO jobs (id, type, payload, status, attempts, max_attempts, run_at, created_at, updated_at) VALUES (?, ?, ?, ?, 0, ?, ?, ?, ?)",
+            (job_id, type, json.dumps(payload, default=str), JobStatus.QUEUED.value, max_attempts, now, now, now),
+        )
+        return await self.get_job(job_id)
+
+    async def get_job(self, id: str) -> Optional[Job]:
+        row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (id,)).fetchone()
+        return self._job(row) if row else None
+
+    async def claim_job(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        now = datetime.now()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.conn.execute(
+                "SELECT id FROM jobs WHERE (status = ? AND run_at <= ?) OR (status = ? AND lease_until < ?) ORDER BY run_at LIMIT 1",
+                (JobStatus.QUEUED.value, iso_timestamp(now), JobStatus.RUNNING.value, iso_timestamp(now)),
+            ).fetchone()
+            if row is not None:
+                self.conn.execute(
+                    "UPDATE jobs SET status = ?, worker_id = ?, lease_until = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (JobStatus.RUNNING.value, worker_id, iso_timestamp(now + timedelta(seconds=lease_seconds)), iso_timestamp(now), row["id"]),
+                )
+                row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return self._job(row) if row else None
+
+    def _update_held(self, id: str, worker_id: str, fields: Dict[str, Any]) -> bool:
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        cursor = self.conn.execute(
+            f"UPDATE jobs SET {assignments} WHERE id = ? AND status = ? AND worker_id = ?",
+            (*fields.values(), id, JobStatus.RUNNING.value, worker_id),
+        )
+        return cursor.rowcount == 1
+
+    async def extend_lease(self, id: str, worker_id: str, lease_seconds: float) -> bool:
+        now = datetime.now()
+        return self._update_held(id, worker_id, {"lease_until": iso_timestamp(now + timedelta(seconds=lease_seconds)), "updated_at": iso_timestamp(now)})
+
+    async def complete_job(self, id: str, worker_id: str, result: dict) -> bool:
+        now = iso_timestamp(datetime.now())
+        return self._update_held(id, worker_id, {
+            "status": JobStatus.SUCCEEDED.value, "result": json.dumps(result, default=str), "error": None,
+            "lease_until": None, "finished_at": now, "updated_at": now,
+        })
+
+    async def fail_job(self, id: str, worker_id: str, error: str, retry_at: Optional[datetime] = None) -> bool:
+        now = iso_timestamp(datetime.now())
+        if retry_at is None:
+            fields = {"status": JobStatus.FAILED.value, "error": error, "lease_until": None, "finished_at": now, "updated_at": now}
+        else:
+            fields = {"status": JobStatus.QUEUED.value, "error": error, "run_at": iso_timestamp(retry_at), "lease_until": None, "worker_id": None, "updated_at": now}
+        return self._update_held(id, worker_id, fields)
+
+    async def count_jobs(self) -> Dict[str, int]:
+        return {row["status"]: row["count"] for row in self.conn.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status")}
+
+    async def close(self) -> None:
+        self.conn.close()
+
+
+JOB_QUEUE_BACKENDS: Dict[str, Callable[[], IJobQueue]] = {
+    "mongo": MongoJobQueue,
+    "sqlite": lambda: SQLiteJobQueue(os.getenv("JOB_QUEUE_PATH", "jobs.db")),
+}
+
+
+def default_job_queue_backend() -> str:
+    storage_backend = os.getenv("STORAGE_BACKEND", DEFAULT_STORAGE_BACKEND).lower()
+    return "mongo" if storage_backend.startswith("mongo") else "sqlite"
+
+
+def create_job_queue(backend: Optional[str] = None) -> IJobQueue:
+    backend = (backend or os.getenv("JOB_QUEUE_BACKEND") or default_job_queue_backend()).lower()
+    if backend not in JOB_QUEUE_BACKENDS:
+        raise RuntimeError(f"❌ Unknown JOB_QUEUE_BACKEND '{backend}'. Choose one of: {', '.join(JOB_QUEUE_BACKENDS)}")
+    print(f"✅ Using {backend} job queue")
+    return JOB_QUEUE_BACKENDS[backend]()
+
+
+# Dependency to get the job queue created at startup
+def get_job_queue(request: Request) -> IJobQueue:
+    return request.app.state.job_queue
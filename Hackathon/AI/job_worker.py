@@ -0,0 +1,159 @@
+"""
+Job worker: claims jobs from the job queue and runs their handlers.
+
+Each worker process runs `concurrency` claim loops. A claimed job's lease is
+extended every lease_seconds / 3 while its handler runs, so a long LLM call
+keeps the job, while a worker that dies lets the lease lapse and another
+worker picks the job up. A handler that raises is retried after
+retry_seconds * 2^(attempt - 1) until max_attempts, then marked failed. Run
+from Hackathon/AI with:
+
+    python -m job_worker
+
+Settings come from JOB_WORKER_CONCURRENCY (default 4), JOB_LEASE_SECONDS
+(default 120), JOB_RETRY_SECONDS (default 5) and, for the queue itself,
+JOB_QUEUE_BACKEND / JOB_QUEUE_PATH.
+"""
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from job_handlers import JobHandler
+from job_queue import IJobQueue
+from shared.schemas import Job
+
+
+class JobWorker:
+    def __init__(
+        self,
+        queue: IJobQueue,
+        handlers: Dict[str, JobHandler],
+        worker_id: Optional[str] = None,
+        concurrency: int = 4,
+        lease_seconds: float = 120,
+        retry_seconds: float = 5,
+        poll_seconds: float = 1,
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.retry_seconds = retry_seconds
+        self.poll_seconds = poll_seconds
+        self.claimed = 0
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+        self.lost_leases = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "claimed": self.claimed,
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "failed": self.failed,
+            "lost_leases": self.lost_leases,
+        }
+
+    async def _heartbeat(self, job: Job) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not await self.queue.extend_lease(job.id, self.worker_id, self.lease_seconds):
+                print(f"⚠️ Lost the lease on job {job.id}; another worker may run it too")
+                return
+
+    def _record(self, held: bool) -> None:
+        # False from the queue means the lease lapsed and the job was
+        # reclaimed; the worker holding it now records the outcome
+        if not held:
+            self.lost_leases += 1
+
+    async def _fail(self, job: Job, error: str, retry: bool = True) -> None:
+        if retry and job.attempts < job.max_attempts:
+            retry_at = datetime.now() + timedelta(seconds=self.retry_seconds * 2 ** (job.attempts - 1))
+            print(f"⚠️ Job {job.id} ({job.type}) attempt {job.attempts}/{job.max_attempts} failed, retrying at {retry_at:%H:%M:%S}: {error}")
+            self.retried += 1
+        else:
+            retry_at = None
+            print(f"❌ Job {job.id} ({job.type}) failed after {job.attempts} attempt(s): {error}")
+            self.failed += 1
+        self._record(await self.queue.fail_job(job.id, self.worker_id, error, retry_at))
+
+    async def run_job(self, job: Job) -> None:
+        self.claimed += 1
+        handler = self.handlers.get(job.type)
+        if handler is None:
+            await self._fail(job, f"No handler for job type '{job.type}'", retry=False)
+            return
+        if job.attempts > job.max_attempts:
+            # Reclaimed after its last attempt's lease expired: the worker died
+            # (or hung) every time, so don't run it again
+            await self._fail(job, "Lease expired on the final attempt", retry=False)
+            return
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            result = await handler(job)
+        except Exception as e:
+            await self._fail(job, f"{type(e).__name__}: {e}")
+        else:
+            self.succeeded += 1
+            self._record(await self.queue.complete_job(job.id, self.worker_id, result))
+        finally:
+            heartbeat.cancel()
+
+    async def run_once(self) -> bool:
+        """Claim and run one job; False if none was due."""
+        job = await self.queue.claim_job(self.worker_id, self.lease_seconds)
+        if job is None:
+            return False
+        await self.run_job(job)
+        return True
+
+    async def _loop(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            try:
+                # Go straight round again while there is a backlog
+                if await self.run_once():
+                    continue
+                timeout = self.poll_seconds
+            except Exception as e:
+                print(f"❌ Job claim failed, will retry: {e}")
+                timeout = self.poll_seconds * 5
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        stop = stop or asyncio.Event()
+        await asyncio.gather(*(self._loop(stop) for _ in range(self.concurrency)))
+
+
+async def main():
+    from job_handlers import job_handlers
+    from job_queue import create_job_queue
+    from storage_registry import create_storage
+
+    storage = create_storage()
+    queue = create_job_queue()
+    worker = JobWorker(
+        queue,
+        job_handlers(storage),
+        concurrency=int(os.getenv("JOB_WORKER_CONCURRENCY", "4")),
+        lease_seconds=float(os.getenv("JOB_LEASE_SECONDS", "120")),
+        retry_seconds=float(os.getenv("JOB_RETRY_SECONDS", "5")),
+    )
+    print(f"✅ Job worker {worker.worker_id} running ({worker.concurrency} at a time)")
+    try:
+        await worker.run()
+    finally:
+        await queue.close()
+        await storage.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
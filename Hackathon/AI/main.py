@@ -1,25 +1,20 @@
 import sys
 import os
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Response
 from pydantic import BaseModel, Field
 from datetime import date
 from pymongo import MongoClient
 from dotenv import load_dotenv
-from storage import IStorage
-from typing import List
+from storage import IStorage, MongoStorage
+from typing import List, Optional
 from shared.schemas import OkrWithTasks
-from bson import ObjectId
-
-
-# Dependency to get storage instance
-def get_storage() -> IStorage:
-    # Return a dummy storage or adapt if a real storage implementation is needed
-    # For now, as the direct MongoDB collection is used elsewhere, this might not be fully utilized
-    raise NotImplementedError("Storage implementation not provided as per new plan. Direct MongoDB access is used.")
+from contextlib import asynccontextmanager
 
 sys.path.append(os.path.dirname(__file__))  # Ensure mongo_client is in the path
-from mongo_clients import okr_collection
+from mongo_clients import get_db, close_clients
+from indexes import ensure_indexes, verify_indexes
+from storage_registry import create_storage, get_storage, storage_layers
 
 # --- Logging Setup ---
 import logging
@@ -32,27 +27,41 @@ load_dotenv()
 # Add backend folder to path
 sys.path.append(r'D:\Agantic_AI_Hackathon\Hackathon\AI')
 
-# DEBUG: Import check
-logger.info("✅ Imported sys.path and added backend")
-try:
-    from agents.okr_parser import parse_okr
-    from agents.micro_okr import create_micro_tasks
-    logger.info("✅ Successfully imported okr_parser and micro_okr")
-except Exception as e:
-    logger.info("❌ Error importing backend modules:", e)
-    raise e
-
 from fastapi.middleware.cors import CORSMiddleware  # 👈 Import CORS middleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from routes.responses import FAST_JSON, GZIP_LEVEL, GZIP_MIN_BYTES, FastJSONResponse, fast_json
 
 from routes.task_routes import task_router
 from routes.reminder_routes import reminder_router
 from routes.dashboard_routes import dashboard_router
 from routes.okr_routes import okr_router
+from routes.health_routes import health_router
+from routes.job_routes import job_router, job_accepted
+from job_queue import IJobQueue, MongoJobQueue, create_job_queue, get_job_queue
+from routes.pagination import PageParams
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One storage instance for the whole process, shared by every router
+    app.state.storage = create_storage()
+    app.state.job_queue = create_job_queue()
+    backend = storage_layers(app.state.storage)[-1]
+    if isinstance(backend, MongoStorage) or isinstance(app.state.job_queue, MongoJobQueue):
+        # Create indexes, then refuse to start if any storage query would COLLSCAN
+        ensure_indexes(get_db())
+        verify_indexes(get_db())
+    yield
+    await app.state.job_queue.close()
+    await app.state.storage.close()
+    await close_clients()
 
 app = FastAPI(
     title="OKR Management AI Backend",
     description="AI-powered backend for managing OKRs, tasks, and reminders.",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse if FAST_JSON else JSONResponse,
 )
 
 # Configure CORS
@@ -64,11 +73,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (nested OKR lists) when a threshold is configured
+if GZIP_MIN_BYTES > 0:
+    app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_BYTES, compresslevel=GZIP_LEVEL)
+
 # Include routers
 app.include_router(okr_router, prefix="/api")
 app.include_router(task_router, prefix="/api")
 app.include_router(reminder_router, prefix="/api")
 app.include_router(dashboard_router, prefix="/api")
+app.include_router(health_router, prefix="/api")
+app.include_router(job_router, prefix="/api")
 
 @app.get("/")
 async def root():
@@ -80,76 +95,44 @@ class OKRInput(BaseModel):
     description: str = Field(..., min_length=10, example="I want to publish 3 AI articles this quarter.")
     targetDate: date = Field(..., example="2025-07-10T00:00:00.000Z")
 
-class MicroTask(BaseModel):
-    task: str
-    due: str
-    evidence_hint: str
-    level: str
-    micro_status: str = "pending"
-
-class OKRResponse(BaseModel):
-    parsed: dict
-    micro_tasks: list[MicroTask]
-
 # --- Endpoint to Process OKRs ---
-@app.post("/api/process_okr", response_model=OKRResponse)
-def process_okr(input_data: OKRInput):
-    deadline = input_data.targetDate
-    okr_input = f"{input_data.description} by {deadline}"
-
-    try:
-        parsed = parse_okr(okr_input)
-        parsed["key_results"] = parsed.get("deliverables", [])
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error parsing OKR: {e}")
-
-    try:
-        micro_tasks = create_micro_tasks(parsed, deadline=str(deadline))
-        if not micro_tasks:
-            raise HTTPException(status_code=204, detail="No micro-tasks generated.")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating micro-tasks: {e}")
-
-    # Store everything in MongoDB
-    response_data = {
+# Parsing and micro-task planning are two LLM calls, so they run on a job
+# worker (job_handlers.process_okr); GET /api/jobs/{jobId} returns
+# {"id", "parsed", "micro_tasks"} as the job result once it succeeds
+@app.post("/api/process_okr", status_code=202)
+async def process_okr(input_data: OKRInput, response: Response, jobs: IJobQueue = Depends(get_job_queue)):
+    job = await jobs.enqueue("process_okr", {
         "title": input_data.title,
         "description": input_data.description,
         "targetDate": str(input_data.targetDate),
-        "parsed": parsed,
-        "micro_tasks": micro_tasks,
-        "status": "active"
-    }
-
-    try:
-        okr_collection.insert_one(response_data)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error saving to MongoDB: {e}")
-
-    return OKRResponse(parsed=parsed, micro_tasks=micro_tasks)
+    })
+    return job_accepted(job, response)
 
 
 # Helper to serialize MongoDB documents
 def serialize_document(doc):
-    doc["id"] = str(doc["_id"])
-    del doc["_id"]
+    if "_id" in doc: # Absent when ?fields= leaves it out
+        doc["id"] = str(doc.pop("_id"))
     return doc
 
+# Both read through the configured storage, so they follow STORAGE_BACKEND
+# and never block the event loop on a sync driver call
 @app.get("/api/get-okrs")  # get all OKRs
-async def get_micro_tasks():
+async def get_micro_tasks(page: PageParams = Depends(), storage: IStorage = Depends(get_storage)):
     try:
-        docs = list(okr_collection.find())
+        docs = await storage.get_okrs(page.after, page.limit, page.fields, raw=True)
         serialized = [serialize_document(d) for d in docs]
-        return {"result": serialized}
+        return fast_json({"result": serialized})
     except Exception as e:
         return {"error": str(e)}
 
 @app.get("/api/get-okr/{id}") # get OKR by ID
-async def get_okr_by_id(id: str):
+async def get_okr_by_id(id: str, storage: IStorage = Depends(get_storage)):
     try:
-        doc = okr_collection.find_one({"_id": ObjectId(id)})
-        if not doc:
+        okr = await storage.get_okr(id)
+        if not okr:
             return {"error": "OKR not found"}
-        serialized = serialize_document(doc)
-        return {"result": serialized}
+        serialized = serialize_document(okr.model_dump(by_alias=True))
+        return fast_json({"result": serialized})
     except Exception as e:
         return {"error": str(e)}
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Online migration of task deadlines and reminder scheduledFor values from ISO
+8601 strings to BSON dates.
+
+Documents are converted in _id order, a batch at a time, with one
+bulk_write per batch. Each update only applies if the field still holds the
+string that was read, so concurrent writers are never overwritten. The script
+can be stopped and re-run at any point.
+
+    python -m migrate_datetimes [--batch-size 1000] [--pause 0.05] [--dry-run]
+"""
+import argparse
+import time
+from datetime import datetime
+from typing import Optional, Tuple
+
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+
+from mongo_clients import get_db, OKR_COLLECTION_NAME, REMINDER_COLLECTION_NAME
+
+# (collection holding the documents, field to convert)
+MIGRATIONS = [
+    (OKR_COLLECTION_NAME, "deadline"),
+    (REMINDER_COLLECTION_NAME, "scheduledFor"),
+]
+
+
+def parse_datetime(value: str) -> Optional[datetime]:
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    # Same convention as shared/schemas.py: naive local time
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def migrate_field(collection: Collection, field: str, batch_size: int, pause: float, dry_run: bool) -> Tuple[int, int]:
+    converted = skipped = 0
+    last_id = None
+    while True:
+        query = {field: {"$type": "string"}}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = list(collection.find(query, {field: 1}).sort("_id", 1).limit(batch_size))
+        if not batch:
+            break
+
+        ops = []
+        for doc in batch:
+            parsed = parse_datetime(doc[field])
+            if parsed is None:
+                print(f"⚠️ {collection.name} {doc['_id']}: cannot parse {field}={doc[field]!r}, leaving it as a string")
+                skipped += 1
+                continue
+            ops.append(UpdateOne({"_id": doc["_id"], field: doc[field]}, {"$set": {field: parsed}}))
+
+        if ops and not dry_run:
+            converted += collection.bulk_write(ops, ordered=False).modified_count
+        elif dry_run:
+            converted += len(ops)
+        last_id = batch[-1]["_id"]
+        print(f"🔁 {collection.name}.{field}: {converted} converted, {skipped} skipped so far")
+        time.sleep(pause)
+    return converted, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--pause", type=float, default=0.05, help="Seconds to sleep between batches")
+    parser.add_argument("--dry-run", action="store_true", help="Count convertible documents without writing")
+    args = parser.parse_args()
+
+    for collection_name, field in MIGRATIONS:
+        converted, skipped = migrate_field(get_db()[collection_name], field, args.batch_size, args.pause, args.dry_run)
+        print(f"✅ {collection_name}.{field}: {converted} {'convertible' if args.dry_run else 'converted'}, {skipped} skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,159 @@
+"""
+Lazily created, pooled MongoDB clients.
+
+Nothing connects at import: get_client()/get_async_client() build the client
+on first use, so MemStorage/SQLiteStorage users never touch MongoDB. Pool
+and timeout settings come from the environment:
+
+    MONGO_MAX_POOL_SIZE                (default 100)
+    MONGO_MIN_POOL_SIZE                (default 0)
+    MONGO_MAX_IDLE_TIME_MS             (default: no limit)
+    MONGO_SERVER_SELECTION_TIMEOUT_MS  (default 3000)
+    MONGO_CONNECT_TIMEOUT_MS           (default 5000)
+    MONGO_SOCKET_TIMEOUT_MS            (default: no limit)
+
+Clients are per process: a worker forked by gunicorn/uvicorn --workers drops
+the parent's clients and builds its own, since pymongo clients are not fork
+safe. Readiness is checked by the /api/health/ready endpoint, not here.
+
+`db`, `okr_collection`, `task_collection`, `reminder_collection`, `client`,
+`async_client` and `async_db` can still be imported by name; importing one
+creates the client then (without blocking on a connection).
+"""
 import os
-from pymongo import MongoClient, errors
-from dotenv import load_dotenv
+import threading
 from pathlib import Path
+from typing import Optional
+
+from dotenv import load_dotenv
+from pymongo import AsyncMongoClient, MongoClient
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.database import Database
+
+from round_trips import round_trip_counter
 
 # Load .env with explicit path for reliability
 dotenv_path = Path(__file__).parent / ".env" # Adjust path to find .env at project root
 load_dotenv(dotenv_path)
-print(f"🔍 Looking for .env at: {dotenv_path}")
-
-# Read environment variables
-MONGO_URI = os.getenv("MONGO_URI")
-DB_NAME = os.getenv("MONGO_DB_NAME")
 
 # Define collection names (can be configured in .env or hardcoded if consistent)
 OKR_COLLECTION_NAME = "micro_tasks"
 TASK_COLLECTION_NAME = "tasks"
 REMINDER_COLLECTION_NAME = "reminders"
+ROLLUP_COLLECTION_NAME = "task_rollups"
+JOB_COLLECTION_NAME = "jobs"
+
+_lock = threading.Lock()
+_client: Optional[MongoClient] = None
+_async_client: Optional[AsyncMongoClient] = None
+_pid: Optional[int] = None
+
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def client_options() -> dict:
+    """Pool and timeout keyword arguments shared by the sync and async clients."""
+    return {
+        "maxPoolSize": _env_int("MONGO_MAX_POOL_SIZE", 100),
+        "minPoolSize": _env_int("MONGO_MIN_POOL_SIZE", 0),
+        "maxIdleTimeMS": _env_int("MONGO_MAX_IDLE_TIME_MS", None),
+        "serverSelectionTimeoutMS": _env_int("MONGO_SERVER_SELECTION_TIMEOUT_MS", 3000),
+        "connectTimeoutMS": _env_int("MONGO_CONNECT_TIMEOUT_MS", 5000),
+        "socketTimeoutMS": _env_int("MONGO_SOCKET_TIMEOUT_MS", None),
+        "event_listeners": [round_trip_counter],
+    }
+
+
+def _settings() -> tuple:
+    mongo_uri = os.getenv("MONGO_URI")
+    db_name = os.getenv("MONGO_DB_NAME")
+    # Validate environment variable presence
+    if not mongo_uri:
+        raise RuntimeError("❌ MONGO_URI not found in .env file!")
+    if not db_name:
+        raise RuntimeError("❌ MONGO_DB_NAME not found in .env file!")
+    return mongo_uri, db_name
+
+
+def _forget_clients() -> None:
+    # Called in a freshly forked child: the parent's sockets and monitor
+    # threads are not usable here, so build new clients on next use
+    global _client, _async_client, _pid, _lock
+    _client, _async_client, _pid = None, None, None
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_clients)
+
+
+def _check_pid() -> None:
+    # Belt and braces for fork paths that skip the at-fork hook
+    if _pid is not None and _pid != os.getpid():
+        _forget_clients()
+
+
+def get_client() -> MongoClient:
+    global _client, _pid
+    _check_pid()
+    if _client is None:
+        with _lock:
+            if _client is None:
+                mongo_uri, _ = _settings()
+                _client = MongoClient(mongo_uri, **client_options())
+                _pid = os.getpid()
+                print(f"✅ MongoDB client created (maxPoolSize={client_options()['maxPoolSize']})")
+    return _client
+
+
+def get_async_client() -> AsyncMongoClient:
+    # The asyncio client binds to the running event loop on first use
+    global _async_client, _pid
+    _check_pid()
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                mongo_uri, _ = _settings()
+                _async_client = AsyncMongoClient(mongo_uri, **client_options())
+                _pid = os.getpid()
+    return _async_client
+
+
+def get_db() -> Database:
+    return get_client()[_settings()[1]]
+
+
+def get_async_db() -> AsyncDatabase:
+    return get_async_client()[_settings()[1]]
+
+
+async def close_clients() -> None:
+    """Close whichever clients this process created (app shutdown)."""
+    global _client, _async_client
+    client, async_client = _client, _async_client
+    _client, _async_client = None, None
+    if client is not None:
+        client.close()
+    if async_client is not None:
+        await async_client.close()
+
+
+_LAZY_ATTRIBUTES = {
+    "client": get_client,
+    "async_client": get_async_client,
+    "db": get_db,
+    "async_db": get_async_db,
+    "okr_collection": lambda: get_db()[OKR_COLLECTION_NAME],
+    "task_collection": lambda: get_db()[TASK_COLLECTION_NAME],
+    "reminder_collection": lambda: get_db()[REMINDER_COLLECTION_NAME],
+}
+
 
-# Debug: Print loaded environment variables
-print(f"🧪 MONGO_URI: {MONGO_URI}")
-print(f"🧪 DB_NAME: {DB_NAME}")
-print(f"🧪 OKR_COLLECTION_NAME: {OKR_COLLECTION_NAME}")
-print(f"🧪 TASK_COLLECTION_NAME: {TASK_COLLECTION_NAME}")
-print(f"🧪 REMINDER_COLLECTION_NAME: {REMINDER_COLLECTION_NAME}")
-
-# Validate environment variable presence
-if not MONGO_URI:
-    raise RuntimeError("❌ MONGO_URI not found in .env file!")
-if not DB_NAME:
-    raise RuntimeError("❌ MONGO_DB_NAME not found in .env file!")
-
-# Try connecting to MongoDB
-try:
-    client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=3000)
-    client.admin.command('ping')  # Test connection
-    print("✅ Successfully connected to MongoDB!")
-except errors.ServerSelectionTimeoutError as err:
-    print("❌ Could not connect to MongoDB:", err)
-    exit(1)
-
-# Access DB and Collections
-try:
-    db = client[DB_NAME]
-    okr_collection = db[OKR_COLLECTION_NAME]
-    task_collection = db[TASK_COLLECTION_NAME]
-    reminder_collection = db[REMINDER_COLLECTION_NAME]
-    print(f"✅ Connected to database: {DB_NAME}, collections: {OKR_COLLECTION_NAME}, {TASK_COLLECTION_NAME}, {REMINDER_COLLECTION_NAME}")
-except Exception as e:
-    print(f"❌ Error accessing DB or Collections: {e}")
-    exit(1)
+def __getattr__(name: str):
+    # Keeps `from mongo_clients import db` working without connecting at import
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,21 @@
+"""
+Rebuild the denormalised completedTasks / totalTasks / progress counters on
+every OKR from its tasks. Run once after deploying the counters, and any
+time they are suspected to have drifted:
+
+    python -m reconcile_counters
+"""
+import asyncio
+
+from storage_registry import create_storage
+
+
+async def main():
+    storage = create_storage()
+    await storage.reconcile_okr_counters()
+    await storage.close()
+    print("✅ OKR task counters rebuilt")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
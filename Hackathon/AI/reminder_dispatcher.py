@@ -0,0 +1,197 @@
+"""
+Reminder dispatcher.
+
+Keeps a min-heap of the reminders coming due in the next horizon_seconds,
+refilled from storage, and sleeps until the earliest one is due. Due
+reminders are claimed with IStorage.claim_reminder (pending -> sending,
+atomically), so any number of dispatchers can share one database: each
+reminder goes out through whichever worker claims it. Claimed reminders are
+grouped by deliveryMethod, handed to that channel's transport in batches of
+batch_size, and marked sent.
+
+A batch whose transport raises stays "sending"; once its claim is older
+than lease_seconds a refill puts it back to pending and it is tried again,
+so delivery is at-least-once. Run a worker from Hackathon/AI with:
+
+    python -m reminder_dispatcher
+
+Deliveries go to stdout, or are appended as JSON lines to REMINDER_OUTBOX
+if it is set.
+"""
+import asyncio
+import heapq
+import os
+import sys
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, TextIO, Tuple
+
+from shared.schemas import Reminder
+from storage import IStorage
+
+
+class ReminderTransport:
+    """Delivers a batch of reminders over one channel; raise to fail the whole batch."""
+
+    async def send(self, reminders: List[Reminder]) -> None:
+        pass
+
+
+class StdoutTransport(ReminderTransport):
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream or sys.stdout
+
+    async def send(self, reminders: List[Reminder]) -> None:
+        self.stream.write("".join(f"🔔 [{reminder.delivery_method}] task {reminder.task_id}: {reminder.message}\n" for reminder in reminders))
+        self.stream.flush()
+
+
+class FileTransport(ReminderTransport):
+    """Appends one JSON line per reminder, for tests and local runs."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    async def send(self, reminders: List[Reminder]) -> None:
+        with open(self.path, "a", encoding="utf-8") as outbox:
+            outbox.writelines(reminder.model_dump_json(by_alias=True) + "\n" for reminder in reminders)
+
+
+class ReminderDispatcher:
+    def __init__(
+        self,
+        storage: IStorage,
+        transports: Dict[str, ReminderTransport],
+        default_transport: Optional[ReminderTransport] = None,
+        batch_size: int = 100,
+        horizon_seconds: float = 60,
+        lease_seconds: float = 300,
+        max_queued: int = 10_000,
+    ):
+        self.storage = storage
+        self.transports = transports
+        self.default_transport = default_transport
+        self.batch_size = batch_size
+        self.horizon_seconds = horizon_seconds
+        self.lease_seconds = lease_seconds
+        self.max_queued = max_queued
+        # (scheduled_for, reminder id) of the pending reminders due within the horizon
+        self._heap: List[Tuple[datetime, str]] = []
+        self._queued: Set[str] = set()
+        self._refilled_at: Optional[datetime] = None
+        self.claimed = 0
+        self.lost_claims = 0
+        self.sent = 0
+        self.failed = 0
+        self.batches = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self._heap),
+            "claimed": self.claimed,
+            "lost_claims": self.lost_claims,
+            "sent": self.sent,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+    async def refill(self, now: datetime) -> None:
+        await self.storage.release_stale_reminder_claims(now - timedelta(seconds=self.lease_seconds))
+        for reminder in await self.storage.get_due_reminders(now + timedelta(seconds=self.horizon_seconds), self.max_queued):
+            if reminder.id not in self._queued:
+                heapq.heappush(self._heap, (reminder.scheduled_for, reminder.id))
+                self._queued.add(reminder.id)
+        self._refilled_at = now
+
+    def _refill_due(self, now: datetime) -> bool:
+        return self._refilled_at is None or not self._heap or now >= self._refilled_at + timedelta(seconds=self.horizon_seconds / 2)
+
+    async def _claim(self, reminder_ids: List[str], now: datetime) -> List[Reminder]:
+        claimed = []
+        # Claims are independent, so let an async backend run a batch of them at once
+        for start in range(0, len(reminder_ids), self.batch_size):
+            chunk = reminder_ids[start:start + self.batch_size]
+            for reminder in await asyncio.gather(*(self.storage.claim_reminder(reminder_id, now) for reminder_id in chunk)):
+                if reminder is None:
+                    self.lost_claims += 1  # Claimed by another worker, or no longer pending
+                else:
+                    claimed.append(reminder)
+        self.claimed += len(claimed)
+        return claimed
+
+    async def _deliver(self, channel: str, reminders: List[Reminder]) -> None:
+        transport = self.transports.get(channel, self.default_transport)
+        for start in range(0, len(reminders), self.batch_size):
+            batch = reminders[start:start + self.batch_size]
+            if transport is None:
+                print(f"⚠️ No transport for {channel} reminders; {len(batch)} left to retry after the lease")
+                self.failed += len(batch)
+                continue
+            try:
+                await transport.send(batch)
+            except Exception as e:
+                print(f"❌ Sending {len(batch)} {channel} reminder(s) failed, will retry after the lease: {e}")
+                self.failed += len(batch)
+                continue
+            await asyncio.gather(*(self.storage.update_reminder_status(reminder.id, "sent") for reminder in batch))
+            self.sent += len(batch)
+            self.batches += 1
+
+    async def dispatch_due(self, now: datetime) -> int:
+        """Claim and deliver every queued reminder due by `now`; returns how many were due."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, reminder_id = heapq.heappop(self._heap)
+            self._queued.discard(reminder_id)
+            due.append(reminder_id)
+        by_channel: Dict[str, List[Reminder]] = defaultdict(list)
+        for reminder in await self._claim(due, now):
+            by_channel[reminder.delivery_method].append(reminder)
+        for channel, reminders in by_channel.items():
+            await self._deliver(channel, reminders)
+        return len(due)
+
+    async def run_once(self, now: Optional[datetime] = None) -> int:
+        now = now or datetime.now()
+        if self._refill_due(now):
+            await self.refill(now)
+        return await self.dispatch_due(now)
+
+    def _seconds_until_next(self, now: datetime) -> float:
+        wake_at = (self._refilled_at or now) + timedelta(seconds=self.horizon_seconds / 2)
+        if self._heap:
+            wake_at = min(wake_at, self._heap[0][0])
+        return max((wake_at - now).total_seconds(), 0)
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                # Go straight round again while there is a backlog
+                if await self.run_once():
+                    continue
+                timeout = self._seconds_until_next(datetime.now())
+            except Exception as e:
+                print(f"❌ Reminder dispatch failed, will retry: {e}")
+                timeout = self.horizon_seconds / 2
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def main():
+    from storage_registry import create_storage
+
+    storage = create_storage()
+    outbox = os.getenv("REMINDER_OUTBOX")
+    dispatcher = ReminderDispatcher(storage, {}, default_transport=FileTransport(outbox) if outbox else StdoutTransport())
+    print(f"✅ Reminder dispatcher running (deliveries to {outbox or 'stdout'})")
+    try:
+        await dispatcher.run()
+    finally:
+        await storage.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+"""
+Per-storage-method count of MongoDB round trips.
+
+mongo_clients registers `round_trip_counter` as a command listener on both
+clients, and MongoStorage methods wrapped with @counts_round_trips tag the
+commands they send, so round_trip_counter.snapshot() shows e.g.
+{"MongoStorage.create_task": 3} after three create_task calls.
+"""
+import functools
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from pymongo import monitoring
+
+_current_method: ContextVar[Optional[str]] = ContextVar("storage_method", default=None)
+
+
+class RoundTripCounter(monitoring.CommandListener):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+        self._calls: Counter = Counter()
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        method = _current_method.get()
+        if method:
+            with self._lock:
+                self._counts[method] += 1
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pass
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pass
+
+    def record_call(self, method: str) -> None:
+        with self._lock:
+            self._calls[method] += 1
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Round trips and calls per method, plus round trips per call."""
+        with self._lock:
+            return {
+                method: {
+                    "calls": self._calls[method],
+                    "round_trips": self._counts[method],
+                    "round_trips_per_call": self._counts[method] / self._calls[method] if self._calls[method] else 0,
+                }
+                for method in self._calls
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._calls.clear()
+
+
+round_trip_counter = RoundTripCounter()
+
+
+def counts_round_trips(method):
+    """Attribute every Mongo command sent while `method` runs to ClassName.method."""
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        name = f"{type(self).__name__}.{method.__name__}"
+        round_trip_counter.record_call(name)
+        token = _current_method.set(name)
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            _current_method.reset(token)
+    return wrapper
@@ -0,0 +1,26 @@
+import time
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+
+from storage import IStorage
+from storage_registry import get_storage, storage_layers
+
+health_router = APIRouter()
+
+# Liveness: the process is up and serving requests
+@health_router.get("/health")
+async def health():
+    return {"status": "ok"}
+
+# Readiness: the storage backend answers a ping. Load balancers and
+# orchestrators should route traffic on this, not on startup logs.
+@health_router.get("/health/ready")
+async def ready(storage: IStorage = Depends(get_storage)):
+    backend = type(storage_layers(storage)[-1]).__name__
+    start = time.perf_counter()
+    try:
+        await storage.ping()
+    except Exception as e:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "storage": backend, "error": str(e)})
+    return {"status": "ready", "storage": backend, "latency_ms": round((time.perf_counter() - start) * 1000, 2)}
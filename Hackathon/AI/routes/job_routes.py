@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, HTTPException, Response
+
+from job_queue import IJobQueue, get_job_queue
+from shared.schemas import Job
+
+job_router = APIRouter()
+
+# Body of the 202 an endpoint answers with once it has queued its work
+def job_accepted(job: Job, response: Response) -> dict:
+    status_url = f"/api/jobs/{job.id}"
+    response.headers["Location"] = status_url
+    return {"jobId": job.id, "status": job.status.value, "statusUrl": status_url}
+
+# Poll until status is "succeeded" (result is set) or "failed" (error is set)
+@job_router.get("/jobs/{job_id}", response_model=Job)
+async def get_job(job_id: str, jobs: IJobQueue = Depends(get_job_queue)):
+    job = await jobs.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
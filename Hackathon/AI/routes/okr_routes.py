@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from typing import List, Optional
 from datetime import datetime, timedelta
 import re
@@ -6,9 +6,11 @@ import requests
 from pydantic import BaseModel
 
 from shared.schemas import Okr, OkrCreate, Task, TaskCreate, OkrWithTasks, TaskStatus
-from storage import MemStorage, IStorage, MongoStorage
-from agents.okr_parser import parse_okr
-from agents.okr_validator import validate_submission
+from storage import IStorage
+from storage_registry import get_storage
+from job_queue import IJobQueue, get_job_queue
+from routes.job_routes import job_accepted
+from routes.pagination import PageParams
 
 okr_router = APIRouter()
 
@@ -19,16 +21,10 @@ class ValidationRequest(BaseModel):
     submission_content: str
     submission_type: str
 
-# Dependency to get storage instance
-def get_storage() -> IStorage:
-    return MongoStorage()
-
 async def generate_micro_tasks(okr_id: str, description: str, storage: IStorage) -> List[Task]:
-    tasks = []
+    tasks: List[TaskCreate] = []
     now = datetime.now()
     
-    parsed_okr = parse_okr(description)
-    
     # Basic pattern matching for common OKR types
     if "article" in description.lower() or "blog" in description.lower():
         article_count_match = re.search(r'(\d+)\s*(?:article|blog)', description.lower())
@@ -39,17 +35,17 @@ async def generate_micro_tasks(okr_id: str, description: str, storage: IStorage)
                 okrId=okr_id,
                 title=f"Write article {i}",
                 description=f"Research, write, and publish article {i}",
-                deadline=str(now + timedelta(weeks=i)),
+                deadline=now + timedelta(weeks=i),
             )
-            tasks.append(await storage.create_task(task_create_data_write))
+            tasks.append(task_create_data_write)
             
             task_create_data_research = TaskCreate(
                 okrId=okr_id,
                 title=f"Research for article {i}",
                 description=f"Gather information and sources for article {i}",
-                deadline=str(now + timedelta(weeks=i) - timedelta(days=2)),
+                deadline=now + timedelta(weeks=i) - timedelta(days=2),
             )
-            tasks.append(await storage.create_task(task_create_data_research))
+            tasks.append(task_create_data_research)
             
     elif "project" in description.lower() or "coding" in description.lower():
         project_count_match = re.search(r'(\d+)\s*(?:project|coding)', description.lower())
@@ -60,42 +56,43 @@ async def generate_micro_tasks(okr_id: str, description: str, storage: IStorage)
                 okrId=okr_id,
                 title=f"Complete project {i}",
                 description=f"Build and deploy project {i}",
-                deadline=str(now + timedelta(weeks=i*2)),
+                deadline=now + timedelta(weeks=i*2),
             )
-            tasks.append(await storage.create_task(task_create_data))
+            tasks.append(task_create_data)
     else:
         # Generic task breakdown
         task_create_data_plan = TaskCreate(
             okrId=okr_id,
             title="Plan and research",
             description="Break down the objective and research requirements",
-            deadline=str(now + timedelta(weeks=1)),
+            deadline=now + timedelta(weeks=1),
         )
-        tasks.append(await storage.create_task(task_create_data_plan))
+        tasks.append(task_create_data_plan)
         
         task_create_data_execute = TaskCreate(
             okrId=okr_id,
             title="Execute core work",
             description="Complete the main deliverables",
-            deadline=str(now + timedelta(weeks=3)),
+            deadline=now + timedelta(weeks=3),
         )
-        tasks.append(await storage.create_task(task_create_data_execute))
+        tasks.append(task_create_data_execute)
         
         task_create_data_review = TaskCreate(
             okrId=okr_id,
             title="Review and finalize",
             description="Review progress and finalize deliverables",
-            deadline=str(now + timedelta(weeks=4)),
+            deadline=now + timedelta(weeks=4),
         )
-        tasks.append(await storage.create_task(task_create_data_review))
+        tasks.append(task_create_data_review)
 
-    return tasks
+    # One insert_many for the whole breakdown instead of a round trip per task
+    return await storage.create_tasks_bulk(tasks)
 
 
 @okr_router.get("/okrs", response_model=List[OkrWithTasks])
-async def get_all_okrs(storage: IStorage = Depends(get_storage)):
+async def get_all_okrs(page: PageParams = Depends(), storage: IStorage = Depends(get_storage)):
     print("Fetching all OKRs with tasks")
-    return await storage.get_okrs()
+    return page.respond(await storage.get_okrs(page.after, page.limit, page.fields, page.raw))
 
 @okr_router.get("/okrs/{okr_id}", response_model=OkrWithTasks)
 async def get_okr_by_id(okr_id: str, storage: IStorage = Depends(get_storage)):
@@ -110,17 +107,11 @@ async def create_new_okr(okr_create: OkrCreate, storage: IStorage = Depends(get_
     tasks = await generate_micro_tasks(okr.id, okr.description, storage)
     return {"okr": okr, "tasks": tasks}
 
-@okr_router.post("/okr/validate")
-async def validate_okr_submission(request: ValidationRequest, storage: IStorage = Depends(get_storage)):
+@okr_router.post("/okr/validate", status_code=202)
+async def validate_okr_submission(request: ValidationRequest, response: Response, jobs: IJobQueue = Depends(get_job_queue)):
     print(f"Received validation request for submission {request.submission_id} and OKR {request.okr_id}")
 
-    # Call the validation agent with submission_content and submission_type
-    validation_response = await validate_submission(
-        request.submission_id,
-        request.okr_id,
-        request.submission_content,
-        request.submission_type,
-        storage
-    )
-
-    return validation_response 
\ No newline at end of file
+    # The validation agents run on a job worker; poll GET /api/jobs/{jobId}
+    # for the validation response
+    job = await jobs.enqueue("validate_submission", request.model_dump())
+    return job_accepted(job, response)
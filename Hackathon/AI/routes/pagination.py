@@ -0,0 +1,49 @@
+import os
+import uuid
+from typing import List, Optional
+
+from bson import ObjectId
+from fastapi import HTTPException, Query
+
+from routes.responses import FAST_JSON, FastJSONResponse
+
+MAX_PAGE_SIZE = 500
+
+# Trusted reads: list endpoints ask storage for raw documents and encode them
+# directly, skipping model validation and the route's response_model. Only
+# safe when every stored document was written through storage.py.
+TRUSTED_READS = os.getenv("STORAGE_TRUSTED_READS", "0").lower() in ("1", "true", "yes")
+
+def _is_item_id(value: str) -> bool:
+    # MongoDB ids are ObjectIds; the memory and SQLite backends use UUIDs
+    if ObjectId.is_valid(value):
+        return True
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
+
+# Query parameters shared by the list endpoints:
+#   ?after=<id of the last item on the previous page>&limit=20&fields=title,status
+class PageParams:
+    def __init__(
+        self,
+        after: Optional[str] = Query(None, description="Return items after this id (keyset cursor)"),
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of items to return"),
+        fields: Optional[str] = Query(None, description="Comma-separated document fields to return"),
+    ):
+        if after is not None and not _is_item_id(after):
+            raise HTTPException(status_code=400, detail="Invalid 'after' cursor: expected the id of an item")
+        self.after = after
+        self.limit = limit
+        self.fields: Optional[List[str]] = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+        self.raw = TRUSTED_READS
+
+    def respond(self, items: list):
+        # Projected and raw items are plain documents, so skip the route's
+        # response_model and encode them in one pass. With fast JSON, full
+        # models (already the route's response_model type) skip it too.
+        if self.fields or self.raw or FAST_JSON:
+            return FastJSONResponse(items)
+        return items
@@ -2,17 +2,15 @@ from fastapi import APIRouter, Depends, HTTPException
 from typing import List
 
 from shared.schemas import Reminder, ReminderCreate
-from storage import MemStorage, IStorage
+from storage import IStorage
+from storage_registry import get_storage
+from routes.pagination import PageParams
 
 reminder_router = APIRouter()
 
-# Dependency to get storage instance
-def get_storage() -> IStorage:
-    return MemStorage()
-
 @reminder_router.get("/reminders", response_model=List[Reminder])
-async def get_all_reminders(storage: IStorage = Depends(get_storage)):
-    return await storage.get_reminders()
+async def get_all_reminders(page: PageParams = Depends(), storage: IStorage = Depends(get_storage)):
+    return page.respond(await storage.get_reminders(page.after, page.limit, page.fields, page.raw))
 
 @reminder_router.get("/reminders/upcoming", response_model=List[Reminder])
 async def get_upcoming_reminders(storage: IStorage = Depends(get_storage)):
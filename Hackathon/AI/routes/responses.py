@@ -0,0 +1,30 @@
+import os
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+# Opt-in fast JSON encoding (RESPONSE_FAST_JSON=1): routes hand documents and
+# models straight to FastJSONResponse instead of going through
+# jsonable_encoder + json.dumps. Responses of at least RESPONSE_GZIP_MIN_BYTES
+# bytes are gzip-compressed when that variable is set (see main.py).
+FAST_JSON = os.getenv("RESPONSE_FAST_JSON", "0").lower() in ("1", "true", "yes")
+GZIP_MIN_BYTES = int(os.getenv("RESPONSE_GZIP_MIN_BYTES", "0"))
+GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "6"))
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded by pydantic-core in one pass.
+
+    datetimes come out as ISO 8601 and models by alias, as FastAPI's encoder
+    would produce; anything else unknown (e.g. a nested ObjectId) falls back
+    to str().
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content, by_alias=True, fallback=str)
+
+
+def fast_json(content: Any):
+    """`content` as a FastJSONResponse when fast JSON is on; otherwise unchanged, for FastAPI to encode."""
+    return FastJSONResponse(content) if FAST_JSON else content
@@ -1,21 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Optional
 
 from shared.schemas import Task, TaskCreate, TaskUpdate, TaskWithReminders
-from storage import MemStorage, IStorage
+from storage import IStorage
+from storage_registry import get_storage
+from routes.pagination import PageParams
 
 task_router = APIRouter()
 
-# Dependency to get storage instance
-def get_storage() -> IStorage:
-    return MemStorage()
-
 @task_router.get("/tasks", response_model=List[Task])
-async def get_all_tasks(storage: IStorage = Depends(get_storage)):
-    return await storage.get_tasks()
+async def get_all_tasks(page: PageParams = Depends(), storage: IStorage = Depends(get_storage)):
+    return page.respond(await storage.get_tasks(page.after, page.limit, page.fields, page.raw))
+
+@task_router.get("/tasks/due", response_model=List[Task])
+async def get_tasks_due_soon(hours: float = Query(24, gt=0, le=24 * 365), storage: IStorage = Depends(get_storage)):
+    return await storage.get_tasks_due_within(hours)
 
 @task_router.get("/tasks/{task_id}", response_model=TaskWithReminders)
-async def get_task_by_id(task_id: int, storage: IStorage = Depends(get_storage)):
+async def get_task_by_id(task_id: str, storage: IStorage = Depends(get_storage)):
     task = await storage.get_task(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -27,14 +29,14 @@ async def create_new_task(task_create: TaskCreate, storage: IStorage = Depends(g
     return task
 
 @task_router.patch("/tasks/{task_id}", response_model=Task)
-async def update_existing_task(task_id: int, task_update: TaskUpdate, storage: IStorage = Depends(get_storage)):
+async def update_existing_task(task_id: str, task_update: TaskUpdate, storage: IStorage = Depends(get_storage)):
     task = await storage.update_task(task_id, task_update)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
 @task_router.post("/tasks/{task_id}/complete", response_model=Task)
-async def complete_existing_task(task_id: int, proof_url: Optional[str] = None, storage: IStorage = Depends(get_storage)):
+async def complete_existing_task(task_id: str, proof_url: Optional[str] = None, storage: IStorage = Depends(get_storage)):
     task = await storage.complete_task(task_id, proof_url)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -0,0 +1,284 @@
+"""
+Near-duplicate cache for OKR parsing and micro-task planning.
+
+Students type the same OKR many ways ("publish 3 AI articles this quarter",
+"write three AI blog posts by Q3"), which an exact-prompt cache (llm_cache.py)
+never matches. parse_okr and create_micro_tasks embed their input, with the
+deadline taken out, using the MiniLM sentence-transformer the RAG apps use
+(MODEL_NAME), and reuse the stored result of the most similar earlier input
+when the cosine similarity clears SEMANTIC_CACHE_THRESHOLD (default 0.85)
+and both texts mention the same numbers ("3 articles" is never served "5
+articles"). The caller then puts its own deadline back into the reused
+result.
+
+Enable with SEMANTIC_CACHE=1. Entries live in SEMANTIC_CACHE_PATH (default
+semantic_cache.db), at most SEMANTIC_CACHE_SIZE of them (default 10000,
+oldest dropped first, on disk and in each process's index); every process loads rows the others added as it
+looks up, so all job workers learn from each other. stats() reports the hit
+rate and the LLM seconds hits saved. Measure both on paraphrased OKRs with:
+
+    python -m benchmarks.bench_semantic_cache
+"""
+import bisect
+import copy
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+DEFAULT_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_THRESHOLD = 0.85
+DEFAULT_MAX_ENTRIES = 10_000
+
+Embedder = Callable[[List[str]], np.ndarray]
+
+# "... by 2025-09-30", "by end of Q3", "2025-09-30T00:00:00.000Z"
+_DEADLINE = re.compile(r"\b(?:(?:by|before|until|due)\s+(?:the\s+)?(?:end\s+of\s+)?)?(?:\d{4}-\d{2}-\d{2}(?:T[\d:.]+Z?)?|Q[1-4])\b", re.IGNORECASE)
+_NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+}
+_NUMBER = re.compile(r"\b(\d+|" + "|".join(_NUMBER_WORDS) + r")\b", re.IGNORECASE)
+
+
+def strip_deadline(text: str) -> str:
+    return " ".join(_DEADLINE.sub(" ", text).split())
+
+
+def find_deadline(text: str) -> Optional[str]:
+    """The YYYY-MM-DD date or quarter named in the text, if any."""
+    match = re.search(r"\b\d{4}-\d{2}-\d{2}\b|\bQ[1-4]\b", text, re.IGNORECASE)
+    return match.group(0).upper() if match else None
+
+
+def numbers(text: str) -> Set[int]:
+    return {int(token) if token.isdigit() else _NUMBER_WORDS[token.lower()] for token in _NUMBER.findall(text)}
+
+
+def _iso_date(value: Optional[str]) -> Optional[date]:
+    try:
+        return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def reschedule(tasks: List[dict], planned_on: date, old_deadline: Optional[str], new_deadline: Optional[str], today: Optional[date] = None) -> Optional[List[dict]]:
+    """Stretch a stored plan's due dates from its own window (planned_on to
+    old_deadline) onto today..new_deadline, keeping their order and spacing.
+
+    None when the dates can't be mapped (non-ISO deadlines that differ, a
+    deadline already past, a task without a YYYY-MM-DD due date).
+    """
+    tasks = copy.deepcopy(tasks)
+    if old_deadline == new_deadline and planned_on == (today or date.today()):
+        return tasks
+    old_end, new_end, today = _iso_date(old_deadline), _iso_date(new_deadline), today or date.today()
+    if old_end is None or new_end is None:
+        return tasks if old_deadline == new_deadline else None
+    old_span, new_span = (old_end - planned_on).days, (new_end - today).days
+    if old_span <= 0 or new_span < 0:
+        return None
+    for task in tasks:
+        due = _iso_date(task.get("due"))
+        if due is None:
+            return None
+        offset = round((due - planned_on).days * new_span / old_span)
+        task["due"] = min(max(today + timedelta(days=offset), today), new_end).isoformat()
+    return tasks
+
+
+def sentence_transformer_embedder(model_name: Optional[str] = None) -> Embedder:
+    # Imported here: loading torch takes seconds and only the workers need it
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name or os.getenv("MODEL_NAME", DEFAULT_MODEL_NAME))
+    return lambda texts: model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+
+class SemanticHit:
+    def __init__(self, result: Any, context: dict, created_at: datetime, similarity: float, llm_seconds: float):
+        self.result = result
+        self.context = context
+        self.created_at = created_at
+        self.similarity = similarity
+        self.llm_seconds = llm_seconds
+
+
+SEMANTIC_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS semantic_cache (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    text TEXT NOT NULL,
+    embedding BLOB NOT NULL,
+    result TEXT NOT NULL,
+    context TEXT NOT NULL,
+    llm_seconds REAL NOT NULL,
+    created_at TEXT NOT NULL
+);
+"""
+
+
+class SemanticCache:
+    def __init__(self, path: str, embed: Embedder, threshold: float = DEFAULT_THRESHOLD, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.embed = embed
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SEMANTIC_CACHE_SCHEMA)
+        self._lock = threading.Lock()
+        # kind -> (row ids, unit embeddings stacked, (text, result, context, created_at, llm_seconds) per row)
+        self._index: Dict[str, Tuple[List[int], np.ndarray, List[tuple]]] = {}
+        self._last_id = 0
+        self.lookups = 0
+        self.hits = 0
+        self.rejected = 0
+        self.llm_seconds_saved = 0.0
+        self.lookup_seconds = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": sum(len(ids) for ids, _, _ in self._index.values()),
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "rejected": self.rejected,
+                "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+                "llm_seconds_saved": self.llm_seconds_saved,
+                "lookup_seconds": self.lookup_seconds,
+            }
+
+    def _refresh(self) -> None:
+        # Rows other processes (and this one) added since the last look
+        rows = self.conn.execute(
+            "SELECT id, kind, text, embedding, result, context, created_at, llm_seconds FROM semantic_cache WHERE id > ? ORDER BY id",
+            (self._last_id,),
+        ).fetchall()
+        added: Dict[str, Tuple[List[int], List[np.ndarray], List[tuple]]] = {}
+        for row_id, kind, text, embedding, result, context, created_at, llm_seconds in rows:
+            ids, vectors, entries = added.setdefault(kind, ([], [], []))
+            ids.append(row_id)
+            vectors.append(np.frombuffer(embedding, dtype=np.float32))
+            entries.append((text, json.loads(result), json.loads(context), datetime.fromisoformat(created_at), llm_seconds))
+            self._last_id = row_id
+        for kind, (ids, vectors, entries) in added.items():
+            if kind in self._index:
+                old_ids, matrix, old_entries = self._index[kind]
+                self._index[kind] = (old_ids + ids, np.vstack([matrix, *vectors]), old_entries + entries)
+            else:
+                self._index[kind] = (ids, np.vstack(vectors), entries)
+        self._trim()
+
+    def _trim(self) -> None:
+        # The same rule _add applies to the table: keep the newest max_entries
+        # row ids across all kinds
+        cutoff = self._last_id - self.max_entries
+        for kind, (ids, matrix, entries) in list(self._index.items()):
+            keep_from = bisect.bisect_right(ids, cutoff)
+            if keep_from == len(ids):
+                del self._index[kind]
+            elif keep_from:
+                # Copied so the dropped rows' memory is freed
+                self._index[kind] = (ids[keep_from:], matrix[keep_from:].copy(), entries[keep_from:])
+
+    def _nearest(self, kind: str, text: str, vector: np.ndarray) -> Optional[SemanticHit]:
+        self._refresh()
+        if kind not in self._index:
+            return None
+        _, matrix, entries = self._index[kind]
+        similarities = matrix @ vector
+        wanted = numbers(text)
+        # Best first, skipping near matches about a different count of things
+        for position in np.argsort(-similarities):
+            if similarities[position] < self.threshold:
+                return None
+            stored_text, result, context, created_at, llm_seconds = entries[position]
+            if numbers(stored_text) == wanted:
+                return SemanticHit(copy.deepcopy(result), context, created_at, float(similarities[position]), llm_seconds)
+        return None
+
+    def _add(self, kind: str, text: str, vector: np.ndarray, result: Any, context: dict, llm_seconds: float) -> None:
+        now = datetime.now()
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO semantic_cache (kind, text, embedding, result, context, llm_seconds, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, text, vector.tobytes(), json.dumps(result, default=str), json.dumps(context, default=str), llm_seconds, now.isoformat()),
+            )
+            self.conn.execute(
+                "DELETE FROM semantic_cache WHERE id <= (SELECT MAX(id) FROM semantic_cache) - ?",
+                (self.max_entries,),
+            )
+        self._refresh()
+
+    def get_or_compute(
+        self,
+        kind: str,
+        text: str,
+        compute: Callable[[], Any],
+        context: Optional[dict] = None,
+        adapt: Optional[Callable[[SemanticHit], Optional[Any]]] = None,
+    ) -> Tuple[Any, Optional[SemanticHit]]:
+        """Reuse the result stored for the nearest `kind` entry to `text`, or
+        call compute() and store what it returns (unless it raises or is empty).
+
+        adapt turns a hit into this caller's result (e.g. re-substituting the
+        deadline) or returns None to refuse it. `context` is stored alongside
+        the result and handed back on hits as hit.context.
+        """
+        start = time.perf_counter()
+        vector = self.embed([text])[0]
+        with self._lock:
+            self.lookups += 1
+            hit = self._nearest(kind, text, vector)
+        result = (adapt(hit) if adapt else hit.result) if hit is not None else None
+        with self._lock:
+            self.lookup_seconds += time.perf_counter() - start
+            if result is not None:
+                self.hits += 1
+                self.llm_seconds_saved += hit.llm_seconds
+            elif hit is not None:
+                self.rejected += 1
+        if result is not None:
+            return result, hit
+
+        start = time.perf_counter()
+        result = compute()
+        llm_seconds = time.perf_counter() - start
+        if result:
+            with self._lock:
+                self._add(kind, text, vector, result, context or {}, llm_seconds)
+        return result, None
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+_default_cache: Optional[SemanticCache] = None
+_default_cache_created = False
+_default_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """The process-wide cache when SEMANTIC_CACHE is on, else None."""
+    global _default_cache, _default_cache_created
+    if not _default_cache_created:
+        with _default_cache_lock:
+            if not _default_cache_created:
+                if os.getenv("SEMANTIC_CACHE", "0").lower() in ("1", "true", "yes"):
+                    _default_cache = SemanticCache(
+                        os.getenv("SEMANTIC_CACHE_PATH", "semantic_cache.db"),
+                        sentence_transformer_embedder(),
+                        threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", str(DEFAULT_THRESHOLD))),
+                        max_entries=int(os.getenv("SEMANTIC_CACHE_SIZE", str(DEFAULT_MAX_ENTRIES))),
+                    )
+                    print(f"✅ Semantic OKR cache on (threshold {_default_cache.threshold:g}, {_default_cache.path})")
+                _default_cache_created = True
+    return _default_cache
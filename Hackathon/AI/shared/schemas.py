@@ -2,7 +2,14 @@ from datetime import datetime
 from typing import List, Optional
 from enum import Enum
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# Storage compares deadlines and reminder times against naive local
+# datetime.now(), so timezone-aware input is converted to naive local time
+def _naive_local(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
 
 # Pydantic Models (Schemas)
 
@@ -20,7 +27,9 @@ class Okr(OkrBase):
     progress: Optional[int] = Field(0)
     created_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
-    
+    # Denormalised task counters, maintained by the storage task mutations
+    completed_tasks: int = Field(0, alias="completedTasks")
+    total_tasks: int = Field(0, alias="totalTasks")
 
     model_config = ConfigDict(populate_by_name=True)
 
@@ -28,7 +37,9 @@ class TaskBase(BaseModel):
     okr_id: str = Field(..., alias="okrId") # Changed from int to str for MongoDB ObjectId
     title: str
     description: Optional[str] = None
-    deadline: str # Changed from datetime to str for ISO 8601 string
+    deadline: datetime # Stored as a BSON date; ISO 8601 strings are parsed on input
+
+    _normalize_deadline = field_validator("deadline")(_naive_local)
 
 class TaskStatus(str, Enum):
     PENDING = "pending"
@@ -41,12 +52,14 @@ class TaskCreate(TaskBase):
 class TaskUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
-    deadline: Optional[str] = None # Changed from datetime to str for ISO 8601 string
+    deadline: Optional[datetime] = None
     status: Optional[str] = None
     micro_status: Optional[TaskStatus] = None
     completed_at: Optional[datetime] = Field(None, alias="completedAt")
     proof_url: Optional[str] = Field(None, alias="proofUrl")
 
+    _normalize_deadline = field_validator("deadline")(_naive_local)
+
 class Task(TaskBase):
     id: str = Field(..., alias="_id") # Changed from int to str for MongoDB ObjectId
     status: str
@@ -64,23 +77,49 @@ class ReminderBase(BaseModel):
     delivery_method: str = Field(..., alias="deliveryMethod")
 
 class ReminderCreate(ReminderBase):
-    scheduled_for: str = Field(..., alias="scheduledFor") # Changed from datetime to str for ISO 8601 string
+    scheduled_for: datetime = Field(..., alias="scheduledFor") # Stored as a BSON date
+
+    _normalize_scheduled_for = field_validator("scheduled_for")(_naive_local)
 
 class Reminder(ReminderBase):
     id: str = Field(..., alias="_id") # Changed from int to str for MongoDB ObjectId
     status: str
-    scheduled_for: str = Field(..., alias="scheduledFor") # Changed from datetime to str for ISO 8601 string
+    scheduled_for: datetime = Field(..., alias="scheduledFor") # Stored as a BSON date
     sent_at: Optional[datetime] = Field(None, alias="sentAt")
     created_at: datetime = Field(..., alias="createdAt")
 
     model_config = ConfigDict(populate_by_name=True)
 
+# Background jobs (job_queue.py)
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class Job(BaseModel):
+    id: str = Field(..., alias="_id")
+    type: str
+    payload: dict = {}
+    status: JobStatus = JobStatus.QUEUED
+    attempts: int = 0
+    max_attempts: int = Field(3, alias="maxAttempts")
+    run_at: datetime = Field(..., alias="runAt") # Not claimable before this (retry backoff)
+    lease_until: Optional[datetime] = Field(None, alias="leaseUntil")
+    worker_id: Optional[str] = Field(None, alias="workerId")
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(..., alias="createdAt")
+    updated_at: Optional[datetime] = Field(None, alias="updatedAt")
+    finished_at: Optional[datetime] = Field(None, alias="finishedAt")
+
+    model_config = ConfigDict(populate_by_name=True)
+
 # Extended types with relations
 
 class OkrWithTasks(Okr):
     tasks: List["Task"] = []
-    completed_tasks: int = Field(0, alias="completedTasks")
-    total_tasks: int = Field(0, alias="totalTasks")
 
     model_config = ConfigDict(populate_by_name=True)
 
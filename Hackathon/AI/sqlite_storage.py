@@ -0,0 +1,424 @@
+"""
+SQLite-backed IStorage for single-node installs that don't run MongoDB.
+
+Uses WAL mode so readers don't block the writer, keeps the same denormalised
+OKR task counters as the other backends (updated in the same transaction as
+the task write), and answers relation reads with joins.
+"""
+import sqlite3
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Union
+
+from shared.schemas import (
+    Okr, OkrCreate, OkrWithTasks, Reminder, ReminderCreate, Task, TaskCreate, TaskStatus, TaskUpdate, TaskWithReminders,
+)
+from storage import (
+    IStorage, RollupKey, _completed_delta, _dashboard_stats, _model_fields, _period_starts, _progress, _project, _rollup_deltas,
+    _rollup_id, _to_task_status,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS okrs (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    target_date TEXT NOT NULL,
+    status TEXT,
+    progress INTEGER NOT NULL DEFAULT 0,
+    completed_tasks INTEGER NOT NULL DEFAULT 0,
+    total_tasks INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    okr_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    deadline TEXT NOT NULL,
+    status TEXT NOT NULL,
+    micro_status TEXT NOT NULL,
+    completed_at TEXT,
+    proof_url TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS reminders (
+    id TEXT PRIMARY KEY,
+    task_id TEXT NOT NULL,
+    message TEXT NOT NULL,
+    delivery_method TEXT NOT NULL,
+    status TEXT NOT NULL,
+    scheduled_for TEXT NOT NULL,
+    sent_at TEXT,
+    created_at TEXT NOT NULL,
+    claimed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS task_rollups (
+    id TEXT PRIMARY KEY,
+    period TEXT NOT NULL,
+    start TEXT,
+    created INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS tasks_okr_id_status ON tasks (okr_id, status);
+CREATE INDEX IF NOT EXISTS tasks_status_deadline ON tasks (status, deadline);
+CREATE INDEX IF NOT EXISTS reminders_task_id ON reminders (task_id);
+CREATE INDEX IF NOT EXISTS reminders_status_scheduled_for ON reminders (status, scheduled_for);
+CREATE INDEX IF NOT EXISTS task_rollups_period_start ON task_rollups (period, start);
+"""
+
+OKR_COLUMNS = ["id", "title", "description", "target_date", "status", "progress", "completed_tasks", "total_tasks", "created_at", "updated_at"]
+TASK_COLUMNS = ["id", "okr_id", "title", "description", "deadline", "status", "micro_status", "completed_at", "proof_url", "created_at", "updated_at"]
+REMINDER_COLUMNS = ["id", "task_id", "message", "delivery_method", "status", "scheduled_for", "sent_at", "created_at"]
+
+
+def iso_timestamp(value: Optional[datetime]) -> Optional[str]:
+    # Fixed-width ISO strings sort the same way the datetimes do
+    return value.isoformat(timespec="microseconds") if value is not None else None
+
+
+def _select(alias: str, columns: List[str]) -> str:
+    return ", ".join(f"{alias}.{column} AS {alias}_{column}" for column in columns)
+
+
+def _row_values(row: sqlite3.Row, alias: str, columns: List[str]) -> dict:
+    return {column: row[f"{alias}_{column}"] for column in columns}
+
+
+def _okr(values: dict, tasks: Optional[List[Task]] = None) -> Union[Okr, OkrWithTasks]:
+    if tasks is None:
+        return Okr.model_validate(values)
+    return OkrWithTasks.model_validate({**values, "tasks": tasks})
+
+
+def _task(values: dict) -> Task:
+    return Task.model_validate(values)
+
+
+def _reminder(values: dict) -> Reminder:
+    return Reminder.model_validate(values)
+
+
+class SQLiteStorage(IStorage):
+    def __init__(self, path: str = "okr.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # Same rounding as the other backends (half to even)
+        self.conn.create_function("progress", 2, _progress, deterministic=True)
+        self.conn.executescript(SCHEMA)
+        # Files created before reminder dispatch lack the claim column
+        if "claimed_at" not in {row["name"] for row in self.conn.execute("PRAGMA table_info(reminders)")}:
+            self.conn.execute("ALTER TABLE reminders ADD COLUMN claimed_at TEXT")
+
+    def _inc_okr_counters(self, deltas: Dict[str, tuple]) -> None:
+        # Runs inside the caller's transaction
+        for okr_id, (total_delta, completed_delta) in deltas.items():
+            if total_delta == 0 and completed_delta == 0:
+                continue
+            self.conn.execute(
+                "UPDATE okrs SET total_tasks = total_tasks + ?, completed_tasks = completed_tasks + ?, "
+                "progress = progress(completed_tasks + ?, total_tasks + ?), updated_at = ? WHERE id = ?",
+                (total_delta, completed_delta, completed_delta, total_delta, iso_timestamp(datetime.now()), okr_id),
+            )
+
+    def _inc_rollups(self, deltas: Dict[RollupKey, tuple]) -> None:
+        # Runs inside the caller's transaction
+        self.conn.executemany(
+            "INSERT INTO task_rollups (id, period, start, created, completed) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET created = created + excluded.created, completed = completed + excluded.completed",
+            [
+                (_rollup_id(period, start), period, iso_timestamp(start), created_delta, completed_delta)
+                for (period, start), (created_delta, completed_delta) in deltas.items()
+            ],
+        )
+
+    def _page_clause(self, table: str, after: Optional[str], limit: Optional[int]) -> tuple:
+        # Keyset pagination on rowid, which follows insertion order
+        where, params = "", []
+        if after:
+            where = f"WHERE {table}.rowid > (SELECT rowid FROM {table} WHERE id = ?)"
+            params.append(after)
+        return f"{where} ORDER BY {table}.rowid LIMIT ?", params + [limit if limit else -1]
+
+    # OKR methods
+    async def create_okr(self, okr_data: OkrCreate) -> Okr:
+        now = datetime.now()
+        values = {
+            "id": str(uuid.uuid4()), "title": okr_data.title, "description": okr_data.description,
+            "target_date": okr_data.target_date, "status": "active", "progress": 0,
+            "completed_tasks": 0, "total_tasks": 0, "created_at": iso_timestamp(now), "updated_at": iso_timestamp(now),
+        }
+        with self.conn:
+            self.conn.execute(
+                f"INSERT INTO okrs ({', '.join(OKR_COLUMNS)}) VALUES ({', '.join('?' * len(OKR_COLUMNS))})",
+                [values[column] for column in OKR_COLUMNS],
+            )
+        return _okr(values)
+
+    async def get_okrs(self, after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None, raw: bool = False) -> List[Union[OkrWithTasks, dict]]:
+        page_clause, params = self._page_clause("okrs", after, limit)
+        fields = fields or (_model_fields(OkrWithTasks) if raw else None)
+        if fields and "tasks" not in fields:
+            rows = self.conn.execute(f"SELECT {_select('okrs', OKR_COLUMNS)} FROM okrs {page_clause}", params)
+            return [_project(_okr(_row_values(row, "okrs", OKR_COLUMNS)), fields) for row in rows]
+
+        # One query: the page of OKRs joined to all of their tasks
+        rows = self.conn.execute(
+            f"WITH page AS (SELECT okrs.rowid AS seq, okrs.* FROM okrs {page_clause}) "
+            f"SELECT {_select('page', OKR_COLUMNS)}, {_select('t', TASK_COLUMNS)} "
+            f"FROM page LEFT JOIN tasks t ON t.okr_id = page.id ORDER BY page.seq, t.rowid",
+            params,
+        )
+        okr_values: Dict[str, dict] = {}
+        tasks_by_okr: Dict[str, List[Task]] = {}
+        for row in rows:
+            okr_id = row["page_id"]
+            if okr_id not in okr_values:
+                okr_values[okr_id] = _row_values(row, "page", OKR_COLUMNS)
+                tasks_by_okr[okr_id] = []
+            if row["t_id"] is not None:
+                tasks_by_okr[okr_id].append(_task(_row_values(row, "t", TASK_COLUMNS)))
+        okrs = [_okr(values, tasks_by_okr[okr_id]) for okr_id, values in okr_values.items()]
+        if fields:
+            return [_project(okr, fields) for okr in okrs]
+        return okrs
+
+    async def get_okr(self, id: str) -> Optional[OkrWithTasks]:
+        rows = self.conn.execute(
+            f"SELECT {_select('o', OKR_COLUMNS)}, {_select('t', TASK_COLUMNS)} "
+            f"FROM okrs o LEFT JOIN tasks t ON t.okr_id = o.id WHERE o.id = ? ORDER BY t.rowid",
+            (id,),
+        ).fetchall()
+        if not rows: return None
+        tasks = [_task(_row_values(row, "t", TASK_COLUMNS)) for row in rows if row["t_id"] is not None]
+        return _okr(_row_values(rows[0], "o", OKR_COLUMNS), tasks)
+
+    async def update_okr_progress(self, id: str, progress: int) -> None:
+        with self.conn:
+            self.conn.execute("UPDATE okrs SET progress = ?, updated_at = ? WHERE id = ?", (progress, iso_timestamp(datetime.now()), id))
+
+    async def update_okr_status(self, okr_id: str, status: str) -> None:
+        with self.conn:
+            self.conn.execute("UPDATE okrs SET status = ?, updated_at = ? WHERE id = ?", (status, iso_timestamp(datetime.now()), okr_id))
+
+    # Task methods
+    def _task_values(self, insert_task: TaskCreate, now: datetime) -> dict:
+        return {
+            "id": str(uuid.uuid4()), "okr_id": insert_task.okr_id, "title": insert_task.title,
+            "description": insert_task.description, "deadline": iso_timestamp(insert_task.deadline),
+            "status": "pending", "micro_status": TaskStatus.PENDING.value, "completed_at": None,
+            "proof_url": None, "created_at": iso_timestamp(now), "updated_at": iso_timestamp(now),
+        }
+
+    async def create_task(self, insert_task: TaskCreate) -> Task:
+        return (await self.create_tasks_bulk([insert_task]))[0]
+
+    async def create_tasks_bulk(self, insert_tasks: List[TaskCreate]) -> List[Task]:
+        if not insert_tasks: return []
+        now = datetime.now()
+        rows = [self._task_values(insert_task, now) for insert_task in insert_tasks]
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO tasks ({', '.join(TASK_COLUMNS)}) VALUES ({', '.join('?' * len(TASK_COLUMNS))})",
+                [[values[column] for column in TASK_COLUMNS] for values in rows],
+            )
+            self._inc_okr_counters({okr_id: (count, 0) for okr_id, count in Counter(values["okr_id"] for values in rows).items()})
+            self._inc_rollups(_rollup_deltas([(now, len(rows), 0)]))
+        return [_task(values) for values in rows]
+
+    async def get_tasks(self, after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None, raw: bool = False) -> List[Union[Task, dict]]:
+        page_clause, params = self._page_clause("tasks", after, limit)
+        rows = self.conn.execute(f"SELECT {_select('tasks', TASK_COLUMNS)} FROM tasks {page_clause}", params)
+        tasks = [_task(_row_values(row, "tasks", TASK_COLUMNS)) for row in rows]
+        fields = fields or (_model_fields(Task) if raw else None)
+        if fields:
+            return [_project(task, fields) for task in tasks]
+        return tasks
+
+    async def get_tasks_by_okr(self, okr_id: str) -> List[Task]:
+        rows = self.conn.execute(f"SELECT {_select('t', TASK_COLUMNS)} FROM tasks t WHERE t.okr_id = ? ORDER BY t.rowid", (okr_id,))
+        return [_task(_row_values(row, "t", TASK_COLUMNS)) for row in rows]
+
+    async def get_task(self, id: str) -> Optional[TaskWithReminders]:
+        rows = self.conn.execute(
+            f"SELECT {_select('t', TASK_COLUMNS)}, {_select('r', REMINDER_COLUMNS)} "
+            f"FROM tasks t LEFT JOIN reminders r ON r.task_id = t.id WHERE t.id = ? ORDER BY r.rowid",
+            (id,),
+        ).fetchall()
+        if not rows: return None
+        reminders = [_reminder(_row_values(row, "r", REMINDER_COLUMNS)) for row in rows if row["r_id"] is not None]
+        return TaskWithReminders.model_validate({**_row_values(rows[0], "t", TASK_COLUMNS), "reminders": reminders})
+
+    def _update_task_fields(self, id: str, update_fields: dict) -> Optional[Task]:
+        # Read, write and adjust the OKR counters and rollups in one transaction.
+        # The implicit BEGIN would only come with the UPDATE, after the read, so
+        # take the write lock up front: another process can't change the
+        # status between our read and our counter update
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            row = self.conn.execute(f"SELECT {_select('t', TASK_COLUMNS)} FROM tasks t WHERE t.id = ?", (id,)).fetchone()
+            if not row: return None
+            values = _row_values(row, "t", TASK_COLUMNS)
+            update_fields["updated_at"] = iso_timestamp(datetime.now())
+            self.conn.execute(
+                f"UPDATE tasks SET {', '.join(f'{column} = ?' for column in update_fields)} WHERE id = ?",
+                [*update_fields.values(), id],
+            )
+            completed_delta = _completed_delta(values["status"], update_fields.get("status"))
+            self._inc_okr_counters({values["okr_id"]: (0, completed_delta)})
+            self._inc_rollups(_rollup_deltas([(datetime.fromisoformat(values["created_at"]), 0, completed_delta)]))
+        values.update(update_fields)
+        return _task(values)
+
+    async def update_task(self, id: str, updates: TaskUpdate) -> Optional[Task]:
+        update_fields = {}
+        if updates.title is not None: update_fields["title"] = updates.title
+        if updates.description is not None: update_fields["description"] = updates.description
+        if updates.deadline is not None: update_fields["deadline"] = iso_timestamp(updates.deadline)
+        if updates.status is not None: update_fields["status"] = updates.status
+        if updates.micro_status is not None: update_fields["micro_status"] = updates.micro_status.value
+        if updates.completed_at is not None: update_fields["completed_at"] = iso_timestamp(updates.completed_at)
+        if updates.proof_url is not None: update_fields["proof_url"] = updates.proof_url
+        return self._update_task_fields(id, update_fields)
+
+    async def update_task_status(self, task_id: str, status: Union[str, TaskStatus]) -> None:
+        status_enum = _to_task_status(status)
+        self._update_task_fields(task_id, {"status": status_enum.value, "micro_status": status_enum.value})
+
+    async def complete_task(self, id: str, proof_url: Optional[str] = None) -> Optional[Task]:
+        return self._update_task_fields(id, {
+            "status": "completed",
+            "micro_status": TaskStatus.COMPLETED.value,
+            "completed_at": iso_timestamp(datetime.now()),
+            "proof_url": proof_url,
+        })
+
+    async def get_tasks_due_within(self, hours: float) -> List[Task]:
+        now = datetime.now()
+        rows = self.conn.execute(
+            f"SELECT {_select('t', TASK_COLUMNS)} FROM tasks t "
+            f"WHERE t.status IN ('pending', 'active') AND t.deadline >= ? AND t.deadline < ? ORDER BY t.deadline",
+            (iso_timestamp(now), iso_timestamp(now + timedelta(hours=hours))),
+        )
+        return [_task(_row_values(row, "t", TASK_COLUMNS)) for row in rows]
+
+    # Reminder methods
+    async def create_reminder(self, insert_reminder: ReminderCreate) -> Reminder:
+        values = {
+            "id": str(uuid.uuid4()), "task_id": insert_reminder.task_id, "message": insert_reminder.message,
+            "delivery_method": insert_reminder.delivery_method, "status": "pending",
+            "scheduled_for": iso_timestamp(insert_reminder.scheduled_for), "sent_at": None, "created_at": iso_timestamp(datetime.now()),
+        }
+        with self.conn:
+            self.conn.execute(
+                f"INSERT INTO reminders ({', '.join(REMINDER_COLUMNS)}) VALUES ({', '.join('?' * len(REMINDER_COLUMNS))})",
+                [values[column] for column in REMINDER_COLUMNS],
+            )
+        return _reminder(values)
+
+    async def get_reminders(self, after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None, raw: bool = False) -> List[Union[Reminder, dict]]:
+        page_clause, params = self._page_clause("reminders", after, limit)
+        rows = self.conn.execute(f"SELECT {_select('reminders', REMINDER_COLUMNS)} FROM reminders {page_clause}", params)
+        reminders = [_reminder(_row_values(row, "reminders", REMINDER_COLUMNS)) for row in rows]
+        fields = fields or (_model_fields(Reminder) if raw else None)
+        if fields:
+            return [_project(reminder, fields) for reminder in reminders]
+        return reminders
+
+    async def get_upcoming_reminders(self) -> List[Reminder]:
+        rows = self.conn.execute(
+            f"SELECT {_select('r', REMINDER_COLUMNS)} FROM reminders r "
+            f"WHERE r.status = 'pending' AND r.scheduled_for > ? ORDER BY r.scheduled_for",
+            (iso_timestamp(datetime.now()),),
+        )
+        return [_reminder(_row_values(row, "r", REMINDER_COLUMNS)) for row in rows]
+
+    async def update_reminder_status(self, id: str, status: str) -> None:
+        with self.conn:
+            if status == "sent":
+                self.conn.execute("UPDATE reminders SET status = ?, sent_at = ? WHERE id = ?", (status, iso_timestamp(datetime.now()), id))
+            else:
+                self.conn.execute("UPDATE reminders SET status = ? WHERE id = ?", (status, id))
+
+    # Reminder dispatch
+    async def get_due_reminders(self, until: datetime, limit: Optional[int] = None) -> List[Reminder]:
+        rows = self.conn.execute(
+            f"SELECT {_select('r', REMINDER_COLUMNS)} FROM reminders r "
+            f"WHERE r.status = 'pending' AND r.scheduled_for <= ? ORDER BY r.scheduled_for LIMIT ?",
+            (iso_timestamp(until), limit if limit else -1),
+        )
+        return [_reminder(_row_values(row, "r", REMINDER_COLUMNS)) for row in rows]
+
+    async def claim_reminder(self, id: str, now: Optional[datetime] = None) -> Optional[Reminder]:
+        # The status guard makes the claim atomic across connections and processes
+        with self.conn:
+            claimed = self.conn.execute(
+                "UPDATE reminders SET status = 'sending', claimed_at = ? WHERE id = ? AND status = 'pending'",
+                (iso_timestamp(now or datetime.now()), id),
+            ).rowcount
+            if not claimed: return None
+            row = self.conn.execute(f"SELECT {_select('r', REMINDER_COLUMNS)} FROM reminders r WHERE r.id = ?", (id,)).fetchone()
+        return _reminder(_row_values(row, "r", REMINDER_COLUMNS))
+
+    async def release_stale_reminder_claims(self, claimed_before: datetime) -> int:
+        with self.conn:
+            return self.conn.execute(
+                "UPDATE reminders SET status = 'pending', claimed_at = NULL WHERE status = 'sending' AND claimed_at < ?",
+                (iso_timestamp(claimed_before),),
+            ).rowcount
+
+    # Dashboard
+    async def get_dashboard_stats(self, now: Optional[datetime] = None) -> Dict[str, object]:
+        now = now or datetime.now()
+        week_start, month_start = _period_starts(now)
+        # Task counts come from the rollups, so no task row is read
+        row = self.conn.execute(
+            "SELECT o.*, "
+            "(SELECT COUNT(*) FROM reminders WHERE status = 'pending' AND scheduled_for > ?) AS upcoming_reminders, "
+            "a.completed AS completed_tasks, w.created AS weekly_total, w.completed AS weekly_completed, "
+            "m.created AS monthly_total, m.completed AS monthly_completed "
+            "FROM (SELECT SUM(lower(coalesce(status, '')) = 'active') AS active_okrs, "
+            "SUM(progress) AS progress_sum, COUNT(progress) AS progress_count FROM okrs) o "
+            "LEFT JOIN task_rollups a ON a.id = ? LEFT JOIN task_rollups w ON w.id = ? LEFT JOIN task_rollups m ON m.id = ?",
+            (iso_timestamp(now), _rollup_id("all", None), _rollup_id("week", week_start), _rollup_id("month", month_start)),
+        ).fetchone()
+        return _dashboard_stats(dict(row))
+
+    async def get_task_rollups(self, period: str, since: Optional[datetime] = None) -> List[dict]:
+        where, params = "WHERE period = ?", [period]
+        if since is not None and period != "all":
+            where += " AND start >= ?"
+            params.append(iso_timestamp(since))
+        rows = self.conn.execute(f"SELECT period, start, created, completed FROM task_rollups {where} ORDER BY start", params)
+        return [{**dict(row), "start": datetime.fromisoformat(row["start"]) if row["start"] else None} for row in rows]
+
+    # Maintenance
+    async def reconcile_okr_counters(self) -> None:
+        with self.conn:
+            self.conn.execute(
+                "UPDATE okrs SET "
+                "total_tasks = (SELECT COUNT(*) FROM tasks WHERE tasks.okr_id = okrs.id), "
+                "completed_tasks = (SELECT COUNT(*) FROM tasks WHERE tasks.okr_id = okrs.id AND tasks.status = 'completed')"
+            )
+            self.conn.execute("UPDATE okrs SET progress = progress(completed_tasks, total_tasks)")
+
+    async def rebuild_task_rollups(self) -> None:
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            rows = self.conn.execute("SELECT created_at, status FROM tasks")
+            deltas = _rollup_deltas([(datetime.fromisoformat(row["created_at"]), 1, int(row["status"] == "completed")) for row in rows])
+            self.conn.execute("DELETE FROM task_rollups")
+            self._inc_rollups(deltas)
+
+    # Lifecycle
+    async def ping(self) -> None:
+        self.conn.execute("SELECT 1")
+
+    async def close(self) -> None:
+        self.conn.close()
@@ -1,18 +1,185 @@
-from typing import List, Optional, Dict, Union
-from datetime import datetime
+from typing import List, Optional, Dict, Union, Tuple, Callable, Awaitable, TypeVar
+from datetime import datetime, timedelta
+from collections import Counter, defaultdict
+import heapq
+import bisect
 from shared.schemas import Okr, OkrCreate, Task, TaskCreate, TaskUpdate, Reminder, ReminderCreate, OkrWithTasks, TaskWithReminders, TaskStatus
 import uuid
 import os
+from itertools import islice
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.client_session import ClientSession
 from pymongo.database import Database
+from pymongo.asynchronous.client_session import AsyncClientSession
+from pymongo.asynchronous.database import AsyncDatabase
 from bson import ObjectId
-from mongo_clients import db, okr_collection, task_collection, reminder_collection # Import existing MongoDB client and collections
+from round_trips import counts_round_trips
+from mongo_clients import get_db, get_async_db, OKR_COLLECTION_NAME, REMINDER_COLLECTION_NAME, ROLLUP_COLLECTION_NAME # Clients are created lazily on first use
+
+def _to_task_status(status: Union[str, TaskStatus]) -> TaskStatus:
+    if isinstance(status, TaskStatus):
+        return status
+    # Convert string status to TaskStatus enum
+    if status.lower() == "completed":
+        return TaskStatus.COMPLETED
+    elif status.lower() == "pending":
+        return TaskStatus.PENDING
+    elif status.lower() == "active":
+        return TaskStatus.ACTIVE
+    # Handle unknown string status, perhaps raise an error or log a warning
+    print(f"WARNING: Unknown task status string: {status}")
+    return TaskStatus.PENDING # Default to pending
+
+def _keyset_filter(after: Optional[str]) -> dict:
+    # ObjectIds increase with insertion time, so "_id > after" is a stable page cursor.
+    # Like an unknown id on the other backends, a non-ObjectId cursor matches nothing
+    if not after:
+        return {}
+    return {"_id": {"$gt": ObjectId(after)}} if ObjectId.is_valid(after) else {"_id": {"$in": []}}
+
+def _projection(fields: Optional[List[str]]) -> Optional[dict]:
+    return {field: 1 for field in fields} if fields else None
+
+def _stringify_id(doc: dict) -> dict:
+    doc["_id"] = str(doc["_id"])
+    return doc
+
+def _page(items: dict, after: Optional[str], limit: Optional[int]) -> list:
+    # Keyset pagination over an insertion-ordered dict: skip up to and
+    # including `after`, then take `limit` values
+    entries = iter(items.items())
+    if after:
+        for key, _ in entries:
+            if key == after:
+                break
+    return [value for _, value in islice(entries, limit)]
+
+def _model_fields(model) -> List[str]:
+    # Every field of a model under the name it is stored (and served) as
+    return [field.alias or name for name, field in model.model_fields.items()]
+
+def _project(model, fields: List[str]) -> dict:
+    doc = model.model_dump(by_alias=True)
+    return {"_id": doc["_id"], **{field: doc[field] for field in fields if field in doc}}
+
+def _progress(completed_tasks: int, total_tasks: int) -> int:
+    return round(completed_tasks * 100 / total_tasks) if total_tasks else 0
+
+# Same rounding as _progress: $round and round() both round half to even
+_PROGRESS_EXPR = {"$cond": [
+    {"$gt": ["$totalTasks", 0]},
+    {"$toInt": {"$round": [{"$multiply": [{"$divide": ["$completedTasks", "$totalTasks"]}, 100]}, 0]}},
+    0,
+]}
+
+def _period_starts(now: datetime) -> Tuple[datetime, datetime]:
+    # Dashboard windows: this week from Monday 00:00, this month from the 1st 00:00
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return today - timedelta(days=today.weekday()), today.replace(day=1)
+
+RollupKey = Tuple[str, Optional[datetime]]
+T = TypeVar("T")
+
+def _rollup_keys(created_at: Optional[datetime]) -> List[RollupKey]:
+    # The buckets a task counts toward: the day, week (from Monday) and month
+    # it was created in, plus the all-time totals
+    if created_at is None: return [("all", None)]
+    week_start, month_start = _period_starts(created_at)
+    return [("day", created_at.replace(hour=0, minute=0, second=0, microsecond=0)), ("week", week_start), ("month", month_start), ("all", None)]
+
+def _rollup_id(period: str, start: Optional[datetime]) -> str:
+    return f"{period}:{start:%Y-%m-%d}" if start is not None else period
+
+def _rollup_deltas(changes: List[Tuple[Optional[datetime], int, int]]) -> Dict[RollupKey, Tuple[int, int]]:
+    # (task createdAt, created delta, completed delta) per changed task ->
+    # (created, completed) deltas per rollup bucket
+    deltas: Dict[RollupKey, Tuple[int, int]] = {}
+    for created_at, created_delta, completed_delta in changes:
+        if created_delta == 0 and completed_delta == 0:
+            continue
+        for key in _rollup_keys(created_at):
+            created, completed = deltas.get(key, (0, 0))
+            deltas[key] = (created + created_delta, completed + completed_delta)
+    return deltas
+
+def _rollup_ops(deltas: Dict[RollupKey, Tuple[int, int]]) -> List[UpdateOne]:
+    return [
+        UpdateOne(
+            {"_id": _rollup_id(period, start)},
+            {"$inc": {"created": created_delta, "completed": completed_delta}, "$setOnInsert": {"period": period, "start": start}},
+            upsert=True,
+        )
+        for (period, start), (created_delta, completed_delta) in deltas.items()
+    ]
+
+def _rollup_counts(rollups: Dict[str, dict], now: datetime) -> Dict[str, int]:
+    # Dashboard task counts from this week's, this month's and the all-time buckets
+    week_start, month_start = _period_starts(now)
+    week = rollups.get(_rollup_id("week", week_start)) or {}
+    month = rollups.get(_rollup_id("month", month_start)) or {}
+    total = rollups.get(_rollup_id("all", None)) or {}
+    return {
+        "completed_tasks": total.get("completed", 0),
+        "weekly_total": week.get("created", 0),
+        "weekly_completed": week.get("completed", 0),
+        "monthly_total": month.get("created", 0),
+        "monthly_completed": month.get("completed", 0),
+    }
+
+def _percentage(part: int, whole: int) -> int:
+    return round(part / whole * 100) if whole else 0
+
+def _dashboard_stats(counts: Dict[str, int]) -> Dict[str, object]:
+    # Shapes the per-backend counts into the /dashboard/stats response
+    count = lambda key: counts.get(key) or 0
+    return {
+        "activeOkrs": count("active_okrs"),
+        "completedTasks": count("completed_tasks"),
+        "overallProgress": round(count("progress_sum") / count("progress_count")) if count("progress_count") else 0,
+        "weeklyProgress": {
+            "completed": count("weekly_completed"),
+            "total": count("weekly_total"),
+            "percentage": _percentage(count("weekly_completed"), count("weekly_total")),
+        },
+        "monthlyProgress": {
+            "completed": count("monthly_completed"),
+            "total": count("monthly_total"),
+            "percentage": _percentage(count("monthly_completed"), count("monthly_total")),
+        },
+        "upcomingReminders": count("upcoming_reminders"),
+    }
+
+def _completed_delta(old_status: Optional[str], new_status: Optional[str]) -> int:
+    if new_status is None: return 0
+    return int(new_status == "completed") - int(old_status == "completed")
+
+def _okr_counter_ops(deltas: Dict[str, Tuple[int, int]]) -> List[UpdateOne]:
+    # okr id -> (total_tasks delta, completed_tasks delta), applied with an
+    # update pipeline so the counters and progress change in one atomic write
+    ops = []
+    for okr_id, (total_delta, completed_delta) in deltas.items():
+        if not ObjectId.is_valid(okr_id) or (total_delta == 0 and completed_delta == 0):
+            continue
+        ops.append(UpdateOne({"_id": ObjectId(okr_id)}, [
+            {"$set": {
+                "totalTasks": {"$add": [{"$ifNull": ["$totalTasks", 0]}, total_delta]},
+                "completedTasks": {"$add": [{"$ifNull": ["$completedTasks", 0]}, completed_delta]},
+                "updated_at": datetime.now(),
+            }},
+            {"$set": {"progress": _PROGRESS_EXPR}},
+        ]))
+    return ops
 
 class IStorage:
     # OKR methods
     async def create_okr(self, okr: OkrCreate) -> Okr:
         pass
 
-    async def get_okrs(self) -> List[OkrWithTasks]:
+    # List methods take a keyset cursor (`after` = last id of the previous
+    # page) and a page size. With `fields`, they return the projected
+    # documents as plain dicts instead of models; `raw` does the same with
+    # every model field, so trusted reads can skip Pydantic entirely.
+    async def get_okrs(self, after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None, raw: bool = False) -> List[Union[OkrWithTasks, dict]]:
         pass
 
     async def get_okr(self, id: str) -> Optional[OkrWithTasks]:
@@ -28,7 +195,10 @@ class IStorage:
     async def create_task(self, task: TaskCreate) -> Task:
         pass
 
-    async def get_tasks(self) -> List[Task]:
+    async def create_tasks_bulk(self, tasks: List[TaskCreate]) -> List[Task]:
+        pass
+
+    async def get_tasks(self, after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None, raw: bool = False) -> List[Union[Task, dict]]:
         pass
 
     async def get_tasks_by_okr(self, okr_id: str) -> List[Task]:
@@ -45,12 +215,16 @@ class IStorage:
 
     async def complete_task(self, id: str, proof_url: Optional[str] = None) -> Optional[Task]:
         pass
+
+    async def get_tasks_due_within(self, hours: float) -> List[Task]:
+        """Open (not completed) tasks whose deadline falls in the next `hours` hours, soonest first."""
+        pass
     
     # Reminder methods
     async def create_reminder(self, reminder: ReminderCreate) -> Reminder:
         pass
 
-    async def get_reminders(self) -> List[Reminder]:
+    async def get_reminders(self, after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None, raw: bool = False) -> List[Union[Reminder, dict]]:
         pass
 
     async def get_upcoming_reminders(self) -> List[Reminder]:
@@ -59,11 +233,120 @@ class IStorage:
     async def update_reminder_status(self, id: str, status: str) -> None:
         pass
 
+    # Reminder dispatch (see reminder_dispatcher.py)
+    async def get_due_reminders(self, until: datetime, limit: Optional[int] = None) -> List[Reminder]:
+        """Pending reminders scheduled at or before `until`, soonest first."""
+        pass
+
+    async def claim_reminder(self, id: str, now: Optional[datetime] = None) -> Optional[Reminder]:
+        """Atomically move a pending reminder to "sending" and return it, or
+        None if it is gone or another worker claimed it first."""
+        pass
+
+    async def release_stale_reminder_claims(self, claimed_before: datetime) -> int:
+        """Put reminders claimed before `claimed_before` and never marked sent
+        back to pending, and return how many there were."""
+        pass
+
+    # Batched writes
+    async def apply_status_updates(self, task_statuses: Dict[str, TaskStatus], okr_statuses: Dict[str, str]) -> None:
+        """Apply many coalesced status changes at once (see WriteBehindStorage).
+
+        The default replays them one call at a time; backends with a bulk
+        write path override it.
+        """
+        for task_id, status in task_statuses.items():
+            await self.update_task_status(task_id, status)
+        for okr_id, status in okr_statuses.items():
+            await self.update_okr_status(okr_id, status)
+
+    # Dashboard
+    async def get_dashboard_stats(self, now: Optional[datetime] = None) -> Dict[str, object]:
+        """Active OKRs, completed tasks, mean progress, this week's and this month's
+        task completion and the upcoming reminder count, in one backend call."""
+        pass
+
+    async def get_task_rollups(self, period: str, since: Optional[datetime] = None) -> List[dict]:
+        """Created/completed task counts per "day", "week", "month" (or "all")
+        bucket starting at or after `since`, oldest first. A task counts toward
+        the buckets it was created in, whenever it is completed."""
+        pass
+
+    # Maintenance
+    async def reconcile_okr_counters(self) -> None:
+        """Rebuild every OKR's completedTasks/totalTasks/progress from its tasks."""
+        pass
+
+    async def rebuild_task_rollups(self) -> None:
+        """Recompute every task rollup bucket from the tasks (backfill, drift repair)."""
+        pass
+
+    # Lifecycle
+    async def ping(self) -> None:
+        """Raise if the backend can't serve requests right now (used by /api/health/ready)."""
+        pass
+
+    async def close(self) -> None:
+        pass
+
 class MemStorage(IStorage):
     def __init__(self):
         self.okrs: Dict[str, Okr] = {}
         self.tasks: Dict[str, Task] = {}
         self.reminders: Dict[str, Reminder] = {}
+        # Secondary indexes, kept in step by every mutation below
+        self.task_ids_by_okr: Dict[str, List[str]] = defaultdict(list)
+        self.reminder_ids_by_task: Dict[str, List[str]] = defaultdict(list)
+        # Min-heap of (scheduled_for, reminder id) for pending reminders. Entries
+        # whose reminder has left "pending" are dropped lazily when they reach the top.
+        self.pending_reminders: List[Tuple[datetime, str]] = []
+        self.pending_reminder_count = 0
+        # (deadline, task id) kept sorted, for deadline range queries
+        self.task_deadlines: List[Tuple[datetime, str]] = []
+        # Rollup id -> {period, start, created, completed}, see get_task_rollups
+        self.task_rollups: Dict[str, dict] = {}
+        # Reminder id -> when a dispatcher claimed it, while it is "sending"
+        self.reminder_claims: Dict[str, datetime] = {}
+
+    def _inc_okr_counters(self, okr_id: str, total_delta: int = 0, completed_delta: int = 0) -> None:
+        okr = self.okrs.get(okr_id)
+        if okr and (total_delta or completed_delta):
+            okr.total_tasks += total_delta
+            okr.completed_tasks += completed_delta
+            okr.progress = _progress(okr.completed_tasks, okr.total_tasks)
+            okr.updated_at = datetime.now()
+
+    def _inc_rollups(self, deltas: Dict[RollupKey, Tuple[int, int]]) -> None:
+        for (period, start), (created_delta, completed_delta) in deltas.items():
+            rollup = self.task_rollups.setdefault(_rollup_id(period, start), {"period": period, "start": start, "created": 0, "completed": 0})
+            rollup["created"] += created_delta
+            rollup["completed"] += completed_delta
+
+    def _tasks_for_okr(self, okr_id: str) -> List[Task]:
+        return [self.tasks[task_id] for task_id in self.task_ids_by_okr.get(okr_id, ())]
+
+    def _is_live_reminder_entry(self, scheduled_for: datetime, reminder_id: str) -> bool:
+        reminder = self.reminders[reminder_id]
+        return reminder.status == "pending" and reminder.scheduled_for == scheduled_for
+
+    def _due_reminder_entries(self, until: datetime, limit: Optional[int] = None) -> List[Tuple[datetime, str]]:
+        # Pop entries due by `until` in order, up to `limit` live ones, and push
+        # the live ones back. Stale entries are dropped, and so are duplicates (a
+        # reminder set back to pending is pushed again). Costs O(k log n) for the
+        # k entries popped, however many reminders are pending in all.
+        heap, live, seen = self.pending_reminders, [], set()
+        while heap and heap[0][0] <= until and (not limit or len(live) < limit):
+            scheduled_for, reminder_id = heapq.heappop(heap)
+            if self._is_live_reminder_entry(scheduled_for, reminder_id) and reminder_id not in seen:
+                seen.add(reminder_id)
+                live.append((scheduled_for, reminder_id))
+        for entry in live:
+            heapq.heappush(heap, entry)
+        return live
+
+    def _set_reminder_status(self, reminder: Reminder, status: str) -> None:
+        self.pending_reminder_count += (status == "pending") - (reminder.status == "pending")
+        reminder.status = status
 
     async def create_okr(self, insert_okr: OkrCreate) -> Okr:
         id = str(uuid.uuid4())
@@ -80,36 +363,29 @@ class MemStorage(IStorage):
         self.okrs[id] = okr
         return okr
 
-    async def get_okrs(self) -> List[OkrWithTasks]:
+    async def get_okrs(self, after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None, raw: bool = False) -> List[Union[OkrWithTasks, dict]]:
+        fields = fields or (_model_fields(OkrWithTasks) if raw else None)
         okrs_with_tasks: List[OkrWithTasks] = []
         
-        for okr in self.okrs.values():
-            tasks = [task for task in self.tasks.values() if task.okr_id == okr.id]
-            completed_tasks = len([task for task in tasks if task.status == "completed"])
-            
+        for okr in _page(self.okrs, after, limit):
             okrs_with_tasks.append(
                 OkrWithTasks(
                     **okr.model_dump(),
-                    tasks=tasks,
-                    completed_tasks=completed_tasks,
-                    total_tasks=len(tasks),
+                    tasks=self._tasks_for_okr(okr.id),
                 )
             )
         
+        if fields:
+            return [_project(okr, fields) for okr in okrs_with_tasks]
         return okrs_with_tasks
 
     async def get_okr(self, id: str) -> Optional[OkrWithTasks]:
         okr = self.okrs.get(id)
         if not okr: return None
         
-        tasks = [task for task in self.tasks.values() if task.okr_id == id]
-        completed_tasks = len([task for task in tasks if task.status == "completed"])
-        
         return OkrWithTasks(
             **okr.model_dump(),
-            tasks=tasks,
-            completed_tasks=completed_tasks,
-            total_tasks=len(tasks),
+            tasks=self._tasks_for_okr(id),
         )
 
     async def update_okr_progress(self, id: str, progress: int) -> None:
@@ -141,19 +417,52 @@ class MemStorage(IStorage):
             createdAt=datetime.now(),
         )
         self.tasks[id] = task
+        self.task_ids_by_okr[task.okr_id].append(id)
+        bisect.insort(self.task_deadlines, (task.deadline, id))
+        self._inc_okr_counters(task.okr_id, total_delta=1)
+        self._inc_rollups(_rollup_deltas([(task.created_at, 1, 0)]))
         return task
 
-    async def get_tasks(self) -> List[Task]:
-        return list(self.tasks.values())
+    async def create_tasks_bulk(self, insert_tasks: List[TaskCreate]) -> List[Task]:
+        now = datetime.now()
+        batch = {}
+        for insert_task in insert_tasks:
+            id = str(uuid.uuid4())
+            batch[id] = Task(
+                id=id,
+                okrId=insert_task.okr_id,
+                title=insert_task.title,
+                description=insert_task.description,
+                deadline=insert_task.deadline,
+                status="pending",
+                micro_status=TaskStatus.PENDING,
+                completedAt=None,
+                proofUrl=None,
+                createdAt=now,
+            )
+        self.tasks.update(batch)
+        for id, task in batch.items():
+            self.task_ids_by_okr[task.okr_id].append(id)
+            bisect.insort(self.task_deadlines, (task.deadline, id))
+            self._inc_okr_counters(task.okr_id, total_delta=1)
+        self._inc_rollups(_rollup_deltas([(now, len(batch), 0)]))
+        return list(batch.values())
+
+    async def get_tasks(self, after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None, raw: bool = False) -> List[Union[Task, dict]]:
+        tasks = _page(self.tasks, after, limit)
+        fields = fields or (_model_fields(Task) if raw else None)
+        if fields:
+            return [_project(task, fields) for task in tasks]
+        return tasks
 
     async def get_tasks_by_okr(self, okr_id: str) -> List[Task]:
-        return [task for task in self.tasks.values() if task.okr_id == okr_id]
+        return self._tasks_for_okr(okr_id)
 
     async def get_task(self, id: str) -> Optional[TaskWithReminders]:
         task = self.tasks.get(id)
         if not task: return None
         
-        reminders = [reminder for reminder in self.reminders.values() if reminder.task_id == id]
+        reminders = [self.reminders[reminder_id] for reminder_id in self.reminder_ids_by_task.get(id, ())]
         
         return TaskWithReminders(
             **task.model_dump(),
@@ -164,10 +473,17 @@ class MemStorage(IStorage):
         task = self.tasks.get(id)
         if not task: return None
 
+        completed_delta = _completed_delta(task.status, updates.status)
         updated = False
         if updates.title is not None: task.title = updates.title; updated = True
         if updates.description is not None: task.description = updates.description; updated = True
-        if updates.deadline is not None: task.deadline = updates.deadline; updated = True
+        if updates.deadline is not None:
+            index = bisect.bisect_left(self.task_deadlines, (task.deadline, id))
+            if index < len(self.task_deadlines) and self.task_deadlines[index] == (task.deadline, id):
+                del self.task_deadlines[index]
+            task.deadline = updates.deadline
+            bisect.insort(self.task_deadlines, (task.deadline, id))
+            updated = True
         if updates.status is not None: task.status = updates.status; updated = True
         if updates.micro_status is not None: task.micro_status = updates.micro_status; updated = True
         if updates.completed_at is not None: task.completed_at = updates.completed_at; updated = True
@@ -175,26 +491,17 @@ class MemStorage(IStorage):
 
         if updated:
             self.tasks[id] = task
+        self._inc_okr_counters(task.okr_id, completed_delta=completed_delta)
+        self._inc_rollups(_rollup_deltas([(task.created_at, 0, completed_delta)]))
         return task
 
     async def update_task_status(self, task_id: str, status: Union[str, TaskStatus]) -> None:
         task = self.tasks.get(task_id)
         if task:
-            if isinstance(status, str):
-                # Convert string status to TaskStatus enum
-                if status.lower() == "completed":
-                    status_enum = TaskStatus.COMPLETED
-                elif status.lower() == "pending":
-                    status_enum = TaskStatus.PENDING
-                elif status.lower() == "active":
-                    status_enum = TaskStatus.ACTIVE
-                else:
-                    # Handle unknown string status, perhaps raise an error or log a warning
-                    print(f"WARNING: Unknown task status string: {status}")
-                    status_enum = TaskStatus.PENDING # Default to pending
-            else:
-                status_enum = status
-            
+            status_enum = _to_task_status(status)
+            completed_delta = _completed_delta(task.status, status_enum.value)
+            self._inc_okr_counters(task.okr_id, completed_delta=completed_delta)
+            self._inc_rollups(_rollup_deltas([(task.created_at, 0, completed_delta)]))
             task.status = status_enum.value
             task.micro_status = status_enum
             task.updated_at = datetime.now()
@@ -204,6 +511,9 @@ class MemStorage(IStorage):
         task = self.tasks.get(id)
         if not task: return None
 
+        completed_delta = _completed_delta(task.status, "completed")
+        self._inc_okr_counters(task.okr_id, completed_delta=completed_delta)
+        self._inc_rollups(_rollup_deltas([(task.created_at, 0, completed_delta)]))
         task.status = "completed"
         task.micro_status = TaskStatus.COMPLETED
         task.completed_at = datetime.now()
@@ -211,6 +521,13 @@ class MemStorage(IStorage):
         self.tasks[id] = task
         return task
 
+    async def get_tasks_due_within(self, hours: float) -> List[Task]:
+        now = datetime.now()
+        start = bisect.bisect_left(self.task_deadlines, (now,))
+        end = bisect.bisect_left(self.task_deadlines, (now + timedelta(hours=hours),))
+        tasks = [self.tasks[task_id] for _, task_id in self.task_deadlines[start:end]]
+        return [task for task in tasks if task.status != "completed"]
+
     async def create_reminder(self, insert_reminder: ReminderCreate) -> Reminder:
         id = str(uuid.uuid4())
         reminder = Reminder(
@@ -224,93 +541,227 @@ class MemStorage(IStorage):
             createdAt=datetime.now(),
         )
         self.reminders[id] = reminder
+        self.reminder_ids_by_task[reminder.task_id].append(id)
+        heapq.heappush(self.pending_reminders, (reminder.scheduled_for, id))
+        self.pending_reminder_count += 1
         return reminder
 
-    async def get_reminders(self) -> List[Reminder]:
-        return list(self.reminders.values())
+    async def get_reminders(self, after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None, raw: bool = False) -> List[Union[Reminder, dict]]:
+        reminders = _page(self.reminders, after, limit)
+        fields = fields or (_model_fields(Reminder) if raw else None)
+        if fields:
+            return [_project(reminder, fields) for reminder in reminders]
+        return reminders
 
     async def get_upcoming_reminders(self) -> List[Reminder]:
+        # Every pending reminder not yet due: one pass over the heap, sorting only those
         now = datetime.now()
-        return [r for r in self.reminders.values() if r.status == "pending" and r.scheduled_for > now]
+        upcoming = {
+            reminder_id: scheduled_for for scheduled_for, reminder_id in self.pending_reminders
+            if scheduled_for > now and self._is_live_reminder_entry(scheduled_for, reminder_id)
+        }
+        return [self.reminders[reminder_id] for reminder_id in sorted(upcoming, key=upcoming.get)]
 
     async def update_reminder_status(self, id: str, status: str) -> None:
         reminder = self.reminders.get(id)
         if reminder:
-            reminder.status = status
+            if status == "pending" and reminder.status != "pending":
+                heapq.heappush(self.pending_reminders, (reminder.scheduled_for, id))
+            self._set_reminder_status(reminder, status)
             if status == "sent":
                 reminder.sent_at = datetime.now()
+            if status != "sending":
+                self.reminder_claims.pop(id, None)
             self.reminders[id] = reminder
 
+    async def get_due_reminders(self, until: datetime, limit: Optional[int] = None) -> List[Reminder]:
+        return [self.reminders[reminder_id] for _, reminder_id in self._due_reminder_entries(until, limit)]
+
+    async def claim_reminder(self, id: str, now: Optional[datetime] = None) -> Optional[Reminder]:
+        reminder = self.reminders.get(id)
+        if not reminder or reminder.status != "pending": return None
+        self._set_reminder_status(reminder, "sending")
+        self.reminder_claims[id] = now or datetime.now()
+        return reminder
+
+    async def release_stale_reminder_claims(self, claimed_before: datetime) -> int:
+        stale = [reminder_id for reminder_id, claimed_at in self.reminder_claims.items() if claimed_at < claimed_before]
+        for reminder_id in stale:
+            await self.update_reminder_status(reminder_id, "pending")
+        return len(stale)
+
+    async def get_dashboard_stats(self, now: Optional[datetime] = None) -> Dict[str, object]:
+        # One pass over the OKRs; task counts come from the rollups, and
+        # upcoming reminders are the pending ones less those already due
+        now = now or datetime.now()
+        counts = Counter(_rollup_counts(self.task_rollups, now))
+        for okr in self.okrs.values():
+            counts["active_okrs"] += (okr.status or "").lower() == "active"
+            if isinstance(okr.progress, (int, float)):
+                counts["progress_sum"] += okr.progress
+                counts["progress_count"] += 1
+        counts["upcoming_reminders"] = self.pending_reminder_count - len(self._due_reminder_entries(now))
+        return _dashboard_stats(counts)
+
+    async def get_task_rollups(self, period: str, since: Optional[datetime] = None) -> List[dict]:
+        rollups = [
+            dict(rollup) for rollup in self.task_rollups.values()
+            if rollup["period"] == period and (since is None or rollup["start"] is None or rollup["start"] >= since)
+        ]
+        return sorted(rollups, key=lambda rollup: rollup["start"] or datetime.min)
+
+    async def reconcile_okr_counters(self) -> None:
+        for okr in self.okrs.values():
+            tasks = self._tasks_for_okr(okr.id)
+            okr.total_tasks = len(tasks)
+            okr.completed_tasks = len([task for task in tasks if task.status == "completed"])
+            okr.progress = _progress(okr.completed_tasks, okr.total_tasks)
+
+    async def rebuild_task_rollups(self) -> None:
+        self.task_rollups = {}
+        self._inc_rollups(_rollup_deltas([(task.created_at, 1, int(task.status == "completed")) for task in self.tasks.values()]))
+
 class MongoStorage(IStorage):
-    def __init__(self):
-        # Use the global db and collections imported from mongo_clients.py
-        self.db = db
+    """Every query, pipeline and update document lives here once; the driver
+    calls go through _io and _in_transaction, the methods AsyncMongoStorage
+    overrides.
+
+    create_okr, create_reminder, claim_reminder and update_reminder_status
+    are one round trip each, as is update_task when the status doesn't
+    change. A task write that can move the counters (create_task,
+    create_tasks_bulk, update_task_status, complete_task, update_task with a
+    status) is three, however many tasks it covers: the tasks, the OKR
+    counters and the rollups. On replica sets and sharded clusters they are
+    committed together in one transaction, which adds the commit as a fourth.
+    A standalone server has no transactions: there the counters and rollups
+    are written after the task and drift if the process dies in between,
+    until reconcile_counters.py and backfill_rollups.py are run.
+    tests/test_round_trips.py checks these counts."""
+
+    def __init__(self, database: Optional[Database] = None):
+        # Use the shared pooled client from mongo_clients.py unless a different
+        # database is passed in (e.g. by the benchmarks)
+        self.db = database if database is not None else get_db()
         self.okr_collection_mongo = self.db["okrs"] # For actual OKRs
-        self.task_collection_mongo = okr_collection # This is the user's 'micro_tasks' collection for tasks
-        self.reminder_collection_mongo = reminder_collection
+        self.task_collection_mongo = self.db[OKR_COLLECTION_NAME] # This is the user's 'micro_tasks' collection for tasks
+        self.reminder_collection_mongo = self.db[REMINDER_COLLECTION_NAME]
+        self.rollup_collection_mongo = self.db[ROLLUP_COLLECTION_NAME]
+        self._transactions: Optional[bool] = None # Whether the server supports them; asked once
+
+    # Driver I/O
+    async def _io(self, result):
+        # The sync driver has already done the work by the time a call returns
+        return result
+
+    async def _to_list(self, cursor) -> List[dict]:
+        return await self._io(cursor.to_list())
+
+    async def _aggregate(self, collection, pipeline: List[dict]) -> List[dict]:
+        return await self._to_list(await self._io(collection.aggregate(pipeline)))
+
+    async def _supports_transactions(self) -> bool:
+        if self._transactions is None:
+            hello = await self._io(self.db.command("hello"))
+            # Replica set members report setName and mongos reports isdbgrid
+            self._transactions = "setName" in hello or hello.get("msg") == "isdbgrid"
+            if not self._transactions:
+                print("⚠️ MongoDB is a standalone server without transactions; OKR counters and rollups are written after each task write, not with it")
+        return self._transactions
 
+    async def _in_transaction(self, writes: Callable[[Optional[ClientSession]], Awaitable[T]]) -> T:
+        # writes(session) issues its driver calls with session=session
+        if not await self._supports_transactions():
+            return await writes(None)
+        with self.db.client.start_session() as session:
+            with session.start_transaction():
+                return await writes(session)
+
+    async def _inc_okr_counters(self, deltas: Dict[str, Tuple[int, int]], session: Optional[ClientSession] = None) -> None:
+        ops = _okr_counter_ops(deltas)
+        if ops:
+            await self._io(self.okr_collection_mongo.bulk_write(ops, ordered=False, session=session))
+
+    async def _inc_rollups(self, deltas: Dict[RollupKey, Tuple[int, int]], session: Optional[ClientSession] = None) -> None:
+        ops = _rollup_ops(deltas)
+        if ops:
+            await self._io(self.rollup_collection_mongo.bulk_write(ops, ordered=False, session=session))
+
+    @counts_round_trips
     async def create_okr(self, okr_data: OkrCreate) -> Okr:
         # MongoDB will generate _id automatically
         insert_data = okr_data.model_dump(by_alias=True, exclude_none=True)
         insert_data["status"] = "active"
         insert_data["progress"] = 0
+        insert_data["completedTasks"] = 0
+        insert_data["totalTasks"] = 0
         insert_data["created_at"] = datetime.now()
         insert_data["updated_at"] = datetime.now()
 
-        result = self.okr_collection_mongo.insert_one(insert_data)
-        new_okr = self.okr_collection_mongo.find_one({"_id": result.inserted_id})
-        return Okr.model_validate(new_okr)
+        # The inserted payload is already the stored document; no need to re-read it
+        result = await self._io(self.okr_collection_mongo.insert_one(insert_data))
+        insert_data["_id"] = str(result.inserted_id)
+        return Okr.model_validate(insert_data)
 
-    async def get_okrs(self) -> List[OkrWithTasks]:
-        okrs_with_tasks = []
-        for okr_doc in self.okr_collection_mongo.find():
-            okr = Okr.model_validate(okr_doc)
-            # Assuming tasks related to OKRs are in task_collection_mongo (micro_tasks)
-            tasks = []
-            for task_doc in self.task_collection_mongo.find({"okrId": okr.id}):
-                tasks.append(Task.model_validate(task_doc))
+    def _okr_with_tasks_pipeline(self, match: Optional[dict] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None) -> List[dict]:
+        # Join each OKR with its micro tasks so a list of OKRs costs one round
+        # trip instead of one find() per OKR. The task counters are stored on
+        # the OKR document itself.
+        pipeline = [{"$match": match}] if match else []
+        pipeline.append({"$sort": {"_id": 1}})
+        if limit:
+            # Cut the page before the $lookup so only its tasks are joined
+            pipeline.append({"$limit": limit})
+        if fields and "tasks" not in fields:
+            return pipeline + [{"$project": _projection(fields)}, {"$addFields": {"_id": {"$toString": "$_id"}}}]
+        pipeline += [
+            {"$lookup": {
+                "from": self.task_collection_mongo.name,
+                "let": {"okrId": {"$toString": "$_id"}},
+                "pipeline": [{"$match": {"$expr": {"$eq": ["$okrId", "$$okrId"]}}}],
+                "as": "tasks",
+            }},
+            {"$addFields": {
+                "_id": {"$toString": "$_id"},
+                "tasks": {"$map": {
+                    "input": "$tasks",
+                    "as": "task",
+                    "in": {"$mergeObjects": ["$$task", {"_id": {"$toString": "$$task._id"}}]},
+                }},
+            }},
+        ]
+        if fields:
+            pipeline.append({"$project": _projection(fields)})
+        return pipeline
 
-            completed_tasks = len([task for task in tasks if task.status == "completed"])
-            okrs_with_tasks.append(
-                OkrWithTasks(
-                    **okr.model_dump(),
-                    tasks=tasks,
-                    completed_tasks=completed_tasks,
-                    total_tasks=len(tasks),
-                )
-            )
-        return okrs_with_tasks
+    @counts_round_trips
+    async def get_okrs(self, after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None, raw: bool = False) -> List[Union[OkrWithTasks, dict]]:
+        # Raw reads are a projection onto the model's fields, served as-is
+        fields = fields or (_model_fields(OkrWithTasks) if raw else None)
+        okr_docs = await self._aggregate(self.okr_collection_mongo, self._okr_with_tasks_pipeline(_keyset_filter(after), limit, fields))
+        if fields:
+            return okr_docs
+        return [OkrWithTasks.model_validate(okr_doc) for okr_doc in okr_docs]
 
+    @counts_round_trips
     async def get_okr(self, id: str) -> Optional[OkrWithTasks]:
-        okr_doc = self.okr_collection_mongo.find_one({"_id": ObjectId(id)})
-        if not okr_doc: return None
-        okr = Okr.model_validate(okr_doc)
-
-        tasks = []
-        for task_doc in self.task_collection_mongo.find({"okrId": okr.id}):
-            tasks.append(Task.model_validate(task_doc))
-
-        completed_tasks = len([task for task in tasks if task.status == "completed"])
-        return OkrWithTasks(
-            **okr.model_dump(),
-            tasks=tasks,
-            completed_tasks=completed_tasks,
-            total_tasks=len(tasks),
-        )
+        okr_docs = await self._aggregate(self.okr_collection_mongo, self._okr_with_tasks_pipeline({"_id": ObjectId(id)}))
+        return OkrWithTasks.model_validate(okr_docs[0]) if okr_docs else None
 
+    @counts_round_trips
     async def update_okr_progress(self, id: str, progress: int) -> None:
-        self.okr_collection_mongo.update_one(
+        await self._io(self.okr_collection_mongo.update_one(
             {"_id": ObjectId(id)},
             {"$set": {"progress": progress, "updated_at": datetime.now()}}
-        )
+        ))
 
+    @counts_round_trips
     async def update_okr_status(self, okr_id: str, status: str) -> None:
-        self.okr_collection_mongo.update_one(
+        await self._io(self.okr_collection_mongo.update_one(
             {"_id": ObjectId(okr_id)},
             {"$set": {"status": status, "updated_at": datetime.now()}}
-        )
+        ))
 
-    async def create_task(self, insert_task: TaskCreate) -> Task:
+    def _task_insert_doc(self, insert_task: TaskCreate) -> dict:
         insert_data = insert_task.model_dump(by_alias=True, exclude_none=True)
         insert_data["status"] = "pending"
         insert_data["micro_status"] = TaskStatus.PENDING.value
@@ -318,79 +769,101 @@ class MongoStorage(IStorage):
         insert_data["proofUrl"] = None
         insert_data["createdAt"] = datetime.now()
         insert_data["updatedAt"] = datetime.now() # Add updatedAt for tasks
+        return insert_data
 
-        result = self.task_collection_mongo.insert_one(insert_data)
-        new_task = self.task_collection_mongo.find_one({"_id": result.inserted_id})
-        return Task.model_validate(new_task)
+    async def _insert_tasks(self, insert_tasks: List[TaskCreate]) -> List[Task]:
+        insert_docs = [self._task_insert_doc(insert_task) for insert_task in insert_tasks]
 
-    async def get_tasks(self) -> List[Task]:
-        tasks = []
-        for task_doc in self.task_collection_mongo.find():
-            tasks.append(Task.model_validate(task_doc))
-        return tasks
+        async def writes(session: Optional[ClientSession]):
+            result = await self._io(self.task_collection_mongo.insert_many(insert_docs, session=session))
+            await self._inc_okr_counters({okr_id: (count, 0) for okr_id, count in Counter(doc["okrId"] for doc in insert_docs).items()}, session)
+            await self._inc_rollups(_rollup_deltas([(doc["createdAt"], 1, 0) for doc in insert_docs]), session)
+            return result
+
+        # The inserted payloads are already the stored documents; no need to re-read them
+        result = await self._in_transaction(writes)
+        for insert_data, inserted_id in zip(insert_docs, result.inserted_ids):
+            insert_data["_id"] = str(inserted_id)
+        return [Task.model_validate(insert_data) for insert_data in insert_docs]
+
+    @counts_round_trips
+    async def create_task(self, insert_task: TaskCreate) -> Task:
+        return (await self._insert_tasks([insert_task]))[0]
+
+    @counts_round_trips
+    async def create_tasks_bulk(self, insert_tasks: List[TaskCreate]) -> List[Task]:
+        if not insert_tasks: return []
+        return await self._insert_tasks(insert_tasks)
+
+    @counts_round_trips
+    async def get_tasks(self, after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None, raw: bool = False) -> List[Union[Task, dict]]:
+        fields = fields or (_model_fields(Task) if raw else None)
+        task_docs = await self._to_list(self.task_collection_mongo.find(_keyset_filter(after), _projection(fields)).sort("_id", 1).limit(limit or 0))
+        if fields:
+            return [_stringify_id(task_doc) for task_doc in task_docs]
+        return [Task.model_validate(_stringify_id(task_doc)) for task_doc in task_docs]
 
+    @counts_round_trips
     async def get_tasks_by_okr(self, okr_id: str) -> List[Task]:
-        tasks = []
-        for task_doc in self.task_collection_mongo.find({"okrId": okr_id}):
-            tasks.append(Task.model_validate(task_doc))
-        return tasks
+        task_docs = await self._to_list(self.task_collection_mongo.find({"okrId": okr_id}))
+        return [Task.model_validate(_stringify_id(task_doc)) for task_doc in task_docs]
 
+    @counts_round_trips
     async def get_task(self, id: str) -> Optional[TaskWithReminders]:
-        task_doc = self.task_collection_mongo.find_one({"_id": ObjectId(id)})
+        task_doc = await self._io(self.task_collection_mongo.find_one({"_id": ObjectId(id)}))
         if not task_doc: return None
-        task = Task.model_validate(task_doc)
+        reminder_docs = await self._to_list(self.reminder_collection_mongo.find({"taskId": id}))
+        # Validate the task and its reminders in one pass, rather than
+        # validating a Task and then re-validating its dump
+        return TaskWithReminders.model_validate({**_stringify_id(task_doc), "reminders": [_stringify_id(reminder_doc) for reminder_doc in reminder_docs]})
 
-        reminders = []
-        for reminder_doc in self.reminder_collection_mongo.find({"taskId": task.id}):
-            reminders.append(Reminder.model_validate(reminder_doc))
-        
-        return TaskWithReminders(
-            **task.model_dump(),
-            reminders=reminders,
-        )
+    async def _update_task_doc(self, task_id: ObjectId, update_fields: dict, projection: Optional[dict] = None) -> Optional[dict]:
+        # The pre-image tells us whether the task's completion changed; the
+        # caller's post-image is the pre-image with update_fields applied
+        async def writes(session: Optional[ClientSession]) -> Optional[dict]:
+            task_doc = await self._io(self.task_collection_mongo.find_one_and_update(
+                {"_id": task_id},
+                {"$set": update_fields},
+                projection=projection,
+                return_document=ReturnDocument.BEFORE,
+                session=session,
+            ))
+            if task_doc:
+                completed_delta = _completed_delta(task_doc.get("status"), update_fields.get("status"))
+                await self._inc_okr_counters({task_doc.get("okrId", ""): (0, completed_delta)}, session)
+                await self._inc_rollups(_rollup_deltas([(task_doc.get("createdAt"), 0, completed_delta)]), session)
+            return task_doc
+
+        # Without a status change the counters and rollups can't move, so there is nothing to commit alongside the write
+        return await (self._in_transaction(writes) if "status" in update_fields else writes(None))
 
+    @counts_round_trips
     async def update_task(self, id: str, updates: TaskUpdate) -> Optional[Task]:
         update_fields = updates.model_dump(by_alias=True, exclude_none=True)
         if "micro_status" in update_fields: # Convert enum to value for storage
             update_fields["micro_status"] = update_fields["micro_status"].value
         update_fields["updatedAt"] = datetime.now() # Ensure updatedAt is updated
 
-        result = self.task_collection_mongo.update_one(
-            {"_id": ObjectId(id)},
-            {"$set": update_fields}
-        )
-        if result.modified_count == 0: return None
-        updated_task_doc = self.task_collection_mongo.find_one({"_id": ObjectId(id)})
-        return Task.model_validate(updated_task_doc)
+        task_doc = await self._update_task_doc(ObjectId(id), update_fields)
+        if not task_doc: return None
+        task_doc.update(update_fields)
+        return Task.model_validate(_stringify_id(task_doc))
 
+    @counts_round_trips
     async def update_task_status(self, task_id: str, status: Union[str, TaskStatus]) -> None:
         # Validate if task_id is a valid ObjectId string before proceeding
         if not ObjectId.is_valid(task_id):
             print(f"WARNING: Invalid ObjectId string for task_id: {task_id}. Cannot update task status.")
             return
 
-        if isinstance(status, str):
-            if status.lower() == "completed":
-                status_enum = TaskStatus.COMPLETED
-            elif status.lower() == "pending":
-                status_enum = TaskStatus.PENDING
-            elif status.lower() == "active":
-                status_enum = TaskStatus.ACTIVE
-            else:
-                print(f"WARNING: Unknown task status string: {status}")
-                status_enum = TaskStatus.PENDING # Default to pending
-        else:
-            status_enum = status
-        
-        self.task_collection_mongo.update_one(
-            {"_id": ObjectId(task_id)},
-            {"$set": {
-                "status": status_enum.value,
-                "micro_status": status_enum.value,
-                "updatedAt": datetime.now()
-            }}
+        status_enum = _to_task_status(status)
+        await self._update_task_doc(
+            ObjectId(task_id),
+            {"status": status_enum.value, "micro_status": status_enum.value, "updatedAt": datetime.now()},
+            projection={"okrId": 1, "status": 1, "createdAt": 1},
         )
 
+    @counts_round_trips
     async def complete_task(self, id: str, proof_url: Optional[str] = None) -> Optional[Task]:
         update_fields = {
             "status": "completed",
@@ -399,43 +872,280 @@ class MongoStorage(IStorage):
             "proofUrl": proof_url,
             "updatedAt": datetime.now()
         }
-        result = self.task_collection_mongo.update_one(
-            {"_id": ObjectId(id)},
-            {"$set": update_fields}
-        )
-        if result.modified_count == 0: return None
-        updated_task_doc = self.task_collection_mongo.find_one({"_id": ObjectId(id)})
-        return Task.model_validate(updated_task_doc)
+        task_doc = await self._update_task_doc(ObjectId(id), update_fields)
+        if not task_doc: return None
+        task_doc.update(update_fields)
+        return Task.model_validate(_stringify_id(task_doc))
+
+    def _due_within_query(self, hours: float) -> dict:
+        now = datetime.now()
+        return {"status": {"$in": ["pending", "active"]}, "deadline": {"$gte": now, "$lt": now + timedelta(hours=hours)}}
 
+    @counts_round_trips
+    async def get_tasks_due_within(self, hours: float) -> List[Task]:
+        task_docs = await self._to_list(self.task_collection_mongo.find(self._due_within_query(hours)).sort("deadline", 1))
+        return [Task.model_validate(_stringify_id(task_doc)) for task_doc in task_docs]
+
+    @counts_round_trips
     async def create_reminder(self, insert_reminder: ReminderCreate) -> Reminder:
         insert_data = insert_reminder.model_dump(by_alias=True, exclude_none=True)
         insert_data["status"] = "pending"
         insert_data["sentAt"] = None
         insert_data["createdAt"] = datetime.now()
 
-        result = self.reminder_collection_mongo.insert_one(insert_data)
-        new_reminder = self.reminder_collection_mongo.find_one({"_id": result.inserted_id})
-        return Reminder.model_validate(new_reminder)
+        # The inserted payload is already the stored document; no need to re-read it
+        result = await self._io(self.reminder_collection_mongo.insert_one(insert_data))
+        insert_data["_id"] = str(result.inserted_id)
+        return Reminder.model_validate(insert_data)
 
-    async def get_reminders(self) -> List[Reminder]:
-        reminders = []
-        for reminder_doc in self.reminder_collection_mongo.find():
-            reminders.append(Reminder.model_validate(reminder_doc))
-        return reminders
+    @counts_round_trips
+    async def get_reminders(self, after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None, raw: bool = False) -> List[Union[Reminder, dict]]:
+        fields = fields or (_model_fields(Reminder) if raw else None)
+        reminder_docs = await self._to_list(self.reminder_collection_mongo.find(_keyset_filter(after), _projection(fields)).sort("_id", 1).limit(limit or 0))
+        if fields:
+            return [_stringify_id(reminder_doc) for reminder_doc in reminder_docs]
+        return [Reminder.model_validate(_stringify_id(reminder_doc)) for reminder_doc in reminder_docs]
 
+    @counts_round_trips
     async def get_upcoming_reminders(self) -> List[Reminder]:
         now = datetime.now()
-        reminders = []
-        for reminder_doc in self.reminder_collection_mongo.find({"status": "pending", "scheduledFor": {"$gt": now.isoformat()}}): # Assuming scheduledFor is ISO string
-            reminders.append(Reminder.model_validate(reminder_doc))
-        return reminders
+        query = {"status": "pending", "scheduledFor": {"$gt": now}}
+        reminder_docs = await self._to_list(self.reminder_collection_mongo.find(query))
+        return [Reminder.model_validate(_stringify_id(reminder_doc)) for reminder_doc in reminder_docs]
 
+    @counts_round_trips
     async def update_reminder_status(self, id: str, status: str) -> None:
         update_fields = {"status": status}
         if status == "sent":
             update_fields["sentAt"] = datetime.now()
-        
-        self.reminder_collection_mongo.update_one(
+
+        await self._io(self.reminder_collection_mongo.update_one(
             {"_id": ObjectId(id)},
             {"$set": update_fields}
-        )
\ No newline at end of file
+        ))
+
+    def _due_reminders_query(self, until: datetime) -> dict:
+        return {"status": "pending", "scheduledFor": {"$lte": until}}
+
+    @counts_round_trips
+    async def get_due_reminders(self, until: datetime, limit: Optional[int] = None) -> List[Reminder]:
+        reminder_docs = await self._to_list(self.reminder_collection_mongo.find(self._due_reminders_query(until)).sort("scheduledFor", 1).limit(limit or 0))
+        return [Reminder.model_validate(_stringify_id(reminder_doc)) for reminder_doc in reminder_docs]
+
+    @counts_round_trips
+    async def claim_reminder(self, id: str, now: Optional[datetime] = None) -> Optional[Reminder]:
+        if not ObjectId.is_valid(id): return None
+        # Matching on status makes the claim atomic: of several workers racing
+        # for the same reminder, exactly one gets the document back
+        reminder_doc = await self._io(self.reminder_collection_mongo.find_one_and_update(
+            {"_id": ObjectId(id), "status": "pending"},
+            {"$set": {"status": "sending", "claimedAt": now or datetime.now()}},
+            return_document=ReturnDocument.AFTER,
+        ))
+        return Reminder.model_validate(_stringify_id(reminder_doc)) if reminder_doc else None
+
+    @counts_round_trips
+    async def release_stale_reminder_claims(self, claimed_before: datetime) -> int:
+        result = await self._io(self.reminder_collection_mongo.update_many(
+            {"status": "sending", "claimedAt": {"$lt": claimed_before}},
+            {"$set": {"status": "pending"}, "$unset": {"claimedAt": ""}},
+        ))
+        return result.modified_count
+
+    def _reconcile_okr_counters_pipeline(self, okr_ids: Optional[List[str]] = None) -> List[dict]:
+        # Count each OKR's tasks server-side and $merge the counters back into
+        # the okrs collection, so the rebuild never ships documents to Python
+        match = [{"$match": {"_id": {"$in": [ObjectId(okr_id) for okr_id in okr_ids if ObjectId.is_valid(okr_id)]}}}] if okr_ids is not None else []
+        return match + [
+            {"$lookup": {
+                "from": self.task_collection_mongo.name,
+                "let": {"okrId": {"$toString": "$_id"}},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$okrId", "$$okrId"]}}},
+                    {"$group": {
+                        "_id": None,
+                        "total": {"$sum": 1},
+                        "completed": {"$sum": {"$cond": [{"$eq": ["$status", "completed"]}, 1, 0]}},
+                    }},
+                ],
+                "as": "counts",
+            }},
+            {"$project": {
+                "totalTasks": {"$ifNull": [{"$first": "$counts.total"}, 0]},
+                "completedTasks": {"$ifNull": [{"$first": "$counts.completed"}, 0]},
+            }},
+            {"$set": {"progress": _PROGRESS_EXPR}},
+            {"$merge": {"into": self.okr_collection_mongo.name, "on": "_id", "whenMatched": "merge", "whenNotMatched": "discard"}},
+        ]
+
+    def _status_update_ops(self, task_statuses: Dict[str, TaskStatus], before_docs: List[dict]) -> Tuple[List[UpdateOne], Dict[str, Tuple[int, int]], Dict[RollupKey, Tuple[int, int]]]:
+        # Each update is guarded on the status we just read, so the counter
+        # and rollup deltas computed from it are exact if every update matches
+        now = datetime.now()
+        ops, completed_deltas, rollup_changes = [], Counter(), []
+        for doc in before_docs:
+            status = task_statuses[str(doc["_id"])].value
+            ops.append(UpdateOne(
+                {"_id": doc["_id"], "status": doc.get("status")},
+                {"$set": {"status": status, "micro_status": status, "updatedAt": now}},
+            ))
+            completed_delta = _completed_delta(doc.get("status"), status)
+            completed_deltas[doc.get("okrId", "")] += completed_delta
+            rollup_changes.append((doc.get("createdAt"), 0, completed_delta))
+        return ops, {okr_id: (0, delta) for okr_id, delta in completed_deltas.items()}, _rollup_deltas(rollup_changes)
+
+    def _okr_status_ops(self, okr_statuses: Dict[str, str]) -> List[UpdateOne]:
+        now = datetime.now()
+        return [
+            UpdateOne({"_id": ObjectId(okr_id)}, {"$set": {"status": status, "updated_at": now}})
+            for okr_id, status in okr_statuses.items() if ObjectId.is_valid(okr_id)
+        ]
+
+    @counts_round_trips
+    async def apply_status_updates(self, task_statuses: Dict[str, TaskStatus], okr_statuses: Dict[str, str]) -> None:
+        task_ids = [ObjectId(task_id) for task_id in task_statuses if ObjectId.is_valid(task_id)]
+        if task_ids:
+            before_docs = await self._to_list(self.task_collection_mongo.find({"_id": {"$in": task_ids}}, {"okrId": 1, "status": 1, "createdAt": 1}))
+            ops, deltas, rollup_deltas = self._status_update_ops(task_statuses, before_docs)
+            if ops:
+                async def writes(session: Optional[ClientSession]) -> int:
+                    result = await self._io(self.task_collection_mongo.bulk_write(ops, ordered=False, session=session))
+                    if result.matched_count == len(ops):
+                        await self._inc_okr_counters(deltas, session)
+                        await self._inc_rollups(rollup_deltas, session)
+                    return result.matched_count
+
+                matched_count = await self._in_transaction(writes)
+                if matched_count != len(ops):
+                    # Another writer changed some of these tasks after we read them;
+                    # its newer status stands, and the counters and rollups are rebuilt from
+                    # the tasks after the commit ($merge can't run in a transaction)
+                    print(f"⚠️ {len(ops) - matched_count} buffered task status update(s) lost to a concurrent write")
+                    await self._aggregate(self.okr_collection_mongo, self._reconcile_okr_counters_pipeline(list(deltas)))
+                    await self._rebuild_task_rollups()
+        okr_ops = self._okr_status_ops(okr_statuses)
+        if okr_ops:
+            await self._io(self.okr_collection_mongo.bulk_write(okr_ops, ordered=False))
+
+    def _dashboard_stats_pipeline(self, now: datetime) -> List[dict]:
+        # Runs on the OKRs and pulls in this week's, this month's and the
+        # all-time task rollups plus the upcoming reminders with $unionWith, so
+        # no task is read; $facet then handles each kind of document separately
+        week_start, month_start = _period_starts(now)
+        has_progress = {"$isNumber": "$progress"}
+        count_if = lambda condition: {"$sum": {"$cond": [condition, 1, 0]}}
+        return [
+            {"$project": {"_kind": {"$literal": "okr"}, "status": 1, "progress": 1}},
+            {"$unionWith": {"coll": self.rollup_collection_mongo.name, "pipeline": [
+                {"$match": {"_id": {"$in": [_rollup_id("week", week_start), _rollup_id("month", month_start), _rollup_id("all", None)]}}},
+                {"$set": {"_kind": "rollup"}},
+            ]}},
+            {"$unionWith": {"coll": self.reminder_collection_mongo.name, "pipeline": [
+                {"$match": {"status": "pending", "scheduledFor": {"$gt": now}}},
+                {"$project": {"_kind": {"$literal": "reminder"}}},
+            ]}},
+            {"$facet": {
+                "okrs": [
+                    {"$match": {"_kind": "okr"}},
+                    {"$group": {
+                        "_id": None,
+                        "active_okrs": count_if({"$eq": [{"$toLower": {"$ifNull": ["$status", ""]}}, "active"]}),
+                        "progress_sum": {"$sum": {"$cond": [has_progress, "$progress", 0]}},
+                        "progress_count": count_if(has_progress),
+                    }},
+                ],
+                "rollups": [{"$match": {"_kind": "rollup"}}],
+                "reminders": [{"$match": {"_kind": "reminder"}}, {"$count": "upcoming_reminders"}],
+            }},
+        ]
+
+    @staticmethod
+    def _dashboard_counts(facets: dict, now: datetime) -> Dict[str, int]:
+        counts = _rollup_counts({rollup["_id"]: rollup for rollup in facets["rollups"]}, now)
+        # The other facets yield at most one document (none when their input is empty)
+        for name in ("okrs", "reminders"):
+            if facets[name]:
+                counts.update(facets[name][0])
+        counts.pop("_id", None)
+        return counts
+
+    def _rebuild_task_rollups_pipeline(self) -> List[dict]:
+        # Buckets every task by its creation day/week/month ($dateTrunc needs
+        # MongoDB 5.0) and replaces the stored counts with the result
+        truncate = lambda unit, **options: {"$dateTrunc": {"date": "$createdAt", "unit": unit, **options}}
+        return [
+            # process_okr's job documents share the collection; only tasks have an okrId
+            {"$match": {"okrId": {"$exists": True}}},
+            {"$project": {
+                "completed": {"$cond": [{"$eq": ["$status", "completed"]}, 1, 0]},
+                "bucket": [
+                    {"period": "day", "start": truncate("day")},
+                    {"period": "week", "start": truncate("week", startOfWeek="monday")},
+                    {"period": "month", "start": truncate("month")},
+                    {"period": "all", "start": None},
+                ],
+            }},
+            {"$unwind": "$bucket"},
+            # Tasks without a createdAt only count toward the all-time totals
+            {"$match": {"$or": [{"bucket.period": "all"}, {"bucket.start": {"$ne": None}}]}},
+            {"$group": {
+                "_id": {"$cond": [
+                    {"$eq": ["$bucket.period", "all"]},
+                    "all",
+                    {"$concat": ["$bucket.period", ":", {"$dateToString": {"format": "%Y-%m-%d", "date": "$bucket.start"}}]},
+                ]},
+                "period": {"$first": "$bucket.period"},
+                "start": {"$first": "$bucket.start"},
+                "created": {"$sum": 1},
+                "completed": {"$sum": "$completed"},
+            }},
+            {"$merge": {"into": self.rollup_collection_mongo.name, "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+        ]
+
+    async def _rebuild_task_rollups(self) -> None:
+        # $merge only inserts and replaces buckets, so first drop the ones no
+        # task falls in any more, as the other backends' rebuilds do
+        await self._io(self.rollup_collection_mongo.delete_many({}))
+        await self._aggregate(self.task_collection_mongo, self._rebuild_task_rollups_pipeline())
+
+    def _task_rollups_query(self, period: str, since: Optional[datetime]) -> dict:
+        return {"period": period, "start": {"$gte": since}} if since is not None and period != "all" else {"period": period}
+
+    @counts_round_trips
+    async def get_dashboard_stats(self, now: Optional[datetime] = None) -> Dict[str, object]:
+        now = now or datetime.now()
+        facets = (await self._aggregate(self.okr_collection_mongo, self._dashboard_stats_pipeline(now)))[0]
+        return _dashboard_stats(self._dashboard_counts(facets, now))
+
+    @counts_round_trips
+    async def get_task_rollups(self, period: str, since: Optional[datetime] = None) -> List[dict]:
+        return await self._to_list(self.rollup_collection_mongo.find(self._task_rollups_query(period, since), {"_id": 0}).sort("start", 1))
+
+    @counts_round_trips
+    async def reconcile_okr_counters(self) -> None:
+        await self._aggregate(self.okr_collection_mongo, self._reconcile_okr_counters_pipeline())
+
+    @counts_round_trips
+    async def rebuild_task_rollups(self) -> None:
+        await self._rebuild_task_rollups()
+
+    async def ping(self) -> None:
+        await self._io(self.db.command("ping"))
+
+class AsyncMongoStorage(MongoStorage):
+    """MongoStorage on pymongo's asyncio driver, so queries don't block the event loop."""
+
+    def __init__(self, database: Optional[AsyncDatabase] = None):
+        super().__init__(database if database is not None else get_async_db())
+
+    async def _io(self, result):
+        # Async driver calls return coroutines; cursors are built synchronously
+        # and only their to_list() is awaited
+        return await result
+
+    async def _in_transaction(self, writes: Callable[[Optional[AsyncClientSession]], Awaitable[T]]) -> T:
+        if not await self._supports_transactions():
+            return await writes(None)
+        async with self.db.client.start_session() as session:
+            async with await session.start_transaction():
+                return await writes(session)
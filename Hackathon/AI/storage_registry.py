@@ -0,0 +1,75 @@
+"""
+Application-scoped storage.
+
+main.py's lifespan handler calls create_storage() once at startup and keeps
+the instance on app.state, so every router shares the same backend (and its
+caches and connection pools) for the life of the process. The backend is
+picked with the STORAGE_BACKEND environment variable. Set STORAGE_CACHE=1
+to wrap it in a CachedStorage (sized by STORAGE_CACHE_SIZE and
+STORAGE_CACHE_TTL seconds). Set STORAGE_WRITE_BEHIND=1 to buffer and
+coalesce status updates in a WriteBehindStorage (flushed every
+STORAGE_WRITE_BEHIND_MS milliseconds or STORAGE_WRITE_BEHIND_OPS pending
+ids, whichever comes first). The sqlite backend keeps its database at
+SQLITE_PATH (default okr.db).
+"""
+import os
+from typing import Callable, Dict, List, Optional
+
+from fastapi import Request
+
+from storage import IStorage, MemStorage, MongoStorage, AsyncMongoStorage
+from sqlite_storage import SQLiteStorage
+from cached_storage import CachedStorage
+from write_behind_storage import WriteBehindStorage
+
+DEFAULT_STORAGE_BACKEND = "mongo"
+
+STORAGE_BACKENDS: Dict[str, Callable[[], IStorage]] = {
+    "memory": MemStorage,
+    "mongo": MongoStorage,
+    "mongo_async": AsyncMongoStorage,
+    "sqlite": lambda: SQLiteStorage(os.getenv("SQLITE_PATH", "okr.db")),
+}
+
+
+def register_storage_backend(name: str, factory: Callable[[], IStorage]) -> None:
+    STORAGE_BACKENDS[name.lower()] = factory
+
+
+def create_storage(backend: Optional[str] = None) -> IStorage:
+    backend = (backend or os.getenv("STORAGE_BACKEND", DEFAULT_STORAGE_BACKEND)).lower()
+    if backend not in STORAGE_BACKENDS:
+        raise RuntimeError(f"❌ Unknown STORAGE_BACKEND '{backend}'. Choose one of: {', '.join(STORAGE_BACKENDS)}")
+    storage = STORAGE_BACKENDS[backend]()
+    # The cache goes outside the buffer, so its invalidations see buffered writes
+    if os.getenv("STORAGE_WRITE_BEHIND", "0").lower() in ("1", "true", "yes"):
+        storage = WriteBehindStorage(
+            storage,
+            flush_interval_ms=float(os.getenv("STORAGE_WRITE_BEHIND_MS", "50")),
+            max_pending=int(os.getenv("STORAGE_WRITE_BEHIND_OPS", "500")),
+        )
+    if os.getenv("STORAGE_CACHE", "0").lower() in ("1", "true", "yes"):
+        storage = CachedStorage(
+            storage,
+            max_entries=int(os.getenv("STORAGE_CACHE_SIZE", "1024")),
+            ttl_seconds=float(os.getenv("STORAGE_CACHE_TTL", "30")),
+        )
+        # Entries cached while a write was buffered go stale once it lands
+        if isinstance(storage.storage, WriteBehindStorage):
+            storage.storage.add_flush_listener(storage.invalidate_status_updates)
+    layers = [type(layer).__name__ for layer in storage_layers(storage)[:-1]]
+    print(f"✅ Using {backend} storage" + (f" (wrapped in {', '.join(layers)})" if layers else ""))
+    return storage
+
+
+def storage_layers(storage: IStorage) -> List[IStorage]:
+    """The storage and every wrapper beneath it, outermost first; the last item is the backend."""
+    layers = [storage]
+    while isinstance(layers[-1], (CachedStorage, WriteBehindStorage)):
+        layers.append(layers[-1].storage)
+    return layers
+
+
+# Dependency to get the storage instance created at startup
+def get_storage(request: Request) -> IStorage:
+    return request.app.state.storage
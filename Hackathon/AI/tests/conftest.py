@@ -0,0 +1,69 @@
+import asyncio
+import os
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+# The app's modules import each other by top-level name, as when run from Hackathon/AI
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pymongo import AsyncMongoClient, MongoClient  # noqa: E402
+from pymongo.errors import PyMongoError  # noqa: E402
+
+from sqlite_storage import SQLiteStorage  # noqa: E402
+from storage import AsyncMongoStorage, MemStorage, MongoStorage  # noqa: E402
+
+# The Mongo backends run against a throwaway database on this server, and are
+# skipped when it can't be reached. Transactions need a replica set; on a
+# standalone server the tests cover the non-transactional path.
+TEST_MONGO_URI = os.getenv("TEST_MONGO_URI", "mongodb://localhost:27017")
+
+
+@pytest.fixture(scope="session")
+def mongo_uri():
+    client = MongoClient(TEST_MONGO_URI, serverSelectionTimeoutMS=500)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        pytest.skip(f"MongoDB not reachable at {TEST_MONGO_URI}")
+    finally:
+        client.close()
+    return TEST_MONGO_URI
+
+
+@pytest.fixture(params=["memory", "sqlite", "mongo", "mongo_async"])
+def run_on_storage(request, tmp_path):
+    """run_on_storage(scenario) awaits scenario(storage) on a fresh, empty backend."""
+    backend = request.param
+    uri = request.getfixturevalue("mongo_uri") if backend.startswith("mongo") else None
+    db_name = f"okr_test_{uuid.uuid4().hex[:8]}"
+
+    def run(scenario):
+        async def main():
+            if backend == "memory":
+                storage = MemStorage()
+            elif backend == "sqlite":
+                storage = SQLiteStorage(str(tmp_path / "okr.db"))
+            elif backend == "mongo":
+                client = MongoClient(uri)
+                storage = MongoStorage(client[db_name])
+            else:
+                # Made inside the loop it will run on
+                client = AsyncMongoClient(uri)
+                storage = AsyncMongoStorage(client[db_name])
+            try:
+                await scenario(storage)
+            finally:
+                await storage.close()
+                if backend == "mongo":
+                    client.drop_database(db_name)
+                    client.close()
+                elif backend == "mongo_async":
+                    await client.drop_database(db_name)
+                    await client.close()
+
+        asyncio.run(main())
+
+    return run
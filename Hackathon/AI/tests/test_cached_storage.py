@@ -0,0 +1,115 @@
+"""CachedStorage over MemStorage: hits, and the entries each write drops."""
+import asyncio
+from datetime import datetime, timedelta
+
+from cached_storage import CachedStorage
+from shared.schemas import OkrCreate, ReminderCreate, TaskCreate, TaskUpdate
+from storage import MemStorage
+
+
+async def okr_with_task(storage):
+    okr = await storage.create_okr(OkrCreate(title="Launch portfolio", description="Ship the site", target_date="2026-12-01"))
+    task = await storage.create_task(TaskCreate(okrId=okr.id, title="Pick a template", description="", deadline=datetime.now() + timedelta(days=7)))
+    return okr, task
+
+
+def test_repeated_reads_are_served_from_the_cache():
+    async def scenario():
+        storage = CachedStorage(MemStorage())
+        okr, task = await okr_with_task(storage)
+        for _ in range(2):
+            await storage.get_okr(okr.id)
+            await storage.get_task(task.id)
+            await storage.get_okrs()
+        assert (storage.misses, storage.hits) == (3, 3)
+
+    asyncio.run(scenario())
+
+
+def test_task_writes_drop_the_task_and_its_okr():
+    async def scenario():
+        storage = CachedStorage(MemStorage())
+        okr, task = await okr_with_task(storage)
+        await storage.get_okr(okr.id)
+        await storage.get_okrs()
+        await storage.get_task(task.id)
+
+        await storage.complete_task(task.id, "https://example.com/proof")
+        assert (await storage.get_task(task.id)).status == "completed"
+        cached_okr = await storage.get_okr(okr.id)
+        assert (cached_okr.completed_tasks, cached_okr.progress) == (1, 100)
+        assert (await storage.get_okrs())[0].completed_tasks == 1
+
+        await storage.update_task(task.id, TaskUpdate(title="Pick a theme"))
+        assert (await storage.get_okr(okr.id)).tasks[0].title == "Pick a theme"
+        await storage.update_task_status(task.id, "pending")
+        assert (await storage.get_okr(okr.id)).completed_tasks == 0
+
+    asyncio.run(scenario())
+
+
+def test_reminder_writes_drop_the_task_and_upcoming_reminders():
+    async def scenario():
+        storage = CachedStorage(MemStorage())
+        okr, task = await okr_with_task(storage)
+        assert await storage.get_upcoming_reminders() == []
+        await storage.get_task(task.id)
+
+        reminder = await storage.create_reminder(ReminderCreate(taskId=task.id, message="Start", deliveryMethod="email", scheduledFor=datetime.now() + timedelta(hours=1)))
+        assert [r.id for r in await storage.get_upcoming_reminders()] == [reminder.id]
+        assert [r.id for r in (await storage.get_task(task.id)).reminders] == [reminder.id]
+
+        await storage.update_reminder_status(reminder.id, "sent")
+        assert await storage.get_upcoming_reminders() == []
+        assert (await storage.get_task(task.id)).reminders[0].status == "sent"
+
+    asyncio.run(scenario())
+
+
+def test_upcoming_reminders_expire_when_the_first_falls_due():
+    async def scenario():
+        storage = CachedStorage(MemStorage(), ttl_seconds=60)
+        okr, task = await okr_with_task(storage)
+        reminder = await storage.create_reminder(ReminderCreate(taskId=task.id, message="Start", deliveryMethod="email", scheduledFor=datetime.now() + timedelta(milliseconds=200)))
+        assert [r.id for r in await storage.get_upcoming_reminders()] == [reminder.id]
+        await asyncio.sleep(0.3)
+        # Still cached under the 60 s TTL, it would list a reminder that is no longer upcoming
+        assert await storage.get_upcoming_reminders() == []
+
+    asyncio.run(scenario())
+
+
+class SlowReadStorage(MemStorage):
+    """MemStorage whose get_okr reads, then waits for `release` before returning."""
+
+    def __init__(self):
+        super().__init__()
+        self.reading = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def get_okr(self, id):
+        okr = await super().get_okr(id)
+        self.reading.set()
+        await self.release.wait()
+        return okr
+
+
+def test_read_overtaken_by_a_write_is_not_cached():
+    async def scenario():
+        backend = SlowReadStorage()
+        backend.release.set()
+        storage = CachedStorage(backend)
+        okr, task = await okr_with_task(storage)
+
+        backend.release.clear()
+        read = asyncio.create_task(storage.get_okr(okr.id))
+        await backend.reading.wait()
+        # The write lands and invalidates while the read still holds the old OKR
+        await storage.complete_task(task.id)
+        backend.release.set()
+        assert (await read).completed_tasks == 0
+
+        backend.reading.clear()
+        assert (await storage.get_okr(okr.id)).completed_tasks == 1
+
+    asyncio.run(scenario())
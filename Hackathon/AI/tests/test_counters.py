@@ -0,0 +1,94 @@
+"""OKR task counters and task rollups, kept up to date by every task write, on each backend."""
+from datetime import datetime, timedelta
+
+from shared.schemas import OkrCreate, TaskCreate, TaskStatus, TaskUpdate
+from sqlite_storage import SQLiteStorage
+from storage import MongoStorage, _rollup_deltas
+
+
+def new_task(okr_id: str, title: str) -> TaskCreate:
+    return TaskCreate(okrId=okr_id, title=title, description="", deadline=datetime.now() + timedelta(days=7))
+
+
+async def counters(storage, okr_id: str) -> tuple:
+    okr = await storage.get_okr(okr_id)
+    listed = next(okr for okr in await storage.get_okrs() if okr.id == okr_id)
+    assert (listed.completed_tasks, listed.total_tasks, listed.progress) == (okr.completed_tasks, okr.total_tasks, okr.progress)
+    return okr.completed_tasks, okr.total_tasks, okr.progress
+
+
+async def all_time_rollup(storage) -> tuple:
+    rollups = await storage.get_task_rollups("all")
+    return (rollups[0]["created"], rollups[0]["completed"]) if rollups else (0, 0)
+
+
+def test_counters_and_rollups_follow_task_writes(run_on_storage):
+    async def scenario(storage):
+        okr = await storage.create_okr(OkrCreate(title="Launch portfolio", description="Ship the site", target_date="2026-12-01"))
+        other = await storage.create_okr(OkrCreate(title="Learn Rust", description="Finish the book", target_date="2026-12-01"))
+        assert await counters(storage, okr.id) == (0, 0, 0)
+
+        first = await storage.create_task(new_task(okr.id, "Pick a template"))
+        second, third, fourth = await storage.create_tasks_bulk([new_task(okr.id, "Write copy"), new_task(okr.id, "Deploy"), new_task(other.id, "Chapter 1")])
+        assert await counters(storage, okr.id) == (0, 3, 0)
+        assert await counters(storage, other.id) == (0, 1, 0)
+        assert await all_time_rollup(storage) == (4, 0)
+
+        await storage.update_task_status(first.id, "completed")
+        assert await counters(storage, okr.id) == (1, 3, 33)
+        # Completing an already completed task changes nothing
+        await storage.update_task_status(first.id, TaskStatus.COMPLETED)
+        await storage.complete_task(second.id, "https://example.com/copy")
+        assert await counters(storage, okr.id) == (2, 3, 67)
+        assert await all_time_rollup(storage) == (4, 2)
+
+        # Edits that don't touch the status leave the counters alone; reopening a task takes it off
+        await storage.update_task(third.id, TaskUpdate(title="Deploy to Netlify"))
+        await storage.update_task(second.id, TaskUpdate(status="pending"))
+        assert await counters(storage, okr.id) == (1, 3, 33)
+
+        await storage.apply_status_updates(
+            {first.id: TaskStatus.ACTIVE, third.id: TaskStatus.COMPLETED, fourth.id: TaskStatus.COMPLETED},
+            {okr.id: "completed"},
+        )
+        assert await counters(storage, okr.id) == (1, 3, 33)
+        assert await counters(storage, other.id) == (1, 1, 100)
+        assert (await storage.get_okr(okr.id)).status == "completed"
+        assert await all_time_rollup(storage) == (4, 2)
+
+        # This week's and month's buckets hold every task, all created just now
+        for period in ("day", "week", "month"):
+            [rollup] = await storage.get_task_rollups(period)
+            assert (rollup["created"], rollup["completed"]) == (4, 2)
+        stats = await storage.get_dashboard_stats()
+        assert stats["weeklyProgress"] == {"completed": 2, "total": 4, "percentage": 50}
+
+    run_on_storage(scenario)
+
+
+async def add_rollups(storage, deltas) -> None:
+    if isinstance(storage, SQLiteStorage):
+        with storage.conn:
+            storage._inc_rollups(deltas)
+    elif isinstance(storage, MongoStorage):
+        await storage._inc_rollups(deltas)
+    else:
+        storage._inc_rollups(deltas)
+
+
+def test_rebuilds_agree_with_the_maintained_values(run_on_storage):
+    async def scenario(storage):
+        okr = await storage.create_okr(OkrCreate(title="Launch portfolio", description="Ship the site", target_date="2026-12-01"))
+        tasks = await storage.create_tasks_bulk([new_task(okr.id, f"Step {n}") for n in range(4)])
+        await storage.complete_task(tasks[0].id)
+        await storage.update_task_status(tasks[1].id, "completed")
+        maintained = await counters(storage, okr.id), await all_time_rollup(storage), await storage.get_task_rollups("week")
+        # Buckets no task falls in (left by drift or deleted tasks) are dropped
+        await add_rollups(storage, _rollup_deltas([(datetime(2020, 1, 6), 1, 1)]))
+
+        await storage.reconcile_okr_counters()
+        await storage.rebuild_task_rollups()
+        assert (await counters(storage, okr.id), await all_time_rollup(storage), await storage.get_task_rollups("week")) == maintained
+        assert maintained[:2] == ((2, 4, 50), (4, 2))
+
+    run_on_storage(scenario)
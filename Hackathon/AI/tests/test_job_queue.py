@@ -0,0 +1,95 @@
+"""SQLiteJobQueue and JobWorker: leases, retries and final failures."""
+import asyncio
+import time
+
+import pytest
+
+from job_queue import SQLiteJobQueue
+from job_worker import JobWorker
+from shared.schemas import JobStatus
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.db"))
+    yield queue
+    asyncio.run(queue.close())
+
+
+def test_expired_lease_is_reclaimed_and_the_old_holder_loses_it(queue):
+    async def scenario():
+        job = await queue.enqueue("process_okr", {"title": "Launch portfolio"})
+        first = await queue.claim_job("worker-a", lease_seconds=0.05)
+        assert (first.id, first.attempts) == (job.id, 1)
+        assert await queue.claim_job("worker-b", lease_seconds=30) is None
+
+        time.sleep(0.1)
+        second = await queue.claim_job("worker-b", lease_seconds=30)
+        assert (second.id, second.attempts, second.worker_id) == (job.id, 2, "worker-b")
+        # worker-a stalled past its lease: its heartbeat and outcome no longer apply
+        assert not await queue.extend_lease(job.id, "worker-a", 30)
+        assert not await queue.complete_job(job.id, "worker-a", {"by": "worker-a"})
+        assert await queue.complete_job(job.id, "worker-b", {"by": "worker-b"})
+        done = await queue.get_job(job.id)
+        assert (done.status, done.result) == (JobStatus.SUCCEEDED, {"by": "worker-b"})
+
+    asyncio.run(scenario())
+
+
+def test_failed_handler_is_retried_until_it_succeeds(queue):
+    async def scenario():
+        calls = []
+
+        async def flaky(job):
+            calls.append(job.attempts)
+            if len(calls) == 1:
+                raise RuntimeError("LLM timeout")
+            return {"ok": True}
+
+        worker = JobWorker(queue, {"process_okr": flaky}, worker_id="worker-a", retry_seconds=0)
+        job = await queue.enqueue("process_okr", {})
+        assert await worker.run_once()
+        retrying = await queue.get_job(job.id)
+        assert (retrying.status, retrying.attempts, retrying.error) == (JobStatus.QUEUED, 1, "RuntimeError: LLM timeout")
+
+        assert await worker.run_once()
+        done = await queue.get_job(job.id)
+        assert (done.status, done.attempts, done.result) == (JobStatus.SUCCEEDED, 2, {"ok": True})
+        assert calls == [1, 2]
+        assert worker.stats() == {"claimed": 2, "succeeded": 1, "retried": 1, "failed": 0, "lost_leases": 0}
+
+    asyncio.run(scenario())
+
+
+def test_job_fails_for_good_after_max_attempts(queue):
+    async def scenario():
+        async def broken(job):
+            raise ValueError("bad OKR")
+
+        worker = JobWorker(queue, {"process_okr": broken}, worker_id="worker-a", retry_seconds=0)
+        job = await queue.enqueue("process_okr", {}, max_attempts=2)
+        while await worker.run_once():
+            pass
+        failed = await queue.get_job(job.id)
+        assert (failed.status, failed.attempts, failed.error) == (JobStatus.FAILED, 2, "ValueError: bad OKR")
+        assert await queue.count_jobs() == {JobStatus.FAILED.value: 1}
+
+    asyncio.run(scenario())
+
+
+def test_job_whose_last_lease_expired_is_not_run_again(queue):
+    async def scenario():
+        async def handler(job):
+            raise AssertionError("must not run")
+
+        job = await queue.enqueue("process_okr", {}, max_attempts=1)
+        # A worker claims the only attempt and dies
+        await queue.claim_job("worker-a", lease_seconds=0.05)
+        time.sleep(0.1)
+
+        worker = JobWorker(queue, {"process_okr": handler}, worker_id="worker-b")
+        assert await worker.run_once()
+        failed = await queue.get_job(job.id)
+        assert (failed.status, failed.error) == (JobStatus.FAILED, "Lease expired on the final attempt")
+
+    asyncio.run(scenario())
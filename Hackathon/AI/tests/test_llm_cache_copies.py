@@ -0,0 +1,12 @@
+"""The llm_cache.py shipped with each app that calls Gemini is the same file."""
+from pathlib import Path
+
+import pytest
+
+REPO = Path(__file__).resolve().parents[3]
+COPIES = [REPO / "Final_Hackathon" / "server" / "llm_cache.py", REPO / "Day 7" / "llm_cache.py"]
+
+
+@pytest.mark.parametrize("copy", COPIES, ids=lambda path: str(path.parent.relative_to(REPO)))
+def test_llm_cache_copy_matches(copy):
+    assert copy.read_bytes() == (REPO / "Hackathon" / "AI" / "llm_cache.py").read_bytes()
@@ -0,0 +1,29 @@
+"""/api/get-okrs and /api/get-okr/{id} read through the configured storage."""
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from job_queue import default_job_queue_backend
+from shared.schemas import OkrCreate
+from storage import MemStorage
+
+
+def test_okr_reads_use_the_storage_backend():
+    storage = MemStorage()
+    okr = asyncio.run(storage.create_okr(OkrCreate(title="Launch portfolio", description="Ship the site", target_date="2026-12-01")))
+    main.app.state.storage = storage
+    client = TestClient(main.app)
+
+    [listed] = client.get("/api/get-okrs").json()["result"]
+    assert (listed["id"], listed["title"], listed["tasks"]) == (okr.id, "Launch portfolio", [])
+    assert client.get("/api/get-okrs", params={"fields": "title"}).json() == {"result": [{"title": "Launch portfolio", "id": okr.id}]}
+    assert client.get(f"/api/get-okr/{okr.id}").json()["result"]["id"] == okr.id
+    assert client.get("/api/get-okr/00000000-0000-0000-0000-000000000000").json() == {"error": "OKR not found"}
+
+
+@pytest.mark.parametrize("storage_backend, queue_backend", [("memory", "sqlite"), ("sqlite", "sqlite"), ("mongo", "mongo"), ("mongo_async", "mongo")])
+def test_job_queue_follows_the_storage_backend(monkeypatch, storage_backend, queue_backend):
+    monkeypatch.setenv("STORAGE_BACKEND", storage_backend)
+    assert default_job_queue_backend() == queue_backend
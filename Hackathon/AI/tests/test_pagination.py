@@ -0,0 +1,35 @@
+"""The `after` page cursor of the list endpoints."""
+import uuid
+
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routes.task_routes import task_router
+from storage import MemStorage, _keyset_filter
+
+
+def client() -> TestClient:
+    app = FastAPI()
+    app.include_router(task_router)
+    app.state.storage = MemStorage()
+    return TestClient(app)
+
+
+def test_malformed_cursor_is_a_bad_request():
+    response = client().get("/tasks", params={"after": "not-an-id"})
+    assert response.status_code == 400
+
+
+def test_unknown_cursor_returns_an_empty_page():
+    for after in (str(uuid.uuid4()), str(ObjectId())):
+        response = client().get("/tasks", params={"after": after})
+        assert (response.status_code, response.json()) == (200, [])
+
+
+def test_mongo_keyset_filter_accepts_any_well_formed_cursor():
+    after = ObjectId()
+    assert _keyset_filter(str(after)) == {"_id": {"$gt": after}}
+    # A UUID from another backend can't be an ObjectId, so nothing follows it
+    assert _keyset_filter(str(uuid.uuid4())) == {"_id": {"$in": []}}
+    assert _keyset_filter(None) == {}
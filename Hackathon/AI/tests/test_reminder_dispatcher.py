@@ -0,0 +1,102 @@
+"""ReminderDispatcher over MemStorage, delivering through FileTransport."""
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+from reminder_dispatcher import FileTransport, ReminderDispatcher, ReminderTransport
+from shared.schemas import ReminderCreate
+from storage import MemStorage
+
+NOW = datetime(2026, 10, 1, 9, 0)
+
+
+class FailingTransport(ReminderTransport):
+    async def send(self, reminders):
+        raise ConnectionError("SMTP down")
+
+
+async def add_reminders(storage, channel: str, count: int, scheduled_for: datetime = NOW) -> list:
+    return [
+        await storage.create_reminder(ReminderCreate(taskId=f"task-{n}", message=f"{channel} {n}", deliveryMethod=channel, scheduledFor=scheduled_for))
+        for n in range(count)
+    ]
+
+
+def delivered(path) -> list:
+    return [json.loads(line)["_id"] for line in path.read_text().splitlines()] if path.exists() else []
+
+
+def test_due_reminders_go_out_in_batches_per_channel(tmp_path):
+    async def scenario():
+        storage = MemStorage()
+        emails = await add_reminders(storage, "email", 5)
+        texts = await add_reminders(storage, "sms", 3)
+        later = await add_reminders(storage, "email", 1, NOW + timedelta(hours=2))
+        dispatcher = ReminderDispatcher(
+            storage, {"email": FileTransport(str(tmp_path / "email.jsonl")), "sms": FileTransport(str(tmp_path / "sms.jsonl"))}, batch_size=2,
+        )
+        assert await dispatcher.run_once(NOW) == 8
+        assert sorted(delivered(tmp_path / "email.jsonl")) == sorted(reminder.id for reminder in emails)
+        assert sorted(delivered(tmp_path / "sms.jsonl")) == sorted(reminder.id for reminder in texts)
+        assert dispatcher.stats() == {"queued": 0, "claimed": 8, "lost_claims": 0, "sent": 8, "failed": 0, "batches": 5}
+        assert {storage.reminders[reminder.id].status for reminder in emails + texts} == {"sent"}
+        assert storage.reminders[later[0].id].status == "pending"
+
+    asyncio.run(scenario())
+
+
+def test_failed_batch_is_released_after_the_lease_and_redelivered(tmp_path):
+    async def scenario():
+        storage = MemStorage()
+        reminders = await add_reminders(storage, "email", 3)
+        outbox = tmp_path / "email.jsonl"
+        dispatcher = ReminderDispatcher(storage, {"email": FailingTransport()}, lease_seconds=300)
+        assert await dispatcher.run_once(NOW) == 3
+        assert dispatcher.stats()["failed"] == 3
+        # Claimed but not sent: no other worker may take them while the lease runs
+        assert {storage.reminders[reminder.id].status for reminder in reminders} == {"sending"}
+        assert await storage.get_due_reminders(NOW) == []
+
+        dispatcher.transports["email"] = FileTransport(str(outbox))
+        assert await dispatcher.run_once(NOW + timedelta(seconds=299)) == 0
+        assert await dispatcher.run_once(NOW + timedelta(seconds=301)) == 3
+        assert sorted(delivered(outbox)) == sorted(reminder.id for reminder in reminders)
+        assert {storage.reminders[reminder.id].status for reminder in reminders} == {"sent"}
+
+    asyncio.run(scenario())
+
+
+def test_workers_sharing_a_store_deliver_each_reminder_once(tmp_path):
+    async def scenario():
+        storage = MemStorage()
+        reminders = await add_reminders(storage, "email", 20)
+        outbox = FileTransport(str(tmp_path / "email.jsonl"))
+        workers = [ReminderDispatcher(storage, {"email": outbox}) for _ in range(2)]
+        # Both queue every reminder before either claims one
+        for worker in workers:
+            await worker.refill(NOW)
+        for worker in workers:
+            await worker.dispatch_due(NOW)
+        assert sorted(delivered(tmp_path / "email.jsonl")) == sorted(reminder.id for reminder in reminders)
+        assert [worker.stats()["lost_claims"] for worker in workers] == [0, 20]
+
+    asyncio.run(scenario())
+
+
+def test_due_reminder_reads_stop_at_the_due_ones():
+    async def scenario():
+        storage = MemStorage()
+        due = await add_reminders(storage, "email", 3)
+        await add_reminders(storage, "email", 50, NOW + timedelta(days=1))
+        await storage.claim_reminder(due[0].id, NOW)
+        assert sorted(reminder.id for reminder in await storage.get_due_reminders(NOW)) == sorted(reminder.id for reminder in due[1:])
+        assert len(await storage.get_due_reminders(NOW, limit=1)) == 1
+        # The claimed reminder's entry was dropped; the live ones are still queued
+        assert len(storage.pending_reminders) == 52
+        # Back to pending, it is due again, once
+        await storage.update_reminder_status(due[0].id, "pending")
+        await storage.update_reminder_status(due[0].id, "pending")
+        assert sorted(reminder.id for reminder in await storage.get_due_reminders(NOW)) == sorted(reminder.id for reminder in due)
+        assert storage.pending_reminder_count == 53
+
+    asyncio.run(scenario())
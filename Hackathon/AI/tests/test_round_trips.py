@@ -0,0 +1,69 @@
+"""Round trips per MongoStorage mutation, as counted by round_trips.round_trip_counter."""
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from pymongo import AsyncMongoClient, MongoClient
+
+from round_trips import round_trip_counter
+from shared.schemas import OkrCreate, ReminderCreate, TaskCreate, TaskUpdate
+from storage import AsyncMongoStorage, MongoStorage
+
+
+def new_task(okr_id: str, title: str) -> TaskCreate:
+    return TaskCreate(okrId=okr_id, title=title, description="", deadline=datetime.now() + timedelta(days=7))
+
+
+async def round_trips(call) -> int:
+    round_trip_counter.reset()
+    await call
+    (counts,) = round_trip_counter.snapshot().values()
+    return counts["round_trips"]
+
+
+@pytest.mark.parametrize("backend", ["mongo", "mongo_async"])
+def test_round_trips_per_mutation(backend, mongo_uri):
+    db_name = f"okr_test_{uuid.uuid4().hex[:8]}"
+
+    async def main():
+        # The listener mongo_clients registers on the app's shared clients
+        if backend == "mongo":
+            client = MongoClient(mongo_uri, event_listeners=[round_trip_counter])
+            storage = MongoStorage(client[db_name])
+        else:
+            client = AsyncMongoClient(mongo_uri, event_listeners=[round_trip_counter])
+            storage = AsyncMongoStorage(client[db_name])
+        try:
+            # The one-time hello isn't part of any write; on replica sets a
+            # task write also sends commitTransaction
+            commit = int(await storage._supports_transactions())
+
+            okr = await storage.create_okr(OkrCreate(title="Launch portfolio", description="Ship the site", target_date="2026-12-01"))
+            assert await round_trips(storage.create_okr(OkrCreate(title="Learn Rust", description="Finish the book", target_date="2026-12-01"))) == 1
+
+            # A task write: the task, the OKR counters and the rollups
+            assert await round_trips(storage.create_task(new_task(okr.id, "Pick a template"))) == 3 + commit
+            assert await round_trips(storage.create_tasks_bulk([new_task(okr.id, f"Step {n}") for n in range(5)])) == 3 + commit
+            first, second, third = (await storage.get_tasks_by_okr(okr.id))[:3]
+            assert await round_trips(storage.update_task_status(first.id, "completed")) == 3 + commit
+            assert await round_trips(storage.complete_task(second.id, "https://example.com/proof")) == 3 + commit
+            assert await round_trips(storage.update_task(third.id, TaskUpdate(status="completed"))) == 3 + commit
+            # Without a status change only the task moves
+            assert await round_trips(storage.update_task(third.id, TaskUpdate(title="Deploy"))) == 1
+
+            reminder = ReminderCreate(taskId=first.id, message="Start", deliveryMethod="email", scheduledFor=datetime.now() - timedelta(minutes=1))
+            created = await storage.create_reminder(reminder)
+            assert await round_trips(storage.create_reminder(reminder)) == 1
+            assert await round_trips(storage.claim_reminder(created.id)) == 1
+            assert await round_trips(storage.update_reminder_status(created.id, "sent")) == 1
+        finally:
+            await storage.close()
+            if backend == "mongo":
+                client.drop_database(db_name)
+                client.close()
+            else:
+                await client.drop_database(db_name)
+                await client.close()
+
+    asyncio.run(main())
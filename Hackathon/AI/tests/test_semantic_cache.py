@@ -0,0 +1,49 @@
+"""SemanticCache bookkeeping with a deterministic stand-in for the sentence-transformer."""
+import threading
+import zlib
+
+import numpy as np
+
+from semantic_cache import SemanticCache
+
+
+def one_hot_embedder(texts):
+    # Each distinct text is its own direction, so only identical texts match
+    vectors = np.zeros((len(texts), 64), dtype=np.float32)
+    for row, text in enumerate(texts):
+        vectors[row, zlib.crc32(text.encode()) % 64] = 1.0
+    return vectors
+
+
+def test_index_keeps_only_the_newest_entries(tmp_path):
+    cache = SemanticCache(str(tmp_path / "semantic.db"), one_hot_embedder, max_entries=3)
+    for n in range(5):
+        cache.get_or_compute("parse_okr" if n % 2 else "create_micro_tasks", f"okr {n}", lambda n=n: {"n": n})
+
+    assert cache.conn.execute("SELECT COUNT(*) FROM semantic_cache").fetchone()[0] == 3
+    assert cache.stats()["entries"] == 3
+    assert sorted(text for _, _, entries in cache._index.values() for text, *_ in entries) == ["okr 2", "okr 3", "okr 4"]
+    assert {kind: matrix.shape[0] for kind, (_, matrix, _) in cache._index.items()} == {"create_micro_tasks": 2, "parse_okr": 1}
+    # An evicted entry is computed again
+    assert cache.get_or_compute("create_micro_tasks", "okr 0", lambda: {"n": "again"}) == ({"n": "again"}, None)
+    cache.close()
+
+
+def test_stats_count_every_lookup_under_concurrency(tmp_path):
+    cache = SemanticCache(str(tmp_path / "semantic.db"), one_hot_embedder)
+    cache.get_or_compute("parse_okr", "publish 3 articles", lambda: {"objective": "Publish"})
+
+    def lookups():
+        for _ in range(200):
+            cache.get_or_compute("parse_okr", "publish 3 articles", lambda: {"objective": "Publish"})
+            cache.get_or_compute("parse_okr", "publish 3 articles", lambda: None, adapt=lambda hit: None)
+
+    threads = [threading.Thread(target=lookups) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats()
+    assert (stats["lookups"], stats["hits"], stats["rejected"]) == (1 + 3200, 1600, 1600)
+    cache.close()
@@ -0,0 +1,45 @@
+"""CachedStorage over WriteBehindStorage, stacked the way create_storage builds them."""
+import asyncio
+from datetime import datetime, timedelta
+
+from shared.schemas import OkrCreate, TaskCreate
+from storage_registry import create_storage, storage_layers
+
+
+def layered_storage(monkeypatch):
+    monkeypatch.setenv("STORAGE_CACHE", "1")
+    monkeypatch.setenv("STORAGE_WRITE_BEHIND", "1")
+    # Long enough that only the test flushes
+    monkeypatch.setenv("STORAGE_WRITE_BEHIND_MS", "60000")
+    return create_storage("memory")
+
+
+async def okr_with_tasks(storage, count: int):
+    okr = await storage.create_okr(OkrCreate(title="Launch portfolio", description="Ship the site", target_date="2026-12-01"))
+    deadline = datetime.now() + timedelta(days=7)
+    tasks = await storage.create_tasks_bulk([TaskCreate(okrId=okr.id, title=f"Step {n}", description="", deadline=deadline) for n in range(count)])
+    return okr, tasks
+
+
+def test_cached_okr_counters_match_buffered_task_status(monkeypatch):
+    async def scenario():
+        storage = layered_storage(monkeypatch)
+        cache, write_behind = storage_layers(storage)[:2]
+        okr, tasks = await okr_with_tasks(storage, 2)
+        await storage.update_task_status(tasks[0].id, "completed")
+
+        buffered = await storage.get_okr(okr.id)
+        assert [task.status for task in buffered.tasks] == ["completed", "pending"]
+        assert (buffered.completed_tasks, buffered.total_tasks, buffered.progress) == (1, 2, 50)
+        [raw] = await storage.get_okrs(raw=True)
+        assert (raw["completedTasks"], raw["progress"]) == (1, 50)
+
+        await write_behind.flush()
+        misses = cache.misses
+        flushed = await storage.get_okr(okr.id)
+        # The flush dropped the entry cached while the write was buffered
+        assert cache.misses == misses + 1
+        assert (flushed.completed_tasks, flushed.progress) == (1, 50)
+        await storage.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,139 @@
+"""WriteBehindStorage over MemStorage: buffering, the read overlay and failed flushes."""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from shared.schemas import OkrCreate, TaskCreate, TaskStatus
+from storage import MemStorage
+from write_behind_storage import WriteBehindStorage
+
+
+class FlakyStorage(MemStorage):
+    """MemStorage whose batched writes fail while `failing` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.failing = False
+        self.batches = []
+
+    async def apply_status_updates(self, task_statuses, okr_statuses):
+        if self.failing:
+            raise ConnectionError("backend unavailable")
+        self.batches.append((dict(task_statuses), dict(okr_statuses)))
+        await super().apply_status_updates(task_statuses, okr_statuses)
+
+
+async def okr_with_tasks(storage, count: int):
+    okr = await storage.create_okr(OkrCreate(title="Launch portfolio", description="Ship the site", target_date="2026-12-01"))
+    deadline = datetime.now() + timedelta(days=7)
+    tasks = await storage.create_tasks_bulk([TaskCreate(okrId=okr.id, title=f"Step {n}", description="", deadline=deadline) for n in range(count)])
+    return okr, tasks
+
+
+def test_status_updates_coalesce_into_one_batch():
+    async def scenario():
+        backend = FlakyStorage()
+        storage = WriteBehindStorage(backend, flush_interval_ms=60000)
+        okr, tasks = await okr_with_tasks(storage, 2)
+        for status in ("active", "completed", "pending", "completed"):
+            await storage.update_task_status(tasks[0].id, status)
+        await storage.update_task_status(tasks[1].id, "active")
+        await storage.update_okr_status(okr.id, "active")
+        await storage.update_okr_status(okr.id, "completed")
+        assert backend.batches == []
+
+        await storage.flush()
+        # Last status per id wins, written in a single call
+        assert backend.batches == [({tasks[0].id: TaskStatus.COMPLETED, tasks[1].id: TaskStatus.ACTIVE}, {okr.id: "completed"})]
+        assert storage.stats() == {"pending": 0, "buffered": 7, "written": 3, "flushes": 1, "coalesced": 4}
+        assert (backend.okrs[okr.id].completed_tasks, backend.okrs[okr.id].status) == (1, "completed")
+
+    asyncio.run(scenario())
+
+
+def test_reads_see_buffered_statuses():
+    async def scenario():
+        backend = FlakyStorage()
+        storage = WriteBehindStorage(backend, flush_interval_ms=60000)
+        okr, tasks = await okr_with_tasks(storage, 2)
+        await storage.update_task_status(tasks[0].id, "completed")
+        await storage.update_okr_status(okr.id, "completed")
+        assert backend.tasks[tasks[0].id].status == "pending"
+
+        assert (await storage.get_task(tasks[0].id)).status == "completed"
+        assert [task.status for task in await storage.get_tasks()] == ["completed", "pending"]
+        assert [task.status for task in await storage.get_tasks_by_okr(okr.id)] == ["completed", "pending"]
+        [raw] = await storage.get_tasks(fields=["_id", "status"], limit=1)
+        assert raw["status"] == "completed"
+        buffered = await storage.get_okr(okr.id)
+        assert (buffered.status, buffered.completed_tasks, buffered.progress) == ("completed", 1, 50)
+        # The backend's own object is left alone
+        assert backend.tasks[tasks[0].id].status == "pending"
+
+    asyncio.run(scenario())
+
+
+def test_direct_task_writes_land_the_buffered_status_first():
+    async def scenario():
+        backend = FlakyStorage()
+        storage = WriteBehindStorage(backend, flush_interval_ms=60000)
+        okr, tasks = await okr_with_tasks(storage, 1)
+        await storage.update_task_status(tasks[0].id, "active")
+        # Flushed later, the buffered "active" would overwrite the completion
+        await storage.complete_task(tasks[0].id, "https://example.com/proof")
+        await storage.flush()
+        assert backend.tasks[tasks[0].id].status == "completed"
+        assert backend.okrs[okr.id].completed_tasks == 1
+
+    asyncio.run(scenario())
+
+
+def test_backend_counted_reads_flush_first():
+    async def scenario():
+        backend = FlakyStorage()
+        storage = WriteBehindStorage(backend, flush_interval_ms=60000)
+        okr, tasks = await okr_with_tasks(storage, 2)
+        await storage.update_task_status(tasks[0].id, "completed")
+        stats = await storage.get_dashboard_stats()
+        assert stats["completedTasks"] == 1
+        assert len(backend.batches) == 1
+
+    asyncio.run(scenario())
+
+
+def test_failed_inline_flush_is_retried_by_the_timer():
+    async def scenario():
+        backend = FlakyStorage()
+        storage = WriteBehindStorage(backend, flush_interval_ms=10, max_pending=1)
+        okr, tasks = await okr_with_tasks(storage, 1)
+        backend.failing = True
+        # max_pending=1 flushes inline; the failure is logged, not raised
+        await storage.update_task_status(tasks[0].id, "completed")
+        assert storage.stats()["pending"] == 1
+        assert (await storage.get_task(tasks[0].id)).status == "completed"
+
+        backend.failing = False
+        for _ in range(50):
+            if backend.batches: break
+            await asyncio.sleep(0.01)
+        assert storage.stats()["pending"] == 0
+        assert backend.tasks[tasks[0].id].status == "completed"
+        await storage.close()
+
+    asyncio.run(scenario())
+
+
+def test_close_raises_when_the_final_flush_fails():
+    async def scenario():
+        backend = FlakyStorage()
+        storage = WriteBehindStorage(backend, flush_interval_ms=60000)
+        okr, tasks = await okr_with_tasks(storage, 1)
+        await storage.update_task_status(tasks[0].id, "completed")
+        backend.failing = True
+        with pytest.raises(ConnectionError):
+            await storage.close()
+        # The batch went back into the buffer rather than being dropped
+        assert storage.stats()["pending"] == 1
+
+    asyncio.run(scenario())
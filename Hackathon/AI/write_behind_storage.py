@@ -0,0 +1,256 @@
+"""
+Write-behind buffer around any IStorage.
+
+update_task_status and update_okr_status calls are held in memory and
+coalesced per id (the last status wins), then handed to the backend's
+apply_status_updates in one batch every flush_interval_ms, as soon as
+max_pending ids are waiting, and on close(). Reads overlay the buffered
+statuses on whatever the backend returns, so a caller always sees its own
+writes; an OKR read with its tasks has its completedTasks/progress adjusted
+to match. OKRs read without their tasks catch up at the next flush.
+Listeners added with add_flush_listener hear about each batch once it has
+landed (CachedStorage drops the entries it makes stale).
+"""
+import asyncio
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from shared.schemas import (
+    Okr, OkrCreate, OkrWithTasks, Reminder, ReminderCreate, Task, TaskCreate, TaskStatus, TaskUpdate, TaskWithReminders,
+)
+from storage import IStorage, _completed_delta, _progress, _to_task_status
+
+
+class WriteBehindStorage(IStorage):
+    def __init__(self, storage: IStorage, flush_interval_ms: float = 50, max_pending: int = 500):
+        self.storage = storage
+        self.flush_interval_ms = flush_interval_ms
+        self.max_pending = max_pending
+        self._task_statuses: Dict[str, TaskStatus] = {}
+        self._okr_statuses: Dict[str, str] = {}
+        # The batch currently being written, still visible to reads until it lands
+        self._flushing_tasks: Dict[str, TaskStatus] = {}
+        self._flushing_okrs: Dict[str, str] = {}
+        self._flush_lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._flush_listeners: List[Callable[[Dict[str, TaskStatus], Dict[str, str]], None]] = []
+        self.buffered = 0
+        self.written = 0
+        self.flushes = 0
+
+    # Buffer bookkeeping
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._task_statuses) + len(self._okr_statuses),
+            "buffered": self.buffered,
+            "written": self.written,
+            "flushes": self.flushes,
+            "coalesced": self.buffered - self.written - len(self._task_statuses) - len(self._okr_statuses),
+        }
+
+    def add_flush_listener(self, listener: Callable[[Dict[str, TaskStatus], Dict[str, str]], None]) -> None:
+        """Call listener(task_statuses, okr_statuses) after each batch is written."""
+        self._flush_listeners.append(listener)
+
+    async def _buffered(self, count: int = 1) -> None:
+        self.buffered += count
+        if len(self._task_statuses) + len(self._okr_statuses) >= self.max_pending:
+            # The caller's write is buffered either way, so a failed flush is
+            # the timer's to retry; only close() raises
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"❌ Write-behind flush failed, will retry: {e}")
+                self._schedule_flush()
+        else:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval_ms / 1000)
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"❌ Write-behind flush failed, will retry: {e}")
+            self._timer = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._task_statuses and not self._okr_statuses:
+                return
+            self._flushing_tasks, self._task_statuses = self._task_statuses, {}
+            self._flushing_okrs, self._okr_statuses = self._okr_statuses, {}
+            try:
+                await self.storage.apply_status_updates(self._flushing_tasks, self._flushing_okrs)
+            except Exception:
+                # Put the batch back behind anything buffered since
+                self._task_statuses = {**self._flushing_tasks, **self._task_statuses}
+                self._okr_statuses = {**self._flushing_okrs, **self._okr_statuses}
+                raise
+            else:
+                self.written += len(self._flushing_tasks) + len(self._flushing_okrs)
+                self.flushes += 1
+                for listener in self._flush_listeners:
+                    listener(self._flushing_tasks, self._flushing_okrs)
+            finally:
+                self._flushing_tasks, self._flushing_okrs = {}, {}
+
+    # Read-your-writes overlay
+    def _task_status(self, task_id: str) -> Optional[TaskStatus]:
+        return self._task_statuses.get(task_id) or self._flushing_tasks.get(task_id)
+
+    def _okr_status(self, okr_id: str) -> Optional[str]:
+        return self._okr_statuses.get(okr_id) or self._flushing_okrs.get(okr_id)
+
+    def _overlay_task(self, task: Union[Task, dict]):
+        # Backends may hand out their own objects (MemStorage does), so copy
+        # rather than mutate
+        if isinstance(task, dict):
+            status = self._task_status(str(task.get("_id", task.get("id"))))
+            if status is None: return task
+            return {**task, **{key: status.value for key in ("status", "micro_status") if key in task}}
+        status = self._task_status(task.id)
+        if status is None: return task
+        return task.model_copy(update={"status": status.value, "micro_status": status.value})
+
+    def _overlay_okr(self, okr: Union[Okr, dict]):
+        # The stored counters don't include the buffered statuses yet, so
+        # shift them by whatever the overlay changed in the OKR's own tasks
+        if isinstance(okr, dict):
+            status = self._okr_status(str(okr.get("_id", okr.get("id"))))
+            okr = {**okr, "status": status} if status is not None and "status" in okr else okr
+            if "tasks" in okr:
+                stored_tasks = okr["tasks"]
+                okr = {**okr, "tasks": [self._overlay_task(task) for task in stored_tasks]}
+                if "completedTasks" in okr:
+                    completed = okr["completedTasks"] + sum(_completed_delta(before.get("status"), after.get("status")) for before, after in zip(stored_tasks, okr["tasks"]))
+                    okr["completedTasks"] = completed
+                    if "progress" in okr:
+                        okr["progress"] = _progress(completed, okr.get("totalTasks", len(stored_tasks)))
+            return okr
+        update = {}
+        status = self._okr_status(okr.id)
+        if status is not None:
+            update["status"] = status
+        if isinstance(okr, OkrWithTasks) and (self._task_statuses or self._flushing_tasks):
+            tasks = [self._overlay_task(task) for task in okr.tasks]
+            completed = okr.completed_tasks + sum(_completed_delta(before.status, after.status) for before, after in zip(okr.tasks, tasks))
+            update.update(tasks=tasks, completed_tasks=completed, progress=_progress(completed, okr.total_tasks))
+        return okr.model_copy(update=update) if update else okr
+
+    # OKR methods
+    async def create_okr(self, okr: OkrCreate) -> Okr:
+        return await self.storage.create_okr(okr)
+
+    async def get_okrs(self, after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None, raw: bool = False) -> List[Union[OkrWithTasks, dict]]:
+        return [self._overlay_okr(okr) for okr in await self.storage.get_okrs(after, limit, fields, raw)]
+
+    async def get_okr(self, id: str) -> Optional[OkrWithTasks]:
+        okr = await self.storage.get_okr(id)
+        return self._overlay_okr(okr) if okr else None
+
+    async def update_okr_progress(self, id: str, progress: int) -> None:
+        await self.storage.update_okr_progress(id, progress)
+
+    async def update_okr_status(self, okr_id: str, status: str) -> None:
+        self._okr_statuses[okr_id] = status
+        await self._buffered()
+
+    # Task methods
+    async def create_task(self, task: TaskCreate) -> Task:
+        return await self.storage.create_task(task)
+
+    async def create_tasks_bulk(self, tasks: List[TaskCreate]) -> List[Task]:
+        return await self.storage.create_tasks_bulk(tasks)
+
+    async def get_tasks(self, after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None, raw: bool = False) -> List[Union[Task, dict]]:
+        return [self._overlay_task(task) for task in await self.storage.get_tasks(after, limit, fields, raw)]
+
+    async def get_tasks_by_okr(self, okr_id: str) -> List[Task]:
+        return [self._overlay_task(task) for task in await self.storage.get_tasks_by_okr(okr_id)]
+
+    async def get_task(self, id: str) -> Optional[TaskWithReminders]:
+        task = await self.storage.get_task(id)
+        return self._overlay_task(task) if task else None
+
+    async def update_task(self, id: str, updates: TaskUpdate) -> Optional[Task]:
+        # Land any buffered status first so it can't overwrite this write later
+        if self._task_status(id) is not None:
+            await self.flush()
+        return await self.storage.update_task(id, updates)
+
+    async def update_task_status(self, task_id: str, status: Union[str, TaskStatus]) -> None:
+        self._task_statuses[task_id] = _to_task_status(status)
+        await self._buffered()
+
+    async def complete_task(self, id: str, proof_url: Optional[str] = None) -> Optional[Task]:
+        if self._task_status(id) is not None:
+            await self.flush()
+        return await self.storage.complete_task(id, proof_url)
+
+    async def get_tasks_due_within(self, hours: float) -> List[Task]:
+        # The backend filters on status, so it has to see the buffered ones
+        await self.flush()
+        return await self.storage.get_tasks_due_within(hours)
+
+    # Reminder methods
+    async def create_reminder(self, reminder: ReminderCreate) -> Reminder:
+        return await self.storage.create_reminder(reminder)
+
+    async def get_reminders(self, after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None, raw: bool = False) -> List[Union[Reminder, dict]]:
+        return await self.storage.get_reminders(after, limit, fields, raw)
+
+    async def get_upcoming_reminders(self) -> List[Reminder]:
+        return await self.storage.get_upcoming_reminders()
+
+    async def update_reminder_status(self, id: str, status: str) -> None:
+        await self.storage.update_reminder_status(id, status)
+
+    # Reminder dispatch
+    async def get_due_reminders(self, until: datetime, limit: Optional[int] = None) -> List[Reminder]:
+        return await self.storage.get_due_reminders(until, limit)
+
+    async def claim_reminder(self, id: str, now: Optional[datetime] = None) -> Optional[Reminder]:
+        return await self.storage.claim_reminder(id, now)
+
+    async def release_stale_reminder_claims(self, claimed_before: datetime) -> int:
+        return await self.storage.release_stale_reminder_claims(claimed_before)
+
+    # Batched writes
+    async def apply_status_updates(self, task_statuses: Dict[str, TaskStatus], okr_statuses: Dict[str, str]) -> None:
+        self._task_statuses.update(task_statuses)
+        self._okr_statuses.update(okr_statuses)
+        await self._buffered(len(task_statuses) + len(okr_statuses))
+
+    # Dashboard
+    async def get_dashboard_stats(self, now: Optional[datetime] = None) -> Dict[str, object]:
+        # Counted by the backend, so it has to see the buffered statuses
+        await self.flush()
+        return await self.storage.get_dashboard_stats(now)
+
+    async def get_task_rollups(self, period: str, since: Optional[datetime] = None) -> List[dict]:
+        await self.flush()
+        return await self.storage.get_task_rollups(period, since)
+
+    # Maintenance
+    async def reconcile_okr_counters(self) -> None:
+        await self.flush()
+        await self.storage.reconcile_okr_counters()
+
+    async def rebuild_task_rollups(self) -> None:
+        await self.flush()
+        await self.storage.rebuild_task_rollups()
+
+    # Lifecycle
+    async def ping(self) -> None:
+        await self.storage.ping()
+
+    async def close(self) -> None:
+        # Flush first: the lock waits out a timer flush already in progress
+        await self.flush()
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        await self.storage.close()